@@ -0,0 +1,369 @@
+"""
+Benchmark suite for tabler.
+
+Generates synthetic tables of several sizes and shapes and measures common
+operations on them: loading data, opening and writing files with each table
+type, reading cells with :class:`tabler.tablerow.TableRow`, sorting and
+rendering HTML. For each operation the throughput, the fastest time and the
+latency percentiles of repeated runs and the peak memory allocated are
+reported and can be saved as JSON. Two saved runs can then be compared to
+find regressions. Percentiles are only as reliable as the number of runs, so
+use a larger --repeat when p90 and p99 matter.
+
+Usage::
+
+    python benchmarks/bench.py run --sizes 1000 100000 --output before.json
+    python benchmarks/bench.py run --sizes 1000 100000 --output after.json
+    python benchmarks/bench.py compare before.json after.json
+
+``compare`` exits with status 1 if any operation is slower, or allocates
+more memory, than the threshold allows. Table types with optional
+dependencies which are not installed are skipped. XLSX and ODS are slow, so
+they are only run on tables of up to --max-slow-rows rows. Tables and files
+are only created for the operations run, so --only runs just those
+operations.
+"""
+
+import argparse
+import datetime
+import functools
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import tabler
+from tabler import CSV, HTML, ODS, XLSX, Parquet, Snapshot, Table
+from tabler.tabletypes import BaseTableType
+from tabler.tohtml import ToHTML
+
+
+class Shape(NamedTuple):
+    """Shape of a synthetic table."""
+
+    columns: int
+    kind: str
+    distinct: int
+
+
+SHAPES: Dict[str, Shape] = {
+    "narrow": Shape(5, "text", 10000),
+    "wide": Shape(50, "text", 10000),
+    "numeric": Shape(10, "numeric", 10000),
+    "categorical": Shape(10, "text", 50),
+}
+
+SIZES = [1000, 10000, 100000]
+
+PERCENTILES = (50, 90, 99)
+
+#: Increases in peak memory smaller than this many bytes are not regressions.
+MEMORY_NOISE = 2**16
+
+
+def table_types() -> Dict[str, BaseTableType]:
+    """Return the table types benchmarked, by name."""
+    types: Dict[str, BaseTableType] = {
+        "CSV": CSV(verbose=False),
+        "Snapshot": Snapshot(verbose=False),
+        "XLSX": XLSX(verbose=False),
+        "ODS": ODS(verbose=False),
+        "HTML": HTML(verbose=False),
+    }
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        types["Parquet"] = Parquet(verbose=False)
+    return types
+
+
+SLOW_TYPES = ("XLSX", "ODS")
+
+#: Table types which can be opened as well as written.
+READABLE_TYPES = ("CSV", "Snapshot", "XLSX", "ODS", "Parquet")
+
+
+def make_data(
+    rows: int, columns: int, seed: int = 0, distinct: int = 10000, kind: str = "text"
+) -> Tuple[List[str], List[List[Any]]]:
+    """Return a header and rows of synthetic data.
+
+    Each column has up to **distinct** different values, which are strings
+    if **kind** is text or ints and floats if it is numeric. Roughly one
+    cell in ten is empty and, for text, one row in ten is short. The first
+    column is never empty, so tables can be sorted by it.
+    """
+    generator = random.Random(seed)
+    header = ["Column {}".format(i) for i in range(columns)]
+    values: List[Any]
+    if kind == "numeric":
+        values = [i if i % 2 else i / 4 for i in range(distinct)]
+    else:
+        values = ["Value {}".format(i) for i in range(distinct)]
+    data = []
+    for _ in range(rows):
+        row: List[Any] = [generator.choice(values)]
+        row.extend(
+            "" if generator.random() < 0.1 else generator.choice(values)
+            for _ in range(columns - 1)
+        )
+        if kind == "text" and generator.random() < 0.1:
+            row = row[: generator.randint(1, columns)]
+        data.append(row)
+    return header, data
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Return the :data:`PERCENTILES` of **samples** by name, such as p90."""
+    if len(samples) < 2:
+        return {"p{}".format(percent): samples[0] for percent in PERCENTILES}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p{}".format(percent): cuts[percent - 1] for percent in PERCENTILES}
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Tuple[List[float], int]:
+    """Return the time taken by each call of function and peak bytes allocated.
+
+    Memory is traced in a separate call so tracing does not affect the timing.
+    """
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return samples, peak
+
+
+def read_cells(table: Table) -> None:
+    """Read every cell of a table by column name."""
+    header = table.header
+    for row in table:
+        for column in header:
+            row[column]
+
+
+Setup = Callable[[], Callable[[], Any]]
+
+
+def cases(
+    size: int, shape: Shape, directory: Path, max_slow_rows: int
+) -> Iterator[Tuple[str, str, Setup]]:
+    """Yield the name, table type and setup function of each benchmark.
+
+    Each setup function creates the data or files its benchmark needs and
+    returns the function to time, so nothing is created for benchmarks which
+    are not run.
+    """
+
+    @functools.lru_cache(maxsize=None)
+    def data() -> Tuple[List[str], List[List[Any]]]:
+        return make_data(size, shape.columns, distinct=shape.distinct, kind=shape.kind)
+
+    @functools.lru_cache(maxsize=None)
+    def table() -> Table:
+        header, rows = data()
+        return Table(header=header, data=rows)
+
+    def load() -> Callable[[], Any]:
+        header, rows = data()
+        return functools.partial(Table, header=header, data=rows)
+
+    def render() -> Callable[[], Any]:
+        rendered = table()
+        return lambda: ToHTML(rendered).render()
+
+    def write(table_type: BaseTableType, path: Path) -> Callable[[], Any]:
+        return functools.partial(table_type.write, table(), path)
+
+    def open_file(
+        table_type: BaseTableType, path: Path, intern: bool = False
+    ) -> Callable[[], Any]:
+        table_type.write(table(), path)
+        if intern:
+            return functools.partial(Table, str(path), intern=True)
+        return functools.partial(Table, str(path), table_type)
+
+    yield "load", "", load
+    yield "row access", "", lambda: functools.partial(read_cells, table())
+    yield "sort", "", lambda: functools.partial(table().sorted, data()[0][0])
+    yield "render", "ToHTML", render
+    for name, table_type in table_types().items():
+        if name in SLOW_TYPES and size > max_slow_rows:
+            continue
+        path = directory / "benchmark{}".format(table_type.extension)
+        yield "write", name, functools.partial(write, table_type, path)
+        if name in READABLE_TYPES:
+            yield "open", name, functools.partial(open_file, table_type, path)
+            if name == "CSV":
+                yield "open intern", name, functools.partial(
+                    open_file, table_type, path, intern=True
+                )
+
+
+def run(
+    sizes: List[int],
+    shapes: List[str],
+    repeat: int,
+    max_slow_rows: int,
+    only: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Run the benchmarks, print the results and return them."""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for shape_name in shapes:
+            shape = SHAPES[shape_name]
+            for size in sizes:
+                for name, table_type, setup in cases(
+                    size, shape, Path(directory), max_slow_rows
+                ):
+                    if only and name not in only:
+                        continue
+                    samples, peak = measure(setup(), repeat)
+                    result = {
+                        "name": name,
+                        "table_type": table_type,
+                        "shape": shape_name,
+                        "rows": size,
+                        "columns": shape.columns,
+                        "samples": samples,
+                        "throughput": size / statistics.median(samples),
+                        "min": min(samples),
+                        "median": statistics.median(samples),
+                        "peak_bytes": peak,
+                    }
+                    result.update(percentiles(samples))
+                    results.append(result)
+                    print_result(result)
+    return {
+        "metadata": {
+            "tabler": tabler.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def key(result: Dict[str, Any]) -> str:
+    """Return a name identifying a benchmark across runs."""
+    name = result["name"]
+    if result["table_type"]:
+        name = "{} {}".format(name, result["table_type"])
+    return "{} {} {}".format(name, result["shape"], result["rows"])
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    """Print the result of a benchmark."""
+    print(
+        "{:<36} {:>12.0f} rows/s  min {:>9.4f} s  median {:>9.4f} s  "
+        "p90 {:>9.4f} s  p99 {:>9.4f} s {:>10.1f} MiB peak".format(
+            key(result),
+            result["throughput"],
+            result["min"],
+            result["median"],
+            result["p90"],
+            result["p99"],
+            result["peak_bytes"] / 2**20,
+        )
+    )
+
+
+def compare(
+    before: Dict[str, Any], after: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Print the change in each benchmark and return those which regressed.
+
+    A benchmark regresses if its median time or its peak memory increases
+    by more than **threshold**, a fraction of the value before. Memory
+    increases of less than :data:`MEMORY_NOISE` bytes are ignored.
+    """
+    previous = {key(result): result for result in before["results"]}
+    regressions = []
+    for result in after["results"]:
+        name = key(result)
+        if name not in previous:
+            continue
+        old = previous[name]
+        time_change = result["median"] / old["median"] - 1
+        memory_change = result["peak_bytes"] / max(old["peak_bytes"], 1) - 1
+        memory_regressed = (
+            memory_change > threshold
+            and result["peak_bytes"] - old["peak_bytes"] > MEMORY_NOISE
+        )
+        regressed = time_change > threshold or memory_regressed
+        if regressed:
+            regressions.append(name)
+        print(
+            "{:<36} time {:>+7.1%}  memory {:>+7.1%}{}".format(
+                name, time_change, memory_change, "  REGRESSION" if regressed else ""
+            )
+        )
+    return regressions
+
+
+def main() -> None:
+    """Parse command line arguments and run or compare benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    run_parser.add_argument(
+        "--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES)
+    )
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--max-slow-rows", type=int, default=10000)
+    run_parser.add_argument(
+        "--only", nargs="+", help="Names of the operations to run, such as sort."
+    )
+    run_parser.add_argument("--output", help="Path of a JSON file for the results.")
+    compare_parser = commands.add_parser("compare", help="Compare two runs.")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Fractional increase counted as a regression. Default 0.1.",
+    )
+    arguments = parser.parse_args()
+    if arguments.command == "run":
+        results = run(
+            arguments.sizes,
+            arguments.shapes,
+            arguments.repeat,
+            arguments.max_slow_rows,
+            arguments.only,
+        )
+        if arguments.output:
+            with open(arguments.output, "w") as f:
+                json.dump(results, f, indent=2)
+    else:
+        with open(arguments.before) as f:
+            before = json.load(f)
+        with open(arguments.after) as f:
+            after = json.load(f)
+        regressions = compare(before, after, arguments.threshold)
+        if regressions:
+            print("{} regressions".format(len(regressions)))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,15 +29,39 @@ from .__version__ import (
     __url__,
     __version__,
 )
+from .concat import concat
+from .query import where
+from .schema import Schema
+from .shm import SharedTable
+from .sorting import external_sort
 from .table import Table
-from .tabletypes import CSV, CSVURL, HTML, ODS, XLSX
+from .tabletypes import (
+    CSV,
+    CSVURL,
+    HTML,
+    ODS,
+    XLSX,
+    Arrow,
+    Parquet,
+    Snapshot,
+    SQLite,
+)
 
 __all__ = [
     "Table",
+    "where",
+    "concat",
+    "external_sort",
+    "SharedTable",
+    "Schema",
     "CSV",
     "CSVURL",
     "HTML",
     "ODS",
+    "Arrow",
+    "Parquet",
+    "Snapshot",
+    "SQLite",
     "XLSX",
     "__author_email__",
     "__author__",
@@ -0,0 +1,132 @@
+"""
+Compressed files.
+
+This module provides :func:`tabler.compression.open_file` which is used by
+table types to read and write files compressed with gzip (.gz), bzip2 (.bz2),
+xz (.xz) or Zstandard (.zst). Files are decompressed as they are read and
+compressed as they are written, so the uncompressed file is never stored.
+
+Compression is detected from the last extension of a path, so
+``table.csv.gz`` is a gzip compressed .csv file. When reading a file without
+a compression extension its first bytes are checked instead.
+
+Only :class:`tabler.CSV` and :class:`tabler.Snapshot` files can be
+compressed. Writing other table types to a path with a compression extension
+raises ValueError.
+
+Zstandard requires the optional zstandard package on Python versions before
+3.14, which can be installed with ``pip install tabler[zstd]``.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+from typing import IO, Any, Dict, Optional, Tuple, Union
+
+EXTENSIONS: Dict[str, str] = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+}
+
+MAGIC_NUMBERS: Dict[bytes, str] = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+
+
+def split_extension(path: Union[str, "os.PathLike[str]"]) -> Tuple[str, str]:
+    """Return the extension of a file and its compression extension.
+
+    For example ``table.csv.gz`` returns ``('.csv', '.gz')`` and
+    ``table.csv`` returns ``('.csv', '')``.
+
+    :param path: Path to file.
+    :type path: str, pathlib.Path or compatible.
+    """
+    root, extension = os.path.splitext(os.fspath(path))
+    if extension.lower() not in EXTENSIONS:
+        return extension, ""
+    return os.path.splitext(root)[1], extension
+
+
+def compression_of(
+    path: Union[str, "os.PathLike[str]"], mode: str = "r"
+) -> Optional[str]:
+    """Return the compression used by a file, or None if it is not compressed.
+
+    Compression is detected from the extension of **path**. If it has no
+    compression extension and **mode** is for reading, the first bytes of the
+    file are checked.
+
+    :param path: Path to file.
+    :type path: str, pathlib.Path or compatible.
+    :param str mode: Mode in which the file will be opened.
+    """
+    compression_extension = split_extension(path)[1]
+    if compression_extension:
+        return EXTENSIONS[compression_extension.lower()]
+    if "r" not in mode:
+        return None
+    try:
+        with open(os.fspath(path), "rb") as f:
+            start = f.read(max(map(len, MAGIC_NUMBERS)))
+    except OSError:
+        return None
+    for magic, compression in MAGIC_NUMBERS.items():
+        if start.startswith(magic):
+            return compression
+    return None
+
+
+def open_file(
+    path: Union[str, "os.PathLike[str]"],
+    mode: str = "rb",
+    encoding: Optional[str] = None,
+    newline: Optional[str] = None,
+) -> IO[Any]:
+    """Open a file, which may be compressed.
+
+    Takes the same arguments as :func:`open`. Compression is detected with
+    :func:`tabler.compression.compression_of`.
+
+    :param path: Path to file.
+    :type path: str, pathlib.Path or compatible.
+    :param str mode: Mode in which the file is opened, as for :func:`open`.
+    :param encoding: Encoding of text files.
+    :type encoding: str or None.
+    :param newline: Newline handling of text files, as for :func:`open`.
+    :type newline: str or None.
+    :raises ImportError: If the file uses Zstandard and it is not available.
+    """
+    path = os.fspath(path)
+    compression = compression_of(path, mode)
+    if compression is None:
+        return open(path, mode, encoding=encoding, newline=newline)
+    if "b" not in mode and "t" not in mode:
+        mode += "t"
+    if compression == "gzip":
+        return gzip.open(path, mode, encoding=encoding, newline=newline)  # type: ignore[return-value]
+    if compression == "bz2":
+        return bz2.open(path, mode, encoding=encoding, newline=newline)
+    if compression == "xz":
+        return lzma.open(path, mode, encoding=encoding, newline=newline)
+    return _zstd_open(path, mode, encoding=encoding, newline=newline)
+
+
+def _zstd_open(path: str, mode: str, **kwargs: Any) -> IO[Any]:
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+    except ImportError:
+        try:
+            import zstandard as zstd  # type: ignore[no-redef]
+        except ImportError:
+            raise ImportError(
+                "zstandard is required for .zst files. "
+                "Install it with: pip install tabler[zstd]"
+            ) from None
+    return zstd.open(path, mode, **kwargs)  # type: ignore[no-any-return]
@@ -0,0 +1,76 @@
+"""
+Concatenation of tables.
+
+This module provides the :func:`tabler.concat` function which joins the rows
+of several tables into one.
+
+    Basic Usage::
+
+        >>> from tabler import Table, concat
+        >>> tables = [Table(path) for path in paths]
+        >>> table = concat(tables, align='union')
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .table import Table
+from .tablerow import TableRow
+from .tabletypes.basetabletype import projection
+
+ALIGNMENTS = ("union", "intersection")
+
+
+def concat(tables: Iterable[Table], align: str = "union") -> Table:
+    """Return a new Table containing the rows of each of **tables** in turn.
+
+    Columns are matched by header. Rows of tables with the same header as
+    the new table are shared with it rather than copied, see
+    :func:`tabler.Table.__getitem__`. Other rows are rearranged to match the
+    new header.
+
+    :param tables: Tables to join.
+    :type tables: list(:class:`tabler.Table`)
+    :param str align: ``'union'`` to include every column of every table,
+        with empty cells where a table does not have a column, or
+        ``'intersection'`` to include only the columns all tables have.
+        Columns are in the order they first appear.
+    :raises ValueError: If **align** is not recognised or there are no tables.
+    :rtype: :class:`tabler.Table`
+    """
+    if align not in ALIGNMENTS:
+        raise ValueError(
+            "Alignment {!r} not recognised. Use one of {}.".format(
+                align, ", ".join(ALIGNMENTS)
+            )
+        )
+    tables = list(tables)
+    if not tables:
+        raise ValueError("No tables to concatenate.")
+    header = _align_headers([table.header for table in tables], align)
+    headers = TableRow.index_header(header)
+    empty_value = tables[0]._empty_value()
+    rows: List[TableRow] = []
+    for table in tables:
+        if table.header == header:
+            rows.extend(table._storage())
+            continue
+        project = projection(
+            [table._headers.get(column) for column in header], empty_value
+        )
+        rows.extend(
+            TableRow(list(project(row.row)), header, headers)
+            for row in table._storage()
+        )
+    return tables[0]._view(rows, header)
+
+
+def _align_headers(headers: Sequence[Tuple[str, ...]], align: str) -> Tuple[str, ...]:
+    """Return the header of the concatenated table."""
+    columns: Dict[str, None] = {}
+    for header in headers:
+        columns.update(dict.fromkeys(header))
+    if align == "intersection":
+        for header in headers:
+            present = set(header)
+            columns = {column: None for column in columns if column in present}
+    return tuple(columns)
@@ -0,0 +1,146 @@
+"""
+Removal of duplicate rows.
+
+This module provides functions used by :func:`tabler.Table.drop_duplicates`
+and functions to remove duplicate rows from a stream of rows without loading
+them into a table.
+
+    Basic Usage::
+
+        >>> from tabler import CSV
+        >>> from tabler.dedup import unique_rows
+        >>> rows = CSV().read_rows('orders.csv')
+        >>> header = next(rows)
+        >>> for row in unique_rows(rows, columns=[0], capacity=10_000_000):
+        ...     process(row)
+
+By default the key of every row seen is kept in memory. If **capacity** is
+given a :class:`tabler.dedup.BloomFilter` is used instead, which uses a
+fixed amount of memory but occasionally treats a new row as a duplicate.
+"""
+
+import math
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+)
+
+from .tabletypes.basetabletype import projection
+
+T = TypeVar("T")
+
+
+class BloomFilter:
+    """Probabilistic set of fixed size.
+
+    Items which have been added are always found. Items which have not been
+    added are found with a probability of about **error_rate** once
+    **capacity** items have been added.
+
+    :param int capacity: Number of items expected to be added.
+    :param float error_rate: Chance of finding an item which was not added
+        once **capacity** items have been added. Default 0.01.
+    :raises ValueError: If **capacity** or **error_rate** is out of range.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """Construct :class:`tabler.dedup.BloomFilter`."""
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        if not 0 < error_rate < 1:
+            raise ValueError("Error rate must be between 0 and 1.")
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def __contains__(self, item: Hashable) -> bool:
+        bits = self.bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def add(self, item: Hashable) -> bool:
+        """Add **item** and return True if it may have been added before."""
+        bits = self.bits
+        found = True
+        for position in self._positions(item):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                found = False
+        return found
+
+    def _positions(self, item: Hashable) -> Iterator[int]:
+        """Return the bits used by **item**, found by double hashing."""
+        value = hash(item) & 0xFFFFFFFFFFFFFFFF
+        first, second = value & 0xFFFFFFFF, (value >> 32) | 1
+        size = self.size
+        return ((first + i * second) % size for i in range(self.hash_count))
+
+
+def unique(
+    items: Iterable[T],
+    key: Callable[[T], Hashable],
+    capacity: Optional[int] = None,
+    error_rate: float = 0.01,
+) -> Iterator[T]:
+    """Yield the first item with each key in a single pass.
+
+    :param items: Items to be filtered.
+    :param key: Function returning the key of an item.
+    :param capacity: If not None keys are kept in a
+        :class:`tabler.dedup.BloomFilter` expecting this many keys.
+    :type capacity: int or None.
+    :param float error_rate: Error rate of the Bloom filter.
+    """
+    if capacity is not None:
+        seen = BloomFilter(capacity, error_rate)
+        add = seen.add
+        return (item for item in items if not add(key(item)))
+    return _unique_exact(items, key)
+
+
+def _unique_exact(items: Iterable[T], key: Callable[[T], Hashable]) -> Iterator[T]:
+    seen: Set[Hashable] = set()
+    add = seen.add
+    for item in items:
+        item_key = key(item)
+        if item_key not in seen:
+            add(item_key)
+            yield item
+
+
+def unique_rows(
+    rows: Iterable[Sequence[Any]],
+    columns: Optional[Sequence[int]] = None,
+    capacity: Optional[int] = None,
+    error_rate: float = 0.01,
+) -> Iterator[Sequence[Any]]:
+    """Yield rows whose cells have not been seen before, as they are read.
+
+    :param rows: Rows to be filtered, such as those returned by
+        :func:`tabler.tabletypes.BaseTableType.read_rows` after the header.
+    :param columns: Indexes of the cells compared. If None whole rows are
+        compared.
+    :type columns: list(int) or None.
+    :param capacity: If not None use a :class:`tabler.dedup.BloomFilter`
+        expecting this many distinct rows, so memory use is fixed. About
+        **error_rate** of unique rows will then be dropped.
+    :type capacity: int or None.
+    :param float error_rate: Error rate of the Bloom filter. Default 0.01.
+    """
+    key: Callable[[Sequence[Any]], Hashable] = tuple
+    if columns is not None:
+        project = projection(list(columns))
+        key = lambda row: tuple(project(row))  # noqa: E731
+    return unique(rows, key, capacity, error_rate)
@@ -0,0 +1,317 @@
+"""
+Differences between tables.
+
+This module provides :func:`tabler.Table.diff`, which compares two tables by
+key, and :func:`tabler.diff.diff_sorted`, which compares two files sorted by
+key without loading them.
+
+    Basic Usage::
+
+        >>> from tabler import Table
+        >>> yesterday, today = Table('yesterday.csv'), Table('today.csv')
+        >>> diff = yesterday.diff(today, key=['SKU'])
+        >>> len(diff.added), len(diff.removed), len(diff.changed)
+        (12, 3, 40)
+        >>> diff.changed[0].columns
+        {'Price': ('9.99', '8.99')}
+
+Only columns which are in both tables are compared. The compared cells of
+each row of the first table are stored by key, so each row of the second
+table is found with a single lookup and compared with one tuple comparison.
+"""
+
+import os
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .compression import split_extension
+from .schema import ColumnType, Schema
+from .sorting import Key, RunSorter, read_raw_rows
+from .tabletypes import BaseTableType
+
+if TYPE_CHECKING:
+    from .table import Table
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+class Change(NamedTuple):
+    """A row which differs between two tables."""
+
+    #: added, removed or changed.
+    kind: str
+    #: Values of the key columns of the row.
+    key: Tuple[Any, ...]
+    #: The row in the first table, or None if it was added. A copy of the
+    #: :class:`tabler.tablerow.TableRow` for tables or a list of cells for
+    #: files.
+    old: Any
+    #: The row in the second table, or None if it was removed.
+    new: Any
+    #: The old and new values of each changed column, by column header.
+    columns: Dict[str, Tuple[Any, Any]]
+
+
+class Diff(NamedTuple):
+    """Differences between two :class:`tabler.Table` instances.
+
+    **added** and **removed** share row data with the tables compared, see
+    :func:`tabler.Table.__getitem__`.
+    """
+
+    #: Rows of the second table with keys which are not in the first.
+    added: "Table"
+    #: Rows of the first table with keys which are not in the second.
+    removed: "Table"
+    #: Rows with the same key in both tables but different values.
+    changed: List[Change]
+
+    @property
+    def column_changes(self) -> Dict[str, int]:
+        """Return the number of changed rows in which each column changed."""
+        counts: Dict[str, int] = {}
+        for change in self.changed:
+            for column in change.columns:
+                counts[column] = counts.get(column, 0) + 1
+        return counts
+
+    def __bool__(self) -> bool:
+        return bool(len(self.added) or len(self.removed) or self.changed)
+
+
+def diff_tables(
+    old: "Table",
+    new: "Table",
+    key: Key,
+    columns: Optional[Sequence[str]] = None,
+) -> Diff:
+    """Return the differences between two tables. See :func:`tabler.Table.diff`."""
+    names = [old.header[old._column_index(column)] for column in _columns(key)]
+    old_keys = _getter([old._column_index(name) for name in names])
+    new_keys = _getter([new._column_index(name) for name in names])
+    old_indexes, new_indexes, compared = _compared(
+        old.header, new.header, names, columns
+    )
+    old_cells = _getter(old_indexes)
+    new_cells = _getter(new_indexes)
+    old_rows = old._storage()
+    old_by_key: Dict[Tuple[Any, ...], Tuple[Tuple[Any, ...], int]] = {}
+    for index, row in enumerate(old_rows):
+        row_key = old_keys(row.row)
+        if row_key in old_by_key:
+            raise ValueError("Key {!r} is not unique.".format(row_key))
+        old_by_key[row_key] = (old_cells(row.row), index)
+    added = []
+    changed = []
+    seen = set()
+    for row in new._storage():
+        row_key = new_keys(row.row)
+        if row_key in seen:
+            raise ValueError("Key {!r} is not unique.".format(row_key))
+        seen.add(row_key)
+        found = old_by_key.get(row_key)
+        if found is None:
+            added.append(row)
+            continue
+        cells = new_cells(row.row)
+        if cells == found[0]:
+            continue
+        changes = _changes(found[0], cells, compared)
+        if changes:
+            old_row = old_rows[found[1]].copy()
+            changed.append(Change(CHANGED, row_key, old_row, row.copy(), changes))
+    removed = [
+        old_rows[index]
+        for row_key, (_, index) in old_by_key.items()
+        if row_key not in seen
+    ]
+    return Diff(new._view(added), old._view(removed), changed)
+
+
+def diff_sorted(
+    old_path: Union[str, "os.PathLike[str]"],
+    new_path: Union[str, "os.PathLike[str]"],
+    key: Key,
+    columns: Optional[Sequence[str]] = None,
+    schema: Optional[Union[Mapping[Union[int, str], ColumnType], Schema]] = None,
+    table_type: Optional[BaseTableType] = None,
+    new_table_type: Optional[BaseTableType] = None,
+) -> Iterator[Change]:
+    """Return the differences between two files sorted by **key**.
+
+    The files are read side by side a row at a time, so files of any size
+    can be compared. They must be sorted in ascending order with the same
+    **key** and **schema**, as :func:`tabler.external_sort` sorts them.
+    Changes are returned in key order as they are found. **old** and **new**
+    are lists of parsed cells.
+
+    :param old_path: Path of the first file.
+    :type old_path: str, pathlib.Path or compatible.
+    :param new_path: Path of the second file.
+    :type new_path: str, pathlib.Path or compatible.
+    :param key: Header of the column which identifies rows, or a list of
+        them.
+    :type key: str or list(str).
+    :param columns: Headers of the columns to compare. If None all columns in
+        both files, other than the key, are compared.
+    :type columns: list(str) or None.
+    :param schema: Types to convert columns to as they are read. See
+        :class:`tabler.Schema`.
+    :type schema: dict, :class:`tabler.Schema` or None.
+    :param table_type: Table Type used to read **old_path**. If None it is
+        chosen by extension.
+    :type table_type: :class:`tabler.tabletypes.BaseTableType` or None.
+    :param new_table_type: Table Type used to read **new_path**. If None
+        and **new_path** has the same extension as **old_path**,
+        **table_type** is used, otherwise one is chosen by extension.
+    :type new_table_type: :class:`tabler.tabletypes.BaseTableType` or None.
+    :rtype: iterator(:class:`tabler.diff.Change`)
+    :raises ValueError: If a file is not sorted by **key**, a key is
+        repeated or a column is not in the header.
+    """
+    if table_type is None:
+        table_type = BaseTableType.get_by_extension(split_extension(old_path)[0])
+    if new_table_type is None:
+        extension = split_extension(new_path)[0]
+        if extension.lower() == split_extension(old_path)[0].lower():
+            new_table_type = table_type
+        else:
+            new_table_type = BaseTableType.get_by_extension(extension)
+    if schema is not None:
+        schema = Schema(schema)
+    old = _SortedRows(table_type, old_path, key, schema)
+    try:
+        new = _SortedRows(new_table_type, new_path, key, schema)
+    except BaseException:
+        old.close()
+        raise
+    try:
+        old_indexes, new_indexes, names = _compared(
+            old.header, new.header, key, columns
+        )
+        old_cells = _getter(old_indexes)
+        new_cells = _getter(new_indexes)
+        old_row, new_row = old.next(), new.next()
+        while old_row is not None or new_row is not None:
+            if new_row is None or (
+                old_row is not None and old.order(old_row) < new.order(new_row)
+            ):
+                assert old_row is not None
+                yield Change(REMOVED, old.key(old_row), old_row, None, {})
+                old_row = old.next()
+            elif old_row is None or new.order(new_row) < old.order(old_row):
+                yield Change(ADDED, new.key(new_row), None, new_row, {})
+                new_row = new.next()
+            else:
+                changes = _changes(old_cells(old_row), new_cells(new_row), names)
+                if changes:
+                    yield Change(CHANGED, old.key(old_row), old_row, new_row, changes)
+                old_row, new_row = old.next(), new.next()
+    finally:
+        old.close()
+        new.close()
+
+
+class _SortedRows:
+    """Parsed rows of a file, checked to be in key order."""
+
+    def __init__(
+        self,
+        table_type: BaseTableType,
+        path: Union[str, "os.PathLike[str]"],
+        key: Key,
+        schema: Optional[Schema],
+    ) -> None:
+        self.path = path
+        self.header, self.rows = read_raw_rows(table_type, path)
+        self.indexes = [
+            BaseTableType._column_index(self.header, column) for column in _columns(key)
+        ]
+        self.sorter = RunSorter(table_type, self.header, self.indexes, False, schema)
+        self.key = _getter(self.indexes)
+        self.order = self.sorter.key
+        self.parsed = self.sorter.parse(self.rows)
+        self.previous: Optional[Tuple[Any, ...]] = None
+
+    def next(self) -> Optional[List[Any]]:
+        """Return the next row, or None at the end of the file."""
+        for row in self.parsed:
+            order = self.order(row)
+            if self.previous is not None and order <= self.previous:
+                raise ValueError(
+                    "{} is not sorted by key, or key {!r} is repeated.".format(
+                        self.path, self.key(row)
+                    )
+                )
+            self.previous = order
+            return row
+        return None
+
+    def close(self) -> None:
+        close = getattr(self.rows, "close", None)
+        if close is not None:
+            close()
+
+
+def _columns(key: Key) -> List[Union[int, str]]:
+    return [key] if isinstance(key, (int, str)) else list(key)
+
+
+def _getter(indexes: List[int]) -> Callable[[Sequence[Any]], Tuple[Any, ...]]:
+    """Return a function giving the cells at **indexes** of a row as a tuple."""
+    if len(indexes) > 1:
+        return itemgetter(*indexes)
+    if indexes:
+        index = indexes[0]
+        return lambda cells: (cells[index],)
+    return lambda cells: ()
+
+
+def _compared(
+    old_header: Sequence[str],
+    new_header: Sequence[str],
+    key: Key,
+    columns: Optional[Sequence[str]],
+) -> Tuple[List[int], List[int], List[str]]:
+    """Return the indexes in each header and the names of the compared columns."""
+    keys = {
+        old_header[column] if isinstance(column, int) else column
+        for column in _columns(key)
+    }
+    new_columns = {name: index for index, name in reversed(list(enumerate(new_header)))}
+    if columns is None:
+        names = [name for name in dict.fromkeys(old_header) if name in new_columns]
+        names = [name for name in names if name not in keys]
+    else:
+        names = list(columns)
+        for name in names:
+            if name not in new_columns or name not in old_header:
+                raise ValueError("Column {!r} not in both headers.".format(name))
+    old_indexes = [list(old_header).index(name) for name in names]
+    return old_indexes, [new_columns[name] for name in names], names
+
+
+def _changes(
+    old: Tuple[Any, ...], new: Tuple[Any, ...], names: List[str]
+) -> Dict[str, Tuple[Any, Any]]:
+    """Return the old and new values of each column which differs."""
+    return {
+        name: (old_value, new_value)
+        for name, old_value, new_value in zip(names, old, new)  # noqa: B905
+        if old_value != new_value
+    }
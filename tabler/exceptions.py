@@ -1,5 +1,7 @@
 """Exceptions for tabler package."""
 
+from typing import Any
+
 
 class ExtensionNotRecognised(ValueError):
     """Error finding TableType subclass by file extension."""
@@ -22,3 +24,35 @@ class TableInitialisationError(TypeError):
             "Table cannot be initialised. "
             "Either filepath or header and data must be specified."
         )
+
+
+class ConversionError(ValueError):
+    """Error converting a cell to the type given by a schema."""
+
+    def __init__(self, row: int, column: str, value: Any, error: Exception) -> None:
+        """
+        Initialise ConversionError exception.
+
+        :param int row: Index of the row containing the cell.
+        :param str column: Header of the column containing the cell.
+        :param value: Value which could not be converted.
+        :param error: Exception raised by the conversion.
+        """
+        self.row = row
+        self.column = column
+        self.value = value
+        self.error = error
+        super().__init__(row, column, value, error)
+
+    def __str__(self) -> str:
+        return "Row {} column {!r}: cannot convert {!r}: {}".format(
+            self.row, self.column, self.value, self.error
+        )
+
+
+class Cancelled(Exception):
+    """Loading or writing a table was cancelled."""
+
+    def __init__(self) -> None:
+        """Initialise Cancelled exception."""
+        super().__init__("Cancelled.")
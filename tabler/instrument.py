@@ -0,0 +1,260 @@
+"""
+Timing and memory events for reading and writing tables.
+
+This module lets functions be called with an :class:`tabler.instrument.Event`
+each time :class:`tabler.Table` reads or writes a file, for example to export
+timings to a monitoring system.
+
+    Basic Usage::
+
+        >>> from tabler import Table, instrument
+        >>> instrument.subscribe(print)
+        >>> table = Table('stock.csv')
+        Event(phase='open', table_type='CSV', path='stock.csv', rows=1000, ...)
+        Event(phase='parse', table_type='CSV', path='stock.csv', rows=1000, ...)
+        Event(phase='load', table_type='CSV', path='stock.csv', rows=1000, ...)
+
+Events are sent for these phases:
+
+open
+    Reading rows from a file, including opening and decompressing it.
+    **rows** is the number of rows read and **bytes** the size of the file.
+parse
+    Filtering and parsing the rows read, not counting the time spent reading
+    them. **rows** is the number of rows kept.
+load
+    Adding the parsed rows to the :class:`tabler.Table`. Tables created
+    with **resident_rows** or **resident_bytes** add rows as they are parsed,
+    so the parse phase includes loading them and no load event is sent.
+write
+    Writing a file with :func:`tabler.Table.write`. **bytes** is the size of
+    the file written.
+
+Peak memory is only measured for handlers subscribed with
+``trace_memory=True``, as it uses :mod:`tracemalloc` which slows Python down.
+As files are read and parsed together the peak of both phases is given in
+the parse event. When no handlers are subscribed nothing is measured.
+
+:func:`tabler.instrument.log` can be subscribed to send events to the
+``tabler`` logger.
+"""
+
+import contextlib
+import logging
+import os
+import time
+import tracemalloc
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+logger = logging.getLogger("tabler")
+
+
+class Event(NamedTuple):
+    """Measurements of a phase of reading or writing a table."""
+
+    #: Name of the phase: open, parse, load or write.
+    phase: str
+    #: Class name of the table type used.
+    table_type: str
+    #: Path of the file, as a string.
+    path: str
+    #: Number of rows handled.
+    rows: int
+    #: Size of the file in bytes, or None if it is not a local file.
+    bytes: Optional[int]
+    #: Time taken in seconds.
+    elapsed: float
+    #: Peak memory allocated in bytes, or None if it was not traced.
+    peak: Optional[int]
+
+
+Handler = Callable[[Event], Any]
+
+#: Subscribed handlers and whether each traces memory.
+handlers: Dict[Handler, bool] = {}
+
+_reading: ContextVar[Optional["Measurement"]] = ContextVar("reading", default=None)
+
+
+def subscribe(handler: Handler, trace_memory: bool = False) -> Handler:
+    """Call **handler** with each :class:`tabler.instrument.Event`.
+
+    :param handler: Function taking an :class:`tabler.instrument.Event`.
+    :param bool trace_memory: If True measure peak memory allocations.
+    :return: **handler**, so this can be used as a decorator.
+    """
+    handlers[handler] = trace_memory
+    return handler
+
+
+def unsubscribe(handler: Handler) -> None:
+    """Stop calling **handler** with events.
+
+    :raises KeyError: If **handler** is not subscribed.
+    """
+    del handlers[handler]
+
+
+@contextlib.contextmanager
+def subscribed(handler: Handler, trace_memory: bool = False) -> Iterator[Handler]:
+    """Subscribe **handler** until the end of a ``with`` block."""
+    subscribe(handler, trace_memory=trace_memory)
+    try:
+        yield handler
+    finally:
+        unsubscribe(handler)
+
+
+def log(event: Event) -> None:
+    """Log an :class:`tabler.instrument.Event` to the tabler logger."""
+    logger.info(
+        "%s %s %s: %d rows, %s bytes in %.6f s, peak %s bytes",
+        event.phase,
+        event.table_type,
+        event.path,
+        event.rows,
+        event.bytes,
+        event.elapsed,
+        event.peak,
+    )
+
+
+def file_size(path: Any) -> Optional[int]:
+    """Return the size of a local file in bytes, or None."""
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+class Measurement:
+    """Time and memory used by a phase, sent to handlers when it ends.
+
+    Create with :func:`tabler.instrument.measure`. Set **rows** and, if
+    needed, **bytes** before the phase ends.
+    """
+
+    def __init__(self, phase: str, table_type: Any, path: Any) -> None:
+        """Construct :class:`tabler.instrument.Measurement`."""
+        self.phase = phase
+        self.table_type = type(table_type).__name__
+        self.path = str(path)
+        self.rows = 0
+        self.bytes: Optional[int] = None
+        self.read_time = 0.0
+        self.rows_read = 0
+        self.trace_memory = any(handlers.values())
+        self._started_tracing = False
+        self._baseline = 0
+
+    def __enter__(self) -> "Measurement":
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._started_tracing = True
+            self._baseline = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        elapsed = time.perf_counter() - self._start
+        peak = None
+        if self.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] - self._baseline
+            if self._started_tracing:
+                tracemalloc.stop()
+        if exc_info[0] is not None:
+            return
+        if self.phase == "parse":
+            rows_read = max(self.rows_read - 1, 0)
+            self.send("open", rows_read, self.bytes, self.read_time, None)
+            elapsed -= self.read_time
+        self.send(self.phase, self.rows, self.bytes, elapsed, peak)
+
+    def send(
+        self,
+        phase: str,
+        rows: int,
+        size: Optional[int],
+        elapsed: float,
+        peak: Optional[int],
+    ) -> None:
+        """Call each handler with an :class:`tabler.instrument.Event`."""
+        event = Event(phase, self.table_type, self.path, rows, size, elapsed, peak)
+        for handler in list(handlers):
+            handler(event)
+
+    def timed(self, rows: Iterable[Sequence[Any]]) -> Iterator[Sequence[Any]]:
+        """Return **rows**, adding the time taken to read them to the open phase.
+
+        **rows_read** counts every row, including the header.
+        """
+        iterator = iter(rows)
+        clock = time.perf_counter
+        try:
+            while True:
+                start = clock()
+                try:
+                    row = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.read_time += clock() - start
+                self.rows_read += 1
+                yield row
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+
+def measure(phase: str, table_type: Any, path: Any) -> Any:
+    """Return a context manager measuring a phase, if any handlers are subscribed.
+
+    If there are no handlers a context manager giving None is returned, so
+    nothing is measured.
+
+    :param str phase: Name of the phase.
+    :param table_type: Table type used.
+    :param path: Path of the file.
+    """
+    if not handlers:
+        return contextlib.nullcontext()
+    return Measurement(phase, table_type, path)
+
+
+@contextlib.contextmanager
+def reading(table_type: Any, path: Any) -> Iterator[Optional[Measurement]]:
+    """Measure reading and parsing a file, if any handlers are subscribed.
+
+    :func:`tabler.tabletypes.BaseTableType.parse_row_data` uses
+    :func:`tabler.instrument.current_reading` to time reading the file
+    separately from parsing it.
+    """
+    if not handlers:
+        yield None
+        return
+    with Measurement("parse", table_type, path) as measurement:
+        measurement.bytes = file_size(path)
+        token = _reading.set(measurement)
+        try:
+            yield measurement
+        finally:
+            _reading.reset(token)
+
+
+def current_reading() -> Optional[Measurement]:
+    """Return the measurement of the file being read, if it is measured."""
+    return _reading.get()
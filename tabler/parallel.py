@@ -0,0 +1,130 @@
+"""
+Running functions over rows in parallel.
+
+This module provides the worker pools used by :func:`tabler.Table.map` and
+:func:`tabler.Table.apply_column`.
+
+    Basic Usage::
+
+        >>> from tabler import Table
+        >>> table = Table('addresses.csv')
+        >>> table.apply_column(
+        ...     'Postcode', normalise_postcode, workers=8, processes=True
+        ... )
+        >>> enriched = table.map(
+        ...     enrich, header=table.header + ('Region',), processes=True
+        ... )
+
+Rows or cells are split into chunks and each chunk is sent to a worker as a
+single task, so the cost of scheduling tasks and, for processes, pickling
+their data is shared by every row of the chunk. Rows are sent to processes
+as lists of cells with the header sent once per chunk, not as
+:class:`tabler.tablerow.TableRow` objects. Results are returned in the
+original order.
+
+Threads suit functions which wait for input and output, such as requests to
+a web service. Processes suit functions which use the CPU, as threads only
+run Python code one at a time. Functions, and their results, must be
+picklable to be run in processes, so they must be defined at the top level of
+a module.
+"""
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from .tablerow import TableRow
+
+#: Number of chunks per worker when no chunk size is given, so that workers
+#: which finish early can take more work.
+CHUNKS_PER_WORKER = 4
+
+
+def map_rows(
+    func: Callable[[TableRow], Any],
+    rows: Sequence[TableRow],
+    header: Sequence[str],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    processes: bool = False,
+) -> List[Any]:
+    """Return the result of **func** for each of **rows**, in order.
+
+    See :func:`tabler.Table.map`.
+    """
+    if processes:
+        cells: Iterable[List[Any]] = (row.row for row in rows)
+        call = partial(_map_row_chunk, func, tuple(header))
+        return _run(call, cells, len(rows), workers, chunksize, processes)
+    return _run(partial(_map_chunk, func), rows, len(rows), workers, chunksize)
+
+
+def map_values(
+    func: Callable[[Any], Any],
+    values: Sequence[Any],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    processes: bool = False,
+) -> List[Any]:
+    """Return the result of **func** for each of **values**, in order.
+
+    See :func:`tabler.Table.apply_column`.
+    """
+    call = partial(_map_chunk, func)
+    return _run(call, values, len(values), workers, chunksize, processes)
+
+
+def _run(
+    call: Callable[[List[Any]], List[Any]],
+    items: Iterable[Any],
+    count: int,
+    workers: Optional[int],
+    chunksize: Optional[int],
+    processes: bool = False,
+) -> List[Any]:
+    """Return the results of **call** for chunks of **items**, joined."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    if chunksize is None:
+        chunksize = count // (workers * CHUNKS_PER_WORKER) + 1
+    elif chunksize < 1:
+        raise ValueError("chunksize must be at least 1.")
+    chunks = _chunks(iter(items), chunksize)
+    results: List[Any] = []
+    if workers == 1 or count <= chunksize:
+        for chunk in chunks:
+            results.extend(call(chunk))
+        return results
+    executor: Executor
+    if processes:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    with executor:
+        for chunk_results in executor.map(call, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def _chunks(items: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _map_chunk(func: Callable[[Any], Any], chunk: List[Any]) -> List[Any]:
+    return [func(item) for item in chunk]
+
+
+def _map_row_chunk(
+    func: Callable[[TableRow], Any], header: Sequence[str], chunk: List[List[Any]]
+) -> List[Any]:
+    """Return the result of **func** for rows of cells sent to a process."""
+    headers = TableRow.index_header(header)
+    return [func(TableRow(cells, header, headers)) for cells in chunk]
@@ -0,0 +1,221 @@
+"""
+Progress reporting and cancellation for reading and writing tables.
+
+:class:`tabler.Table` and :func:`tabler.Table.write` take a **progress**
+function, which is called with a :class:`tabler.progress.Progress` as rows
+are read or written, and a **cancel** :class:`tabler.progress.CancelToken`,
+which stops the load or write when it is cancelled from another thread.
+
+    Basic Usage::
+
+        >>> from tabler import Table
+        >>> from tabler.progress import CancelToken
+        >>> token = CancelToken()
+        >>> def show(progress):
+        ...     print('{} of {} bytes'.format(progress.bytes, progress.total_bytes))
+        >>> table = Table('large.csv', progress=show, cancel=token)
+
+Calling ``token.cancel()`` makes the load raise
+:class:`tabler.exceptions.Cancelled`. The token is checked every
+:data:`tabler.progress.CHUNK_SIZE` rows and **progress** is called at most
+once every :data:`tabler.progress.INTERVAL` seconds, and once more when all
+rows have been handled, so both are cheap.
+
+Rows are counted for all table types. Bytes are counted for uncompressed
+.csv files. Table types count rows as they are written by passing them
+through :func:`tabler.progress.track`.
+"""
+
+import contextlib
+import io
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
+
+from .exceptions import Cancelled
+
+T = TypeVar("T")
+
+#: Number of rows handled between checks for cancellation.
+CHUNK_SIZE = 1000
+
+#: Minimum number of seconds between calls of a progress function.
+INTERVAL = 0.1
+
+
+class Progress(NamedTuple):
+    """Progress of reading or writing a table."""
+
+    #: read or write.
+    phase: str
+    #: Number of rows read or written so far.
+    rows: int
+    #: Total number of rows, or None if it is not known.
+    total_rows: Optional[int]
+    #: Number of bytes read so far, or None if it is not known.
+    bytes: Optional[int]
+    #: Size of the file, or None if it is not known.
+    total_bytes: Optional[int]
+
+
+ProgressCallback = Callable[[Progress], Any]
+
+
+class CancelToken:
+    """Flag used to cancel loading or writing a table from another thread."""
+
+    def __init__(self) -> None:
+        """Construct :class:`tabler.progress.CancelToken`."""
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Cancel the operations using this token."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True if :func:`tabler.progress.CancelToken.cancel` has been called."""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise :class:`tabler.exceptions.Cancelled` if cancelled."""
+        if self._event.is_set():
+            raise Cancelled()
+
+
+class Tracker:
+    """Count rows, report progress and check for cancellation.
+
+    :param str phase: read or write.
+    :param progress: Function called with a :class:`tabler.progress.Progress`.
+    :type progress: callable or None.
+    :param cancel: Token checked for cancellation.
+    :type cancel: :class:`tabler.progress.CancelToken` or None.
+    :param total_rows: Total number of rows, if known.
+    :type total_rows: int or None.
+    :param total_bytes: Size of the file, if known.
+    :type total_bytes: int or None.
+    """
+
+    def __init__(
+        self,
+        phase: str,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[CancelToken] = None,
+        total_rows: Optional[int] = None,
+        total_bytes: Optional[int] = None,
+    ) -> None:
+        """Construct :class:`tabler.progress.Tracker`."""
+        self.phase = phase
+        self.progress = progress
+        self.cancel = cancel
+        self.total_rows = total_rows
+        self.total_bytes = total_bytes
+        self.rows = 0
+        self.bytes: Optional[int] = None
+        #: Function returning the number of bytes read, set by table types.
+        self.position: Optional[Callable[[], int]] = None
+        self._reported = 0.0
+
+    def follow(self, f: IO[Any]) -> None:
+        """Count the bytes read from **f**, if it is an uncompressed file."""
+        buffer = getattr(f, "buffer", f)
+        if isinstance(buffer, io.BufferedReader):
+            self.position = buffer.tell
+            self.total_bytes = os.fstat(buffer.fileno()).st_size
+
+    def check(self) -> None:
+        """Raise if cancelled and report progress if it is time to."""
+        if self.cancel is not None:
+            self.cancel.raise_if_cancelled()
+        if self.progress is not None:
+            now = time.monotonic()
+            if now - self._reported >= INTERVAL:
+                self._reported = now
+                self.report()
+
+    def report(self) -> None:
+        """Call the progress function with the current progress."""
+        if self.progress is None:
+            return
+        if self.position is not None:
+            try:
+                self.bytes = self.position()
+            except ValueError:  # The file has been closed.
+                self.position = None
+        self.progress(
+            Progress(
+                self.phase, self.rows, self.total_rows, self.bytes, self.total_bytes
+            )
+        )
+
+    def wrap(self, items: Iterable[T], skip: int = 0) -> Iterator[T]:
+        """Return **items**, counting them and checking between chunks.
+
+        While the items are read this is the current tracker, see
+        :func:`tabler.progress.current`.
+
+        :param int skip: Number of items at the start not to count, such as
+            a header.
+        """
+        token = _current.set(self)
+        count = 0
+        try:
+            for count, item in enumerate(items, 1 - skip):
+                yield item
+                if not count % CHUNK_SIZE:
+                    self.rows = count
+                    self.check()
+            if self.total_bytes is not None:
+                self.bytes = self.total_bytes
+        finally:
+            self.rows = max(count, 0)
+            _current.reset(token)
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    @contextlib.contextmanager
+    def tracking(self) -> Iterator["Tracker"]:
+        """Make this the current tracker for a ``with`` block.
+
+        Progress is reported once more at the end of the block.
+        """
+        token = _current.set(self)
+        try:
+            self.check()
+            yield self
+        finally:
+            _current.reset(token)
+        self.report()
+
+
+_current: ContextVar[Optional[Tracker]] = ContextVar("tracker", default=None)
+
+
+def current() -> Optional[Tracker]:
+    """Return the tracker of the rows being read or written, if any."""
+    return _current.get()
+
+
+def track(items: Iterable[T]) -> Iterable[T]:
+    """Count **items** with the current tracker, if any.
+
+    Table types pass rows through this as they write them. If no progress is
+    being tracked **items** is returned unchanged.
+    """
+    tracker = _current.get()
+    if tracker is None:
+        return items
+    return tracker.wrap(items)
@@ -0,0 +1,265 @@
+"""
+Conditions for filtering rows.
+
+This module provides the :func:`tabler.where` function which creates
+conditions that can be passed to :func:`tabler.Table.filter` or to
+:class:`tabler.Table` when opening a file. When opening a file rows which do
+not match the condition are dropped as the file is read.
+
+    Basic Usage::
+
+        >>> from tabler import Table, where
+        >>> table = Table('stock.csv', where=where('Qty', '>', 10))
+        >>> in_stock = table.filter(where('Qty', '>', 0) & where('Price', '<', 5))
+
+Conditions can be combined with ``&`` (and), ``|`` (or) and ``~`` (not).
+
+When a condition compares a cell with a number using ``<``, ``<=``, ``>``,
+``>=``, ``==`` or ``!=``, text cells are converted to numbers before they are
+compared. Text which looks like an integer is compared as an int, so large
+IDs keep their precision. Cells which cannot be compared with the value do
+not match, except with ``!=``, which they always match.
+"""
+
+import operator
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    from .tablerow import TableRow
+
+Predicate = Callable[[Sequence[Any]], bool]
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda cell, value: cell in value,
+    "not in": lambda cell, value: cell not in value,
+}
+
+NUMERIC_OPERATORS = ("==", "!=", "<", "<=", ">", ">=")
+
+
+class Condition:
+    """Base class for conditions on the cells of a row.
+
+    Subclasses must implement :func:`tabler.query.Condition.compile` and
+    :attr:`tabler.query.Condition.columns`.
+    """
+
+    def __call__(self, row: "TableRow") -> bool:
+        """Return True if **row** matches the condition.
+
+        :param row: Row to test.
+        :type row: :class:`tabler.tablerow.TableRow`
+        """
+        return self.compile(row.header)(row.row)
+
+    def __and__(self, other: "Condition") -> "Condition":
+        return And(self, other)
+
+    def __or__(self, other: "Condition") -> "Condition":
+        return Or(self, other)
+
+    def __invert__(self) -> "Condition":
+        return Not(self)
+
+    @property
+    def columns(self) -> List[Union[int, str]]:
+        """Return the columns referenced by the condition."""
+        raise NotImplementedError
+
+    def compile(
+        self,
+        header: Sequence[str],
+        converters: Optional[Sequence[Callable[[Any], Any]]] = None,
+        default: Any = None,
+    ) -> Predicate:
+        """Return a function testing a list of cells against the condition.
+
+        :param header: Column headers of the rows to be tested.
+        :param converters: Functions applied to each cell before it is tested,
+            one for each column in **header**. If None cells are tested as
+            they are.
+        :param default: Value used for cells missing from short rows.
+        :rtype: callable
+        """
+        raise NotImplementedError
+
+
+class Where(Condition):
+    """Condition comparing the cells of a column with a value.
+
+    :param column: Name or index of the column to compare.
+    :type column: str or int.
+    :param str operator: One of ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``,
+        ``in`` or ``not in``.
+    :param value: Value with which cells will be compared.
+    :raises ValueError: If **operator** is not recognised.
+    """
+
+    def __init__(self, column: Union[int, str], operator: str, value: Any) -> None:
+        """Construct :class:`tabler.query.Where`."""
+        if operator not in OPERATORS:
+            raise ValueError(
+                "Operator {!r} not recognised. Use one of {}.".format(
+                    operator, ", ".join(OPERATORS)
+                )
+            )
+        self.column = column
+        self.operator = operator
+        self.value = value
+
+    def __repr__(self) -> str:
+        return "where({!r}, {!r}, {!r})".format(self.column, self.operator, self.value)
+
+    @property
+    def columns(self) -> List[Union[int, str]]:
+        """Return the columns referenced by the condition."""
+        return [self.column]
+
+    def column_index(self, header: Sequence[str]) -> int:
+        """Return the index of the column compared by this condition.
+
+        :param header: Column headers of the rows to be tested.
+        :raises ValueError: If the column is not in **header**.
+        """
+        if isinstance(self.column, int):
+            return self.column
+        try:
+            return list(header).index(self.column)
+        except ValueError:
+            raise ValueError("Column {!r} not in header.".format(self.column)) from None
+
+    def compile(
+        self,
+        header: Sequence[str],
+        converters: Optional[Sequence[Callable[[Any], Any]]] = None,
+        default: Any = None,
+    ) -> Predicate:
+        """Return a function testing a list of cells against the condition.
+
+        :param header: Column headers of the rows to be tested.
+        :param converters: Functions applied to each cell before it is tested,
+            one for each column in **header**. If None cells are tested as
+            they are.
+        :param default: Value used for cells missing from short rows.
+        :rtype: callable
+        """
+        index = self.column_index(header)
+        compare = OPERATORS[self.operator]
+        value = self.value
+        convert = converters[index] if converters is not None else None
+        numeric = (
+            self.operator in NUMERIC_OPERATORS
+            and isinstance(value, (int, float))
+            and not isinstance(value, bool)
+        )
+        not_equal = self.operator == "!="
+
+        def predicate(cells: Sequence[Any]) -> bool:
+            if index < len(cells):
+                cell = cells[index]
+                if convert is not None:
+                    cell = convert(cell)
+            else:
+                cell = default
+            if numeric and isinstance(cell, str):
+                try:
+                    cell = int(cell)
+                except ValueError:
+                    try:
+                        cell = float(cell)
+                    except ValueError:
+                        return not_equal
+            try:
+                return bool(compare(cell, value))
+            except TypeError:
+                return not_equal
+
+        return predicate
+
+
+class And(Condition):
+    """Condition matching rows which match all of its conditions."""
+
+    def __init__(self, *conditions: Condition) -> None:
+        """Construct :class:`tabler.query.And`."""
+        self.conditions = conditions
+
+    def __repr__(self) -> str:
+        return "({})".format(" & ".join(repr(_) for _ in self.conditions))
+
+    @property
+    def columns(self) -> List[Union[int, str]]:
+        """Return the columns referenced by the condition."""
+        return [column for _ in self.conditions for column in _.columns]
+
+    def compile(
+        self,
+        header: Sequence[str],
+        converters: Optional[Sequence[Callable[[Any], Any]]] = None,
+        default: Any = None,
+    ) -> Predicate:
+        """Return a function testing a list of cells against the condition."""
+        predicates = [_.compile(header, converters, default) for _ in self.conditions]
+        return lambda cells: all(predicate(cells) for predicate in predicates)
+
+
+class Or(And):
+    """Condition matching rows which match any of its conditions."""
+
+    def __repr__(self) -> str:
+        return "({})".format(" | ".join(repr(_) for _ in self.conditions))
+
+    def compile(
+        self,
+        header: Sequence[str],
+        converters: Optional[Sequence[Callable[[Any], Any]]] = None,
+        default: Any = None,
+    ) -> Predicate:
+        """Return a function testing a list of cells against the condition."""
+        predicates = [_.compile(header, converters, default) for _ in self.conditions]
+        return lambda cells: any(predicate(cells) for predicate in predicates)
+
+
+class Not(Condition):
+    """Condition matching rows which do not match its condition."""
+
+    def __init__(self, condition: Condition) -> None:
+        """Construct :class:`tabler.query.Not`."""
+        self.condition = condition
+
+    def __repr__(self) -> str:
+        return "~{!r}".format(self.condition)
+
+    @property
+    def columns(self) -> List[Union[int, str]]:
+        """Return the columns referenced by the condition."""
+        return self.condition.columns
+
+    def compile(
+        self,
+        header: Sequence[str],
+        converters: Optional[Sequence[Callable[[Any], Any]]] = None,
+        default: Any = None,
+    ) -> Predicate:
+        """Return a function testing a list of cells against the condition."""
+        predicate = self.condition.compile(header, converters, default)
+        return lambda cells: not predicate(cells)
+
+
+def where(column: Union[int, str], operator: str, value: Any) -> Where:
+    """Return a condition comparing the cells of a column with a value.
+
+    :param column: Name or index of the column to compare.
+    :type column: str or int.
+    :param str operator: One of ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``,
+        ``in`` or ``not in``.
+    :param value: Value with which cells will be compared.
+    :rtype: :class:`tabler.query.Where`
+    """
+    return Where(column, operator, value)
@@ -0,0 +1,67 @@
+"""
+Random sampling of rows.
+
+This module provides functions used by :class:`tabler.tabletypes.BaseTableType`
+to take random samples of rows in a single pass as a file is read.
+"""
+
+import math
+import random
+import sys
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def _uniform(generator: random.Random) -> float:
+    """Return a random float greater than 0 and less than 1."""
+    value = generator.random()
+    while value == 0.0:
+        value = generator.random()
+    return value
+
+
+def bernoulli_sample(
+    items: Iterable[T], fraction: float, generator: Optional[random.Random] = None
+) -> Iterator[T]:
+    """Yield each item with probability **fraction**.
+
+    :param items: Items to be sampled.
+    :param float fraction: Probability of each item being kept.
+    :param generator: Random number generator to use.
+    :type generator: random.Random or None.
+    """
+    generator = generator or random.Random()
+    test = generator.random
+    return (item for item in items if test() < fraction)
+
+
+def reservoir_sample(
+    items: Iterable[T], size: int, generator: Optional[random.Random] = None
+) -> List[T]:
+    """Return a uniform random sample of **size** items in their original order.
+
+    Uses reservoir sampling (Algorithm L), which skips over items between
+    replacements rather than drawing a random number for every item.
+
+    :param items: Items to be sampled.
+    :param int size: Number of items to return.
+    :param generator: Random number generator to use.
+    :type generator: random.Random or None.
+    """
+    generator = generator or random.Random()
+    iterator = enumerate(items)
+    reservoir: List[Tuple[int, T]] = list(islice(iterator, size))
+    if size > 0 and len(reservoir) == size:
+        weight = math.exp(math.log(_uniform(generator)) / size)
+        while True:
+            skip = math.floor(math.log(_uniform(generator)) / math.log(1 - weight))
+            skip = min(skip, sys.maxsize)
+            item = next(islice(iterator, skip, None), None)
+            if item is None:
+                break
+            reservoir[generator.randrange(size)] = item
+            weight *= math.exp(math.log(_uniform(generator)) / size)
+    reservoir.sort(key=lambda item: item[0])
+    return [item for _, item in reservoir]
@@ -0,0 +1,205 @@
+"""
+Column types.
+
+This module provides the :class:`tabler.Schema` class which converts the
+cells of columns to given types as a table is loaded.
+
+    Basic Usage::
+
+        >>> from tabler import Table
+        >>> table = Table('stock.csv', schema={'Qty': int, 'Date': 'iso-date'})
+        >>> table.errors
+        []
+
+Types can be given as Python types, as the names in
+:data:`tabler.schema.TYPES` or as any function taking a cell value and
+returning the converted value. Empty cells are not converted.
+
+Cells which cannot be converted keep their original value and a
+:class:`tabler.exceptions.ConversionError` is added to
+:attr:`tabler.Table.errors`.
+"""
+
+import datetime
+import decimal
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+from .exceptions import ConversionError
+
+Converter = Callable[[Any], Any]
+ColumnType = Union[type, str, Converter]
+
+CONVERSION_ERRORS = (ValueError, TypeError, ArithmeticError)
+
+TRUE_VALUES = ("true", "yes", "y", "1")
+FALSE_VALUES = ("false", "no", "n", "0")
+
+
+def to_bool(value: Any) -> bool:
+    """Return a bool from a bool, a number or text such as true or no."""
+    if isinstance(value, (bool, int, float)):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError("Not a boolean.")
+
+
+def to_decimal(value: Any) -> decimal.Decimal:
+    """Return a :class:`decimal.Decimal` from text or a number."""
+    return decimal.Decimal(str(value).strip())
+
+
+def to_date(value: Any) -> datetime.date:
+    """Return a :class:`datetime.date` from an ISO 8601 date or a datetime."""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value).strip())
+
+
+def to_datetime(value: Any) -> datetime.datetime:
+    """Return a :class:`datetime.datetime` from an ISO 8601 date and time."""
+    if isinstance(value, datetime.datetime):
+        return value
+    return datetime.datetime.fromisoformat(str(value).strip())
+
+
+TYPES: Dict[Any, Converter] = {
+    "int": int,
+    "float": float,
+    "str": str,
+    "bool": to_bool,
+    "decimal": to_decimal,
+    "iso-date": to_date,
+    "iso-datetime": to_datetime,
+    int: int,
+    float: float,
+    str: str,
+    bool: to_bool,
+    decimal.Decimal: to_decimal,
+    datetime.date: to_date,
+    datetime.datetime: to_datetime,
+}
+
+
+class Schema:
+    """Types of the columns of a table.
+
+    :param types: Type of each column, by column header or index. Indexes
+        refer to the columns loaded rather than the columns in the file.
+    :type types: dict or :class:`tabler.Schema`
+    :raises ValueError: If a type is not recognised.
+    """
+
+    def __init__(self, types: Union[Mapping[Union[int, str], ColumnType], "Schema"]):
+        """Construct :class:`tabler.Schema`."""
+        if isinstance(types, Schema):
+            types = types.types
+        self.types: Dict[Union[int, str], ColumnType] = dict(types)
+        self.converters = {
+            column: self.converter_for(column_type)
+            for column, column_type in self.types.items()
+        }
+        self.errors: List[ConversionError] = []
+
+    def __repr__(self) -> str:
+        return "Schema({!r})".format(self.types)
+
+    @staticmethod
+    def converter_for(column_type: ColumnType) -> Converter:
+        """Return the function converting values to **column_type**.
+
+        :raises ValueError: If **column_type** is not recognised.
+        """
+        try:
+            return TYPES[column_type]
+        except (KeyError, TypeError):
+            pass
+        if callable(column_type):
+            return column_type
+        raise ValueError("Type {!r} not recognised.".format(column_type))
+
+    def compile(self, header: Sequence[str]) -> List[Optional[Converter]]:
+        """Return the converter for each column in **header**.
+
+        Columns without a type have None.
+
+        :param header: Column headers of the rows to be converted.
+        :raises ValueError: If a column is not in **header**.
+        :raises IndexError: If a column index is out of range.
+        """
+        converters: List[Optional[Converter]] = [None] * len(header)
+        for column, converter in self.converters.items():
+            if isinstance(column, int):
+                if not -len(header) <= column < len(header):
+                    raise IndexError("Column index {} out of range.".format(column))
+                index = column % len(header)
+            elif column in header:
+                index = list(header).index(column)
+            else:
+                raise ValueError("Column {!r} not in header.".format(column))
+            converters[index] = converter
+        return converters
+
+    def row_converter(self, header: Sequence[str]) -> Callable[[List[Any]], List[Any]]:
+        """Return a function converting the cells of rows in place.
+
+        The function is called with each row in turn and returns the row.
+        Cells which cannot be converted are left unchanged and a
+        :class:`tabler.exceptions.ConversionError` is added to
+        :attr:`tabler.Schema.errors`.
+
+        :param header: Column headers of the rows to be converted.
+        """
+        columns = [
+            (index, converter)
+            for index, converter in enumerate(self.compile(header))
+            if converter is not None
+        ]
+        errors = self.errors
+        count = 0
+
+        def convert(row: List[Any]) -> List[Any]:
+            nonlocal count
+            length = len(row)
+            for index, converter in columns:
+                if index < length:
+                    value = row[index]
+                    if value is None or value == "":
+                        continue
+                    try:
+                        row[index] = converter(value)
+                    except CONVERSION_ERRORS as error:
+                        errors.append(
+                            ConversionError(count, header[index], value, error)
+                        )
+            count += 1
+            return row
+
+        return convert
+
+
+def lenient(converter: Converter, parse: Converter) -> Converter:
+    """Return a function parsing and converting a value, ignoring errors.
+
+    Empty values, and values which cannot be converted, are returned after
+    they are parsed.
+
+    :param converter: Function converting values.
+    :param parse: Function applied to values before they are converted.
+    """
+
+    def convert(value: Any) -> Any:
+        value = parse(value)
+        if value is None or value == "":
+            return value
+        try:
+            return converter(value)
+        except CONVERSION_ERRORS:
+            return value
+
+    return convert
@@ -0,0 +1,190 @@
+"""
+Sharing tables between processes.
+
+This module provides :class:`tabler.shm.SharedTable`, which stores a table
+in shared memory so that other processes can load it without the table being
+pickled and sent to each of them.
+
+    Basic Usage::
+
+        >>> from concurrent.futures import ProcessPoolExecutor
+        >>> from tabler import SharedTable, Table
+        >>> def total(shared):
+        ...     return sum(row['Qty'] for row in shared.load(columns=['Qty']))
+        >>> table = Table('orders.csv', schema={'Qty': int})
+        >>> with SharedTable.create(table) as shared:
+        ...     with ProcessPoolExecutor() as executor:
+        ...         list(executor.map(total, [shared] * 4))
+        [1200, 1200, 1200, 1200]
+
+The table is encoded once in the :class:`tabler.Snapshot` format. A pickled
+:class:`SharedTable` holds only the name of the shared memory block, so
+sending it to a worker is cheap however large the table is. Workers decode
+only the columns and rows they load.
+
+Values other than strings, integers, floats, booleans and None are stored as
+strings, as they are by :class:`tabler.Snapshot`. Pickling a
+:class:`tabler.Table` keeps every value.
+"""
+
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from types import TracebackType
+from typing import Any, Collection, Optional, Sequence, Set, Type, Union
+
+from .query import Condition
+from .table import Table
+from .tabletypes.snapshot import Snapshot, SnapshotReader
+
+#: Names of blocks created by this process, and processes forked from it,
+#: which are registered with the resource tracker until they are unlinked.
+_created: Set[str] = set()
+
+
+class SharedTable:
+    """A table stored in shared memory as a snapshot.
+
+    Use :func:`SharedTable.create` to create one. The process which creates
+    the shared memory must :func:`unlink` it when it is no longer needed,
+    which leaving a ``with`` block does. Other processes attach to it by
+    name.
+
+    :param str name: Name of an existing shared memory block.
+    :raises FileNotFoundError: If there is no shared memory block named
+        **name**.
+    :raises ValueError: If the block does not contain a snapshot.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Construct :class:`tabler.shm.SharedTable`."""
+        self._memory = _attach(name)
+        self.owner = False
+        self._read_directory()
+
+    @classmethod
+    def create(cls, table: Table, compress: bool = False) -> "SharedTable":
+        """Return a new :class:`SharedTable` containing **table**.
+
+        :param table: Table to store.
+        :type table: :class:`tabler.Table`
+        :param bool compress: If True compress column data with zlib.
+        :rtype: :class:`tabler.shm.SharedTable`
+        """
+        blocks = Snapshot(compress=compress).encode(table)
+        size = sum(map(len, blocks))
+        memory = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            buffer = memory.buf
+            assert buffer is not None
+            position = 0
+            for block in blocks:
+                buffer[position : position + len(block)] = block
+                position += len(block)
+            shared = cls.__new__(cls)
+            shared._memory = memory
+            shared.owner = True
+            shared._read_directory()
+            _created.add(memory.name)
+        except BaseException:
+            memory.close()
+            memory.unlink()
+            raise
+        return shared
+
+    def _read_directory(self) -> None:
+        reader = SnapshotReader(self._memory.buf)
+        self.header = tuple(reader.header)
+        self.row_count: int = reader.row_count
+        reader.release()
+
+    @property
+    def name(self) -> str:
+        """Return the name of the shared memory block."""
+        return self._memory.name
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def __reduce__(self) -> Any:
+        return (SharedTable, (self.name,))
+
+    def __enter__(self) -> "SharedTable":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def load(
+        self,
+        columns: Optional[Sequence[Union[int, str]]] = None,
+        where: Optional[Condition] = None,
+        nrows: Optional[int] = None,
+        skiprows: Optional[Union[int, Collection[int]]] = None,
+    ) -> Table:
+        """Return a new :class:`tabler.Table` containing the shared table.
+
+        Options work as they do for :class:`tabler.Table`. Only the columns
+        and rows needed are decoded.
+
+        :param columns: If not None only these columns are loaded, in the
+            order given.
+        :type columns: list(str or int)
+        :param where: If not None only rows matching this condition are
+            loaded.
+        :type where: :class:`tabler.query.Condition`
+        :param int nrows: If not None no more than this number of rows are
+            loaded.
+        :param skiprows: Number of rows to skip, or the (zero based) indexes
+            of rows to skip.
+        :type skiprows: int or set(int)
+        :rtype: :class:`tabler.Table`
+        """
+        table_type = Snapshot()
+        options = Table._read_options(
+            columns=columns, where=where, nrows=nrows, skiprows=skiprows
+        )
+        reader = SnapshotReader(self._memory.buf)
+        try:
+            header, data = table_type.read_snapshot(reader, **options)
+        finally:
+            reader.release()
+        table = Table.__new__(Table)
+        table.table_type = table_type
+        table._load(header, data, owned=True)
+        return table
+
+    def close(self) -> None:
+        """Detach from the shared memory block in this process."""
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """Free the shared memory block once every process has closed it."""
+        self._memory.unlink()
+        _created.discard(self.name)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Return the existing shared memory block **name**.
+
+    The block is not left registered with the resource tracker, which would
+    otherwise free it when an unrelated process which attached to it exits.
+    Python 3.13 and later can attach without registering it. Earlier
+    versions register it, so it is unregistered again unless this process
+    created it, as the creator's registration is the same one.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    memory = shared_memory.SharedMemory(name)
+    if os.name == "posix" and memory.name not in _created:
+        resource_tracker.unregister(
+            memory._name, "shared_memory"  # type: ignore[attr-defined]
+        )
+    return memory
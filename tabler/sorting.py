@@ -0,0 +1,300 @@
+"""
+Sorting files larger than memory.
+
+This module provides the :func:`tabler.external_sort` function which sorts
+the rows of a file without loading all of them at once.
+
+    Basic Usage::
+
+        >>> from tabler import external_sort
+        >>> external_sort(
+        ...     'orders.csv', 'sorted.csv', key=['Date', 'Qty'],
+        ...     schema={'Qty': int}, memory_limit=2 * 2**30,
+        ... )
+
+Rows are read in chunks which fit in **memory_limit**. Each chunk is sorted
+in a separate process and saved to a temporary file as a run. The runs are
+then merged into the output file, reading one batch of rows from each run at
+a time.
+"""
+
+import heapq
+import os
+import pickle
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .compression import split_extension
+from .schema import ColumnType, Schema
+from .spill import row_size
+from .tabletypes import BaseTableType
+
+#: Default maximum bytes of rows held in memory at once.
+MEMORY_LIMIT = 256 * 2**20
+
+#: Number of rows pickled together in run files.
+BATCH_SIZE = 1000
+
+#: Number of rows used to estimate the memory used by each row.
+SAMPLE_SIZE = 1000
+
+Key = Union[int, str, Sequence[Union[int, str]]]
+
+
+def external_sort(
+    src_path: Union[str, "os.PathLike[str]"],
+    dst_path: Union[str, "os.PathLike[str]"],
+    key: Key,
+    reverse: bool = False,
+    schema: Optional[Union[Mapping[Union[int, str], ColumnType], Schema]] = None,
+    memory_limit: int = MEMORY_LIMIT,
+    workers: Optional[int] = None,
+    table_type: Optional[BaseTableType] = None,
+    dst_table_type: Optional[BaseTableType] = None,
+    temp_dir: Optional[str] = None,
+) -> int:
+    """Sort the rows of a file into a new file, using limited memory.
+
+    Rows with equal keys keep their original order. Empty cells sort after
+    all other values, or before them if **reverse** is True. Cells which
+    **schema** cannot convert are left as strings, which sort after converted
+    values and before empty cells.
+
+    :param src_path: Path of the file to sort.
+    :type src_path: str, pathlib.Path or compatible.
+    :param dst_path: Path of the sorted file to write.
+    :type dst_path: str, pathlib.Path or compatible.
+    :param key: Header or index of the column to sort by, or a list of them.
+    :type key: str, int or list(str or int).
+    :param bool reverse: If True sort in descending order.
+    :param schema: Types to convert columns to as they are read, so that
+        numbers or dates sort correctly. See :class:`tabler.Schema`.
+    :type schema: dict, :class:`tabler.Schema` or None.
+    :param int memory_limit: Approximate maximum number of bytes of rows held
+        in memory at once. Default 256 MiB.
+    :param workers: Number of processes sorting runs. If None use the number
+        of CPUs. With more than one, **table_type** and **schema** must be
+        picklable.
+    :type workers: int or None.
+    :param table_type: Table Type used to read **src_path**. If None it is
+        chosen by extension.
+    :type table_type: :class:`tabler.tabletypes.BaseTableType` or None.
+    :param dst_table_type: Table Type used to write **dst_path**. If None it
+        is chosen by extension.
+    :type dst_table_type: :class:`tabler.tabletypes.BaseTableType` or None.
+    :param temp_dir: Directory for run files. If None use the default
+        temporary directory.
+    :type temp_dir: str or None.
+    :return: Number of rows written.
+    :rtype: int
+    :raises ValueError: If a key column is not in the header,
+        **dst_path** has a compression extension and **dst_table_type** cannot
+        write compressed files, or **schema** cannot be sent to worker
+        processes.
+    """
+    if table_type is None:
+        table_type = BaseTableType.get_by_extension(split_extension(src_path)[0])
+    if dst_table_type is None:
+        dst_table_type = BaseTableType.get_by_extension(split_extension(dst_path)[0])
+    dst_table_type.check_compression(dst_path)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    header, rows = read_raw_rows(table_type, src_path)
+    try:
+        sorter = RunSorter(
+            table_type,
+            header,
+            _key_indexes(header, key),
+            reverse,
+            None if schema is None else Schema(schema),
+        )
+        if workers > 1:
+            _check_picklable(sorter)
+        with tempfile.TemporaryDirectory(dir=temp_dir) as directory:
+            runs = _sort_runs(
+                rows, sorter, memory_limit // (workers + 1), workers, directory
+            )
+            merged = runs[0]
+            if len(runs) > 1:
+                merged = heapq.merge(*runs, key=sorter.key, reverse=reverse)
+            return dst_table_type.write_rows(header, merged, str(dst_path))
+    finally:
+        close = getattr(rows, "close", None)
+        if close is not None:
+            close()
+
+
+def read_raw_rows(
+    table_type: BaseTableType, path: Union[str, "os.PathLike[str]"]
+) -> Tuple[List[str], Iterator[Sequence[Any]]]:
+    """Return the header of a file and an iterator of its unparsed rows.
+
+    Rows are read as they are needed if **table_type** implements
+    :func:`tabler.tabletypes.BaseTableType.read_rows`, otherwise the whole
+    file is loaded.
+
+    :param table_type: Table Type used to read **path**.
+    :type table_type: :class:`tabler.tabletypes.BaseTableType`
+    :param path: Path to file to be opened.
+    :type path: str, pathlib.Path or compatible.
+    """
+    if type(table_type).read_rows is BaseTableType.read_rows:
+        header, data = table_type.open_path(str(path))
+        return header, iter(data)
+    rows = table_type.read_rows(str(path))
+    try:
+        header = list(next(rows))
+    except StopIteration:
+        raise ValueError("Input has no header or data.") from None
+    return header, rows
+
+
+class RunSorter:
+    """Parse and sort chunks of unparsed rows.
+
+    Instances are sent to worker processes, so they must be picklable.
+
+    :param table_type: Table Type used to parse rows.
+    :param header: Column headers.
+    :param indexes: Indexes of the columns to sort by.
+    :param bool reverse: If True sort in descending order.
+    :param schema: If not None types to convert cells to. Cells which cannot
+        be converted are left unchanged.
+    """
+
+    def __init__(
+        self,
+        table_type: BaseTableType,
+        header: Sequence[str],
+        indexes: List[int],
+        reverse: bool,
+        schema: Optional[Schema],
+    ) -> None:
+        """Construct :class:`tabler.sorting.RunSorter`."""
+        self.table_type = table_type
+        self.header = list(header)
+        self.indexes = indexes
+        self.reverse = reverse
+        self.schema = schema
+
+    def key(self, row: Sequence[Any]) -> Tuple[Any, ...]:
+        """Return the sort key of a parsed row.
+
+        Empty cells sort after other values. Strings sort after other types,
+        so cells which **schema** could not convert are not compared with
+        converted ones.
+        """
+        if len(self.indexes) == 1:
+            value = row[self.indexes[0]]
+            return (value is None or value == "", isinstance(value, str), value)
+        return tuple(
+            (row[i] is None or row[i] == "", isinstance(row[i], str), row[i])
+            for i in self.indexes
+        )
+
+    def sort(self, rows: Sequence[Sequence[Any]]) -> List[List[Any]]:
+        """Return **rows** parsed, padded, converted and sorted."""
+        parsed = list(self.parse(rows))
+        parsed.sort(key=self.key, reverse=self.reverse)
+        return parsed
+
+    def parse(self, rows: Iterable[Sequence[Any]]) -> Iterator[List[Any]]:
+        """Return **rows** parsed, padded and converted, one at a time."""
+        parse_row = self.table_type.parse_row
+        length = len(self.header)
+        padding = [self.table_type.empty_value]
+        convert = None
+        if self.schema is not None:
+            convert = self.schema.row_converter(self.header)
+        for row in rows:
+            values = parse_row(row)
+            if len(values) < length:
+                values.extend(padding * (length - len(values)))
+            if convert is not None:
+                convert(values)
+            yield values
+
+    def save(self, rows: Sequence[Sequence[Any]], path: str) -> None:
+        """Sort **rows** and save them to a run file at **path**."""
+        parsed = self.sort(rows)
+        with open(path, "wb") as f:
+            for start in range(0, len(parsed), BATCH_SIZE):
+                pickle.dump(
+                    parsed[start : start + BATCH_SIZE],
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+
+
+def _check_picklable(sorter: RunSorter) -> None:
+    """Raise ValueError if **sorter** cannot be sent to worker processes."""
+    try:
+        pickle.dumps(sorter, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError) as error:
+        raise ValueError(
+            "The table type and schema must be picklable to sort with more than "
+            "one worker. Define converters at the top level of a module or use "
+            "workers=1. ({})".format(error)
+        ) from error
+
+
+def _key_indexes(header: Sequence[str], key: Key) -> List[int]:
+    columns = [key] if isinstance(key, (int, str)) else list(key)
+    return [BaseTableType._column_index(header, column) for column in columns]
+
+
+def _sort_runs(
+    rows: Iterator[Sequence[Any]],
+    sorter: RunSorter,
+    chunk_memory: int,
+    workers: int,
+    directory: str,
+) -> List[Iterator[List[Any]]]:
+    """Return iterators of sorted runs of rows.
+
+    Chunks of rows are parsed and sorted, up to **workers** at once, and
+    saved to run files. If all rows fit in one chunk it is sorted in memory
+    instead.
+    """
+    first = list(islice(rows, SAMPLE_SIZE))
+    chunk_size = max(SAMPLE_SIZE, chunk_memory // max(row_size(first), 1))
+    chunk = first + list(islice(rows, chunk_size - len(first)))
+    if len(chunk) < chunk_size:
+        return [iter(sorter.sort(chunk))]
+    paths: List[str] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: List[Future] = []
+        while chunk:
+            path = os.path.join(directory, "run{}".format(len(paths)))
+            paths.append(path)
+            if workers == 1:
+                sorter.save(chunk, path)
+            else:
+                pending.append(executor.submit(sorter.save, chunk, path))
+                if len(pending) >= workers:
+                    pending.pop(0).result()
+            chunk = list(islice(rows, chunk_size))
+        for future in pending:
+            future.result()
+    return [_read_run(path) for path in paths]
+
+
+def _read_run(path: str) -> Iterator[List[Any]]:
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield from pickle.load(f)
+            except EOFError:
+                return
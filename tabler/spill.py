@@ -0,0 +1,362 @@
+"""
+Row storage which keeps only some rows in memory.
+
+This module provides :class:`tabler.spill.SpilledRows`, which
+:class:`tabler.Table` uses when it is given **resident_rows** or
+**resident_bytes**. Rows are held in pages. Only the most recently used pages
+are kept in memory, the rest are pickled to a temporary page file which is
+deleted when the rows are.
+
+    Basic Usage::
+
+        >>> from tabler import Table
+        >>> table = Table('large.csv', resident_rows=100000)
+        >>> table[2000000]['Price']
+        '29.99'
+        >>> table.write('copy.csv')
+
+Rows are read from files as they are parsed, so loading a table never holds
+more than the resident rows in memory. Files without a value for every
+column in their header are padded, but rows longer than the header raise
+:class:`ValueError` as the table cannot be widened after rows are spilled.
+
+Changes made to a :class:`tabler.tablerow.TableRow` are saved with its page.
+A row kept after its page has been spilled is no longer part of the table, so
+changes made to it afterwards are lost. Get the row from the table again
+before changing it.
+
+Tables returned by slicing, :func:`tabler.Table.copy` and
+:func:`tabler.Table.filter` hold their rows in memory. Sorting loads every
+row while the rows are sorted.
+"""
+
+import pickle
+import sys
+import tempfile
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+from .tablerow import TableRow
+
+#: Default maximum number of rows in each page.
+PAGE_SIZE = 1000
+
+Header = Tuple[str, ...]
+
+
+def row_size(rows: Sequence[Sequence[Any]]) -> int:
+    """Return the average number of bytes used by each of **rows**."""
+    if not rows:
+        return 0
+    total = sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in rows
+    )
+    return total // len(rows)
+
+
+class _Page:
+    """Rows stored together, in memory or in the page file."""
+
+    __slots__ = ("rows", "length", "offset", "capacity", "size", "dirty")
+
+    def __init__(self, rows: List[TableRow]) -> None:
+        self.rows: Optional[List[TableRow]] = rows
+        self.length = len(rows)
+        #: Position, space and length of the page in the page file.
+        self.offset = -1
+        self.capacity = 0
+        self.size = 0
+        #: True if the page has changed since it was written, so unchanged
+        #: pages are not written again. Set when rows are added, removed or
+        #: replaced, and by rows read from the page file when they change.
+        self.dirty = True
+
+
+class SpilledRows(MutableSequence[TableRow]):
+    """Rows of a :class:`tabler.Table` of which only some are kept in memory.
+
+    At least one page is always kept in memory.
+
+    :param header: Column headers of the rows.
+    :type header: tuple(str)
+    :param dict headers: Mapping of column headers to indexes shared by the
+        rows.
+    :param resident_rows: Maximum number of rows kept in memory.
+    :type resident_rows: int or None.
+    :param resident_bytes: Approximate maximum number of bytes of rows kept in
+        memory. Row size is estimated from the first page.
+    :type resident_bytes: int or None.
+    :param int page_size: Maximum number of rows in each page. Default
+        :data:`tabler.spill.PAGE_SIZE`, or **resident_rows** if that is
+        smaller.
+    :param temp_dir: Directory for the page file. If None the system default
+        is used.
+    :type temp_dir: str or None.
+    :raises ValueError: If neither **resident_rows** nor **resident_bytes**
+        is given or either is less than one.
+    """
+
+    def __init__(
+        self,
+        header: Header,
+        headers: Dict[str, int],
+        resident_rows: Optional[int] = None,
+        resident_bytes: Optional[int] = None,
+        page_size: int = PAGE_SIZE,
+        temp_dir: Optional[str] = None,
+    ) -> None:
+        """Construct :class:`tabler.spill.SpilledRows`."""
+        if resident_rows is None and resident_bytes is None:
+            raise ValueError("resident_rows or resident_bytes must be given.")
+        for limit in (resident_rows, resident_bytes, page_size):
+            if limit is not None and limit < 1:
+                raise ValueError("Limits must be at least 1, not {}.".format(limit))
+        if resident_rows is not None:
+            page_size = min(page_size, resident_rows)
+        self.page_size = page_size
+        self.resident_rows = resident_rows
+        self.resident_bytes = resident_bytes
+        self.temp_dir = temp_dir
+        self._pages: List[_Page] = []
+        self._starts: Optional[List[int]] = []
+        self._length = 0
+        self._resident: "OrderedDict[int, None]" = OrderedDict()
+        self._max_pages: Optional[int] = None
+        self._file: Optional[Any] = None
+        self._headers: Dict[Header, Tuple[Header, Dict[str, int]]] = {
+            header: (header, headers)
+        }
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> TableRow: ...  # noqa: E704
+
+    @overload
+    def __getitem__(self, index: slice) -> List[TableRow]: ...  # noqa: E704
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TableRow, List[TableRow]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        page, offset = self._locate(index)
+        return self._load(page)[offset]
+
+    @overload
+    def __setitem__(self, index: int, row: TableRow) -> None: ...  # noqa: E704
+
+    @overload
+    def __setitem__(  # noqa: E704
+        self, index: slice, row: Iterable[TableRow]
+    ) -> None: ...
+
+    def __setitem__(self, index: Union[int, slice], row: Any) -> None:
+        if isinstance(index, slice):
+            raise TypeError("Spilled rows cannot be replaced by slice.")
+        page, offset = self._locate(index)
+        self._load(page)[offset] = row
+        self._pages[page].dirty = True
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if isinstance(index, slice):
+            for i in sorted(range(*index.indices(self._length)), reverse=True):
+                del self[i]
+            return
+        page, offset = self._locate(index)
+        del self._load(page)[offset]
+        self._pages[page].dirty = True
+        self._pages[page].length -= 1
+        self._length -= 1
+        if not self._pages[page].length:
+            del self._pages[page]
+            del self._resident[page]
+            self._renumber(page, -1)
+        self._starts = None
+
+    def __iter__(self) -> Iterator[TableRow]:
+        for page in range(len(self._pages)):
+            yield from self._load(page)
+
+    def insert(self, index: int, row: TableRow) -> None:
+        """Insert **row** before **index**."""
+        if index < 0:
+            index = max(index + self._length, 0)
+        if index >= self._length:
+            self.append(row)
+            return
+        page, offset = self._locate(index)
+        self._load(page).insert(offset, row)
+        self._pages[page].dirty = True
+        self._pages[page].length += 1
+        self._length += 1
+        self._starts = None
+        if self._pages[page].length > 2 * self.page_size:
+            self._split(page)
+
+    def append(self, row: TableRow) -> None:
+        """Add **row** after the last row."""
+        if self._pages and self._pages[-1].length < self.page_size:
+            page = len(self._pages) - 1
+            self._load(page).append(row)
+            self._pages[page].dirty = True
+            self._pages[page].length += 1
+        else:
+            self._pages.append(_Page([row]))
+            if self._starts is not None:
+                self._starts.append(self._length)
+            self._touch(len(self._pages) - 1)
+        self._length += 1
+
+    def extend(self, rows: Iterable[TableRow]) -> None:
+        """Add **rows** after the last row."""
+        append = self.append
+        for row in rows:
+            append(row)
+
+    def clear(self) -> None:
+        """Remove all rows and delete the page file."""
+        self.close()
+        self._pages = []
+        self._starts = []
+        self._length = 0
+        self._resident.clear()
+
+    def sort(self, key: Any = None, reverse: bool = False) -> None:
+        """Sort the rows in place.
+
+        All rows are loaded into memory while they are sorted.
+        """
+        rows = list(self)
+        rows.sort(key=key, reverse=reverse)
+        self.clear()
+        self.extend(rows)
+
+    def reverse(self) -> None:
+        """Reverse the order of the rows in place."""
+        rows = list(self)
+        rows.reverse()
+        self.clear()
+        self.extend(rows)
+
+    def close(self) -> None:
+        """Delete the page file. Rows which are not in memory are lost."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def resident(self) -> int:
+        """Number of rows currently held in memory."""
+        return sum(self._pages[page].length for page in self._resident)
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """Return the page holding the row at **index** and its offset."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Row index out of range.")
+        if self._starts is None:
+            starts, start = [], 0
+            for stored in self._pages:
+                starts.append(start)
+                start += stored.length
+            self._starts = starts
+        page = bisect_right(self._starts, index) - 1
+        return page, index - self._starts[page]
+
+    def _load(self, index: int) -> List[TableRow]:
+        """Return the rows of a page, reading them from the page file if needed."""
+        page = self._pages[index]
+        if page.rows is None:
+            assert self._file is not None
+            self._file.seek(page.offset)
+            rows = []
+            for values, header in pickle.loads(self._file.read(page.size)):
+                row = TableRow(values, *self._header(header))
+                row._page = page
+                rows.append(row)
+            page.rows = rows
+            page.dirty = False
+        self._touch(index)
+        return page.rows
+
+    def _touch(self, index: int) -> None:
+        """Mark a page as recently used and spill the least recently used."""
+        resident = self._resident
+        if index in resident:
+            resident.move_to_end(index)
+            return
+        resident[index] = None
+        if len(resident) > 1 and len(resident) > self._resident_pages():
+            self._spill(next(iter(resident)))
+
+    def _split(self, index: int) -> None:
+        """Split a resident page in two so pages stay near **page_size**."""
+        page = self._pages[index]
+        assert page.rows is not None
+        rows, half = page.rows, page.length // 2
+        page.rows, page.length = rows[:half], half
+        page.dirty = True
+        self._renumber(index, 1)
+        self._pages.insert(index + 1, _Page(rows[half:]))
+        self._touch(index + 1)
+
+    def _renumber(self, index: int, shift: int) -> None:
+        """Move resident pages after **index** by **shift** places."""
+        self._resident = OrderedDict(
+            (page + shift if page > index else page, None) for page in self._resident
+        )
+
+    def _resident_pages(self) -> int:
+        """Return the number of pages which can be kept in memory."""
+        if self._max_pages is None:
+            limit = self.resident_rows
+            if self.resident_bytes is not None:
+                size = max(row_size([row.row for row in self._pages[0].rows or []]), 1)
+                rows = self.resident_bytes // size
+                limit = rows if limit is None else min(limit, rows)
+            self._max_pages = max((limit or 0) // self.page_size, 1)
+        return self._max_pages
+
+    def _spill(self, index: int) -> None:
+        """Write a page to the page file and remove its rows from memory."""
+        page = self._pages[index]
+        del self._resident[index]
+        assert page.rows is not None
+        if page.dirty:
+            data = pickle.dumps(
+                [(row.row, row.header) for row in page.rows], pickle.HIGHEST_PROTOCOL
+            )
+            if self._file is None:
+                self._file = tempfile.TemporaryFile(dir=self.temp_dir)
+            if len(data) > page.capacity:
+                page.offset = self._file.seek(0, 2)
+                page.capacity = len(data)
+            else:
+                self._file.seek(page.offset)
+            self._file.write(data)
+            page.size = len(data)
+        for row in page.rows:
+            row._page = None
+        page.rows = None
+        page.dirty = False
+
+    def _header(self, header: Header) -> Tuple[Header, Dict[str, int]]:
+        """Return a header and its index mapping, shared by all pages."""
+        shared = self._headers.get(header)
+        if shared is None:
+            shared = self._headers[header] = (header, TableRow.index_header(header))
+        return shared
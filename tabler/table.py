@@ -9,12 +9,43 @@ tabulated data.
 import os
 import pathlib
 import sys
+import uuid
+from array import array
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Iterator, List, Optional, Sequence, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    overload,
+)
 
-from . import exceptions
-from .tablerow import TableRow
+from . import exceptions, instrument
+from .compression import split_extension
+from .dedup import unique
+from .diff import Diff, diff_tables
+from .exceptions import ConversionError
+from .parallel import map_rows, map_values
+from .progress import CancelToken, ProgressCallback, Tracker
+from .query import Condition
+from .schema import ColumnType, Schema
+from .spill import SpilledRows
+from .tablerow import SharedRows, TableRow
 from .tabletypes import BaseTableType
+from .tabletypes.arrow import batch_rows, require_pyarrow, to_arrow
+from .window import cumulative, rolling
 
 
 class Table:
@@ -50,18 +81,85 @@ class Table:
         data.
     :type data: list(list(str, int or float))
 
+    :param where: If not None only rows matching this condition will be
+        loaded from `filepath`. Other rows are dropped as the file is read.
+    :type where: :class:`tabler.query.Condition`
+
+    :param columns: If not None only these columns will be loaded from
+        `filepath`, in the order given. Other columns are discarded as the
+        file is read.
+    :type columns: list(str or int)
+
+    :param int nrows: If not None no more than this number of rows will be
+        loaded from `filepath`. Reading stops once they have been found.
+
+    :param skiprows: Number of rows to skip after the header of
+        `filepath`, or the (zero based) indexes of rows to skip.
+    :type skiprows: int or set(int)
+
+    :param sample: If not None load a random sample of rows from
+        `filepath` in a single pass. A float between 0 and 1 keeps each row
+        with that probability. An int loads that number of rows.
+    :type sample: int or float
+
+    :param int seed: Seed for the random number generator used by
+        `sample`.
+
+    :param schema: If not None cells are converted to the type given for
+        their column as they are loaded, for example
+        ``{'Qty': int, 'Date': 'iso-date'}``. Cells which cannot be
+        converted are left unchanged and the errors are stored in
+        :attr:`tabler.Table.errors`. See :class:`tabler.Schema`.
+    :type schema: dict or :class:`tabler.Schema`
+
+    :param intern: Columns of `filepath` in which equal strings are loaded
+        as a single shared string, or True for all columns. This saves memory
+        for columns with few distinct values.
+    :type intern: bool or list(str or int)
+
+    :param progress: If not None a function called with a
+        :class:`tabler.progress.Progress` as `filepath` is read.
+    :type progress: callable
+
+    :param cancel: If not None loading `filepath` stops with
+        :class:`tabler.exceptions.Cancelled` once this is cancelled.
+    :type cancel: :class:`tabler.progress.CancelToken`
+
+    :param int resident_rows: If not None no more than this number of rows
+        are kept in memory. Other rows are stored in a temporary file. See
+        :mod:`tabler.spill`.
+
+    :param int resident_bytes: If not None rows using about this many bytes
+        are kept in memory and other rows are stored in a temporary file.
+
     :raises ValueError: If filepath is None or both header and data are
         None.
     """
 
     _EMPTY_HEADER = "Unlabeled Column {}"
 
+    #: Errors converting cells with the **schema** given when the table was
+    #: loaded.
+    errors: Sequence[ConversionError] = ()
+
     def __init__(
         self,
         filepath: Optional[str] = None,
         table_type: Optional[BaseTableType] = None,
         header: Optional[Sequence[str]] = None,
         data: Optional[Sequence] = None,
+        where: Optional[Condition] = None,
+        columns: Optional[Sequence[Union[int, str]]] = None,
+        nrows: Optional[int] = None,
+        skiprows: Optional[Union[int, Collection[int]]] = None,
+        sample: Optional[Union[int, float]] = None,
+        seed: Optional[int] = None,
+        schema: Optional[Union[Mapping[Union[int, str], ColumnType], Schema]] = None,
+        intern: Optional[Union[bool, Sequence[Union[int, str]]]] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[CancelToken] = None,
+        resident_rows: Optional[int] = None,
+        resident_bytes: Optional[int] = None,
     ) -> None:
         """Construct a :class:`tabler.Table`.
 
@@ -69,7 +167,8 @@ class Table:
         :class:`tabler.tabletypes.BaseTableType` object can be provided to
         specify how the file will be opened. If this is not specified one will
         be selected based on the file extension in the `filename` using
-        default parameters.
+        default parameters. Compression extensions are skipped, so
+        ``table.csv.gz`` is opened as a compressed .csv file.
 
         Alternatively **header** and **data** can be specified to populate the
         table directly.
@@ -87,13 +186,70 @@ class Table:
             data.
         :type data: list(list(str, int or float))
 
+        :param where: If not None only rows matching this condition will be
+            loaded from `filepath`. Other rows are dropped as the file is read.
+        :type where: :class:`tabler.query.Condition`
+
+        :param columns: If not None only these columns will be loaded from
+            `filepath`, in the order given. Other columns are discarded as the
+            file is read.
+        :type columns: list(str or int)
+
+        :param int nrows: If not None no more than this number of rows will be
+            loaded from `filepath`. Reading stops once they have been found.
+
+        :param skiprows: Number of rows to skip after the header of
+            `filepath`, or the (zero based) indexes of rows to skip.
+        :type skiprows: int or set(int)
+
+        :param sample: If not None load a random sample of rows from
+            `filepath` in a single pass. A float between 0 and 1 keeps each row
+            with that probability. An int loads that number of rows.
+        :type sample: int or float
+
+        :param int seed: Seed for the random number generator used by
+            `sample`.
+
+        :param schema: If not None cells are converted to the type given for
+            their column as they are loaded, for example
+            ``{'Qty': int, 'Date': 'iso-date'}``. Cells which cannot be
+            converted are left unchanged and the errors are stored in
+            :attr:`tabler.Table.errors`. See :class:`tabler.Schema`.
+        :type schema: dict or :class:`tabler.Schema`
+
+        :param intern: Columns of `filepath` in which equal strings are
+            loaded as a single shared string, or True for all columns. This
+            saves memory for columns with few distinct values.
+        :type intern: bool or list(str or int)
+
+        :param progress: If not None a function called with a
+            :class:`tabler.progress.Progress` as `filepath` is read.
+        :type progress: callable
+
+        :param cancel: If not None loading `filepath` stops with
+            :class:`tabler.exceptions.Cancelled` once this is cancelled.
+        :type cancel: :class:`tabler.progress.CancelToken`
+
+        :param int resident_rows: If not None no more than this number of
+            rows are kept in memory. Other rows are stored in a temporary
+            file. See :mod:`tabler.spill`.
+
+        :param int resident_bytes: If not None rows using about this many
+            bytes are kept in memory and other rows are stored in a temporary
+            file.
+
         :raises TypeError: If filepath is None or both header and data are
             None.
         """
         self.table_type = table_type
+        if schema is not None:
+            schema = Schema(schema)
+        spill = None
+        if resident_rows is not None or resident_bytes is not None:
+            spill = {"resident_rows": resident_rows, "resident_bytes": resident_bytes}
         if filepath is not None:
             if self.table_type is None:
-                extension = os.path.splitext(filepath)[-1]
+                extension = split_extension(filepath)[0]
                 try:
                     self.table_type = BaseTableType.get_by_extension(extension)
                 except exceptions.ExtensionNotRecognised:
@@ -101,11 +257,38 @@ class Table:
                         "Table Type not specified and extension {} "
                         "not recognised.".format(extension)
                     ) from None
-            self.load(*self.table_type.open_path(filepath))
+            options = self._read_options(
+                where=where,
+                columns=columns,
+                nrows=nrows,
+                skiprows=skiprows,
+                sample=sample,
+                seed=seed,
+                schema=schema,
+                intern=intern,
+                progress=progress,
+                cancel=cancel,
+            )
+            if spill is not None:
+                options["consume"] = self._spill_loader(spill)
+            with instrument.reading(self.table_type, filepath) as measurement:
+                file_header, file_data = self.table_type.open_path(filepath, **options)
+                if measurement is not None:
+                    measurement.rows = len(file_data)
+            if spill is None:
+                with instrument.measure(
+                    "load", self.table_type, filepath
+                ) as measurement:
+                    self._load(file_header, file_data, owned=True)
+                    if measurement is not None:
+                        measurement.rows = len(file_data)
         elif header is not None and data is not None:
-            self.load(header, data)
+            self.empty()
+            self._load(header, data, spill=spill, schema=schema)
         else:
             raise exceptions.TableInitialisationError()
+        if schema is not None:
+            self.errors = schema.errors
 
     def __len__(self) -> int:
         return len(self.rows)
@@ -114,7 +297,22 @@ class Table:
         for row in self.rows:
             yield row
 
-    def __getitem__(self, index: int) -> TableRow:
+    @overload
+    def __getitem__(self, index: int) -> TableRow: ...  # noqa: E704
+
+    @overload
+    def __getitem__(self, index: slice) -> "Table": ...  # noqa: E704
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TableRow, "Table"]:
+        """Return a row, or a new Table for a slice.
+
+        A sliced Table shares row data with this one instead of copying it.
+        Each row's cells are copied the first time it is changed through
+        either Table, including through rows retrieved before the Table was
+        sliced, so changes made through one are not seen by the other.
+        """
+        if isinstance(index, slice):
+            return self._view(self._storage()[index])
         return self.rows[index]
 
     def __str__(self) -> str:
@@ -129,6 +327,31 @@ class Table:
     def __repr__(self) -> str:
         return self.__str__()
 
+    def __reduce__(self) -> Any:
+        """Return the table's data for pickling.
+
+        The header and table type are stored once, followed by a list of
+        cells for each row, rather than pickling each
+        :class:`tabler.tablerow.TableRow` with its own header. Rows stored in
+        a temporary file, see :mod:`tabler.spill`, are loaded into memory
+        when the table is unpickled. To send a large table to other processes
+        without copying it see :mod:`tabler.shm`.
+        """
+        state = {"errors": self.errors} if "errors" in self.__dict__ else None
+        rows = [tuple(row.row) for row in self._storage()]
+        return (_unpickle, (self.__class__, self.table_type, self.header, rows), state)
+
+    def __copy__(self) -> "Table":
+        """Return a copy sharing row data, as :func:`tabler.Table.copy` does.
+
+        Without this :func:`copy.copy` would use :func:`__reduce__` and copy
+        every row.
+        """
+        duplicate = self.copy()
+        if "errors" in self.__dict__:
+            duplicate.errors = list(self.errors)
+        return duplicate
+
     def load(self, header: Sequence, data: Sequence[Union[Sequence, TableRow]]) -> None:
         """
         Populate table with header and data.
@@ -140,36 +363,157 @@ class Table:
         :type data: list(list(str, int or float))
         """
         self.empty()
-        self.row_length: int = max([len(header)] + [len(_) for _ in data])
+        self._load(header, data)
+
+    def _load(
+        self,
+        header: Sequence,
+        data: Iterable[Union[Sequence, TableRow]],
+        owned: bool = False,
+        spill: Optional[Dict[str, Any]] = None,
+        schema: Optional[Schema] = None,
+    ) -> None:
+        """Pad, normalise, convert and wrap rows in a single pass.
+
+        If **owned** is True the rows in **data** were created for this table
+        by :func:`tabler.tabletypes.BaseTableType.parse_row_data`, so null
+        values are already normalised. Such rows are padded in place and used
+        as row storage without being copied.
+
+        If **spill** is not None rows are stored in a
+        :class:`tabler.spill.SpilledRows` created with it as keyword
+        arguments. **data** may then be an iterator, in which case rows
+        longer than **header** raise :class:`ValueError`.
+
+        If **schema** is not None rows are converted with it before they are
+        stored, so spilled pages hold the converted values.
+        """
+        if isinstance(data, Sequence):
+            self.row_length: int = max(len(header), max(map(len, data), default=0))
+        else:
+            self.row_length = len(header)
         self.header: tuple = self._prepare_header(header)
-        self.rows: List[TableRow] = [
-            TableRow(row, self.header) for row in self._prepare_data(data)
-        ]
+        self._headers: Dict[str, int] = TableRow.index_header(self.header)
+        headers = self._headers
+        empty_value = self._empty_value()
+        row_length = self.row_length
+        rows: MutableSequence[TableRow] = []
+        if spill is not None:
+            rows = SpilledRows(self.header, headers, **spill)
+        append = rows.append
+        convert = None if schema is None else schema.row_converter(self.header)
+        for row in data:
+            if owned and type(row) is list:
+                values = row
+            else:
+                values = [
+                    empty_value if value is None or value == "" else value
+                    for value in row
+                ]
+            missing = row_length - len(values)
+            if missing > 0:
+                values.extend([empty_value] * missing)
+            elif missing:
+                raise ValueError(
+                    "Row has {} cells but the header has {} columns.".format(
+                        len(values), row_length
+                    )
+                )
+            if convert is not None:
+                convert(values)
+            append(TableRow(values, self.header, headers))
+        self.rows: Sequence[TableRow] = rows
 
     def write(
-        self, filepath: Union[str, Path], table_type: Optional[BaseTableType] = None
+        self,
+        filepath: Union[str, Path],
+        table_type: Optional[BaseTableType] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[CancelToken] = None,
     ) -> None:
         """Create file from table.
 
+        If **filepath** ends with a compression extension, such as
+        ``table.csv.gz``, the file is compressed. See
+        :mod:`tabler.compression`.
+
         :param table_type: Table Type to use to save the file.
         :type table_type: :class:`tabler.BaseTableType`
 
         :param str filepath: Path at which the file will be saved.
+
+        :param progress: If not None a function called with a
+            :class:`tabler.progress.Progress` as rows are written.
+        :type progress: callable
+
+        :param cancel: If not None writing stops once this is cancelled.
+            The table is written to a temporary file which replaces
+            **filepath** once it is complete, so a cancelled write leaves any
+            existing file unchanged. Table types which update files in place,
+            such as :class:`tabler.SQLite`, roll back their changes instead.
+        :type cancel: :class:`tabler.progress.CancelToken`
+
+        :raises tabler.exceptions.Cancelled: If **cancel** is cancelled.
+        :raises ValueError: If **filepath** has a compression extension and
+            **table_type** cannot write compressed files.
         """
         path = pathlib.Path(filepath)
+        extension, compression_extension = split_extension(path)
         if table_type is None:
             if self.table_type is not None:
                 table_type = self.table_type
             else:
-                table_type = BaseTableType.get_by_extension(path.suffix)
-        if path.suffix != table_type.extension:
-            path = path.with_suffix(table_type.extension)
-        table_type.write(self, path)
+                table_type = BaseTableType.get_by_extension(extension)
+        if extension != table_type.extension:
+            name = path.name[: len(path.name) - len(compression_extension)]
+            path = path.with_name(name).with_suffix(table_type.extension)
+            path = path.with_name(path.name + compression_extension)
+        table_type.check_compression(path)
+        if progress is None and cancel is None:
+            self._write(table_type, path)
+            return
+        tracker = Tracker("write", progress, cancel, total_rows=len(self))
+        if table_type.updates_in_place:
+            existed = path.exists()
+            try:
+                with tracker.tracking():
+                    self._write(table_type, path)
+            except exceptions.Cancelled:
+                if not existed and path.exists():
+                    path.unlink()
+                raise
+            return
+        temp_path = path.with_name(".{}.{}".format(uuid.uuid4().hex[:8], path.name))
+        try:
+            with tracker.tracking():
+                self._write(table_type, path, temp_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+    def _write(
+        self, table_type: BaseTableType, path: Path, temp_path: Optional[Path] = None
+    ) -> None:
+        """Write the table with **table_type**, sending instrument events.
+
+        If **temp_path** is not None the table is written to it and then moved
+        to **path**, so **path** is only changed if the write succeeds.
+        """
+        with instrument.measure("write", table_type, path) as measurement:
+            if temp_path is None:
+                table_type.write(self, path)
+            else:
+                table_type.write(self, temp_path)
+                os.replace(temp_path, path)
+            if measurement is not None:
+                measurement.rows = len(self)
+                measurement.bytes = instrument.file_size(path)
 
     def empty(self) -> None:
         """Clear all data."""
         self.rows = []
         self.header = ()
+        self._headers = {}
 
     def is_empty(self) -> bool:
         """Return True if the table conatins no data, otherwise return False.
@@ -186,7 +530,46 @@ class Table:
         :param row: Data for new row.
         :type row: list or :class:`tabler.tablerow.TableRow`.
         """
-        self.rows.append(TableRow(list(row), self.header))
+        self._own_rows().append(TableRow(list(row), self.header, self._headers))
+
+    def extend(self, rows: Iterable[Union[Sequence, TableRow]]) -> None:
+        """Add new rows to the table.
+
+        Rows are padded and empty values are normalised as they are when the
+        table is loaded. No rows are added if any row is too long.
+
+        :param rows: Data for the new rows.
+        :type rows: list(list), list(:class:`tabler.tablerow.TableRow`) or
+            :class:`tabler.Table`.
+        :raises ValueError: If a row has more cells than the table has
+            columns.
+        """
+        if isinstance(rows, Table):
+            rows = rows._storage()
+        header, headers = self.header, self._headers
+        empty_value = self._empty_value()
+        row_length = self.row_length
+        new_rows = []
+        for row in rows:
+            cells = row.row if isinstance(row, TableRow) else row
+            if None in cells or "" in cells:
+                values = [
+                    empty_value if value is None or value == "" else value
+                    for value in cells
+                ]
+            else:
+                values = list(cells)
+            missing = row_length - len(values)
+            if missing > 0:
+                values.extend([empty_value] * missing)
+            elif missing < 0:
+                raise ValueError(
+                    "Row has {} cells but the table has {} columns.".format(
+                        len(values), row_length
+                    )
+                )
+            new_rows.append(TableRow(values, header, headers))
+        self._own_rows().extend(new_rows)
 
     def get_column(self, column: Union[int, str]) -> List:
         """Return all values in a column.
@@ -195,31 +578,292 @@ class Table:
         :type column: str or int.
         :rtype: list
         """
-        return [row[column] for row in self.rows]
+        return [row[column] for row in self._storage()]
 
-    def remove_column(self, column: str) -> None:
+    def rolling(
+        self,
+        column: Union[int, str],
+        window: int,
+        agg: str = "mean",
+        min_periods: Optional[int] = None,
+    ) -> List:
+        """Return an aggregate of each cell in a column and the cells before it.
+
+        The result for each row is calculated from the cells of the last
+        **window** rows, up to and including that row, in a single pass over
+        the column. See :mod:`tabler.window`.
+
+            Example::
+
+                >>> table.add_column('Average', table.rolling('Sales', 30))
+
+        :param column: Name or index of the column.
+        :type column: str or int.
+        :param int window: Number of rows in each window.
+        :param str agg: ``'sum'``, ``'mean'``, ``'min'``, ``'max'`` or
+            ``'count'``. Cells must be numbers for ``'sum'`` and ``'mean'``,
+            use a **schema** to convert them when the table is loaded.
+        :param min_periods: Least number of cells which are not empty needed
+            in a window for it to have a result, otherwise the result is
+            None. If None use **window**.
+        :type min_periods: int or None.
+        :rtype: list
+        :raises ValueError: If the column is not in the header or an option
+            is not valid.
+        """
+        index = self._column_index(column)
+        values = [row.row[index] for row in self._storage()]
+        return rolling(values, window, agg, min_periods)
+
+    def cumulative(self, column: Union[int, str], agg: str = "sum") -> List:
+        """Return an aggregate of each cell in a column and every cell before it.
+
+        Empty cells are skipped and their result is None. See
+        :mod:`tabler.window`.
+
+        :param column: Name or index of the column.
+        :type column: str or int.
+        :param str agg: ``'sum'``, ``'min'`` or ``'max'``.
+        :rtype: list
+        :raises ValueError: If the column is not in the header or **agg** is
+            not valid.
+        """
+        index = self._column_index(column)
+        return cumulative([row.row[index] for row in self._storage()], agg)
+
+    def dictionary_encode(self, column: Union[int, str]) -> Tuple[array, List]:
+        """Return a column as integer codes and a list of its distinct values.
+
+        The code of each cell is the index of its value in the list of
+        values, which are in the order they first appear. Codes are stored in
+        the smallest :class:`array.array` type that can hold them, so they
+        can be compared, counted and hashed much faster than the values.
+
+            Example::
+
+                >>> codes, values = table.dictionary_encode('Country')
+                >>> uk = values.index('UK')
+                >>> rows = [table[i] for i, code in enumerate(codes) if code == uk]
+
+        :param column: Name or index of the column to encode.
+        :type column: str or int.
+        :rtype: tuple(array.array, list)
+        :raises ValueError: If the column is not in the header.
+        """
+        index = self._column_index(column)
+        codes_by_value: Dict[Any, int] = {}
+        add = codes_by_value.setdefault
+        codes = [add(row.row[index], len(codes_by_value)) for row in self._storage()]
+        for typecode in "BHIQ":
+            if len(codes_by_value) <= 2 ** (8 * array(typecode).itemsize):
+                break
+        return array(typecode, codes), list(codes_by_value)
+
+    def remove_column(self, column: Union[int, str]) -> None:
         """
         Remove a specified column from the Table.
 
         :param column: Name or index of to be removed.
         :type column: str or int.
         """
+        self.drop([column])
+
+    def select(self, columns: Sequence[Union[int, str]]) -> None:
+        """Keep only the specified columns, in the order given.
+
+        :param columns: Names or indexes of the columns to keep.
+        :type columns: list(str or int)
+
+        :raises ValueError: If a column name is not in the header.
+        :raises IndexError: If a column index is out of range.
+        """
+        self._project([self._column_index(column) for column in columns])
+
+    def drop(self, columns: Sequence[Union[int, str]]) -> None:
+        """Remove the specified columns.
+
+        :param columns: Names or indexes of the columns to remove.
+        :type columns: list(str or int)
+
+        :raises ValueError: If a column name is not in the header.
+        :raises IndexError: If a column index is out of range.
+        """
+        dropped = {self._column_index(column) for column in columns}
+        self._project([i for i in range(len(self.header)) if i not in dropped])
+
+    def add_column(
+        self,
+        name: str,
+        values: Union[Sequence, Callable[[TableRow], Any]],
+        index: Optional[int] = None,
+    ) -> None:
+        """Add a new column to the Table.
+
+        :param str name: Header for the new column.
+        :param values: Either a value for each row or a function which will
+            be called with each :class:`tabler.tablerow.TableRow` to return
+            its value.
+        :type values: list or callable.
+        :param index: Position of the new column. If None the column will be
+            added after the last column. (Default: None)
+        :type index: int or None.
+        :raises ValueError: If **values** does not have one value per row.
+        """
+        rows = self._own_rows()
+        if callable(values):
+            values = [values(row) for row in rows]
+        elif len(values) != len(rows):
+            raise ValueError(
+                "Expected {} values, got {}.".format(len(rows), len(values))
+            )
+        if index is None:
+            index = len(self.header)
         header = list(self.header)
-        header.pop(header.index(column))
+        header.insert(index, name)
+        self._set_header(header)
+        for row_index, row in enumerate(rows):
+            cells = row.row[:]
+            cells.insert(index, values[row_index])
+            row._restructure(cells, self.header, self._headers)
+
+    def apply_column(
+        self,
+        column: Union[int, str],
+        func: Callable[[Any], Any],
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        processes: bool = False,
+        name: Optional[str] = None,
+    ) -> None:
+        """Replace the values in a column with the result of **func** for each.
+
+        **func** is called with each cell of the column in a pool of threads,
+        or processes if **processes** is True. See :mod:`tabler.parallel`.
+
+        :param column: Name or index of the column.
+        :type column: str or int.
+        :param func: Function called with a cell to return its new value. It
+            must be picklable if **processes** is True.
+        :type func: callable.
+        :param workers: Number of threads or processes. If None use the
+            number of CPUs. If 1 **func** is called in this thread.
+        :type workers: int or None.
+        :param chunksize: Number of cells sent to a worker at a time. If None
+            cells are split into four chunks for each worker.
+        :type chunksize: int or None.
+        :param bool processes: If True use processes rather than threads.
+        :param name: If not None the results are added as a new column with
+            this header after the last column, and **column** is unchanged.
+        :type name: str or None.
+        :raises ValueError: If the column is not in the header.
+        :raises IndexError: If a column index is out of range.
+        """
+        index = self._column_index(column)
+        values = [row.row[index] for row in self._storage()]
+        results = map_values(func, values, workers, chunksize, processes)
+        if name is not None:
+            self.add_column(name, results)
+            return
+        for row, value in zip(self._own_rows(), results):  # noqa: B905
+            row[index] = value
+
+    def _project(self, indexes: List[int]) -> None:
+        """Rearrange columns so that they match the columns at **indexes**."""
+        self._set_header([self.header[i] for i in indexes])
+        header, headers = self.header, self._headers
+        if len(indexes) > 1:
+            getter = itemgetter(*indexes)
+            for row in self._own_rows():
+                row._restructure(list(getter(row.row)), header, headers)
+        else:
+            for row in self._own_rows():
+                row._restructure([row.row[i] for i in indexes], header, headers)
+
+    def _set_header(self, header: Sequence[str]) -> None:
         self.header = tuple(header)
-        for row in self.rows:
-            row.remove_column(column)
+        self._headers = TableRow.index_header(self.header)
+        self.row_length = len(self.header)
+
+    def _column_index(self, column: Union[int, str]) -> int:
+        """Return the index of a column from its name or index."""
+        if isinstance(column, int):
+            if not -len(self.header) <= column < len(self.header):
+                raise IndexError("Column index {} out of range.".format(column))
+            return column % len(self.header)
+        try:
+            return self._headers[column]
+        except KeyError:
+            raise ValueError("Column {!r} not in header.".format(column)) from None
 
     def print_r(self) -> None:
         """Print table data in a readable format."""
-        for row in self.rows:
+        for row in self._storage():
             print(list(row), file=sys.stderr)
 
     def copy(self) -> "Table":
-        """Return duplicate Table object."""
-        return self.__class__(
-            header=self.header, data=[row.copy() for row in self.rows]
+        """Return duplicate Table object.
+
+        The duplicate shares row data with this table until either is
+        changed, see :func:`tabler.Table.__getitem__`.
+        """
+        return self._view(self._storage())
+
+    def filter(self, predicate: Callable[[TableRow], bool]) -> "Table":
+        """Return a new Table containing the rows matching **predicate**.
+
+        The new Table shares row data with this one, see
+        :func:`tabler.Table.__getitem__`.
+
+        :param predicate: A condition created with :func:`tabler.where` or a
+            function returning True for each row to be kept. Functions must
+            not change the rows passed to them.
+        :type predicate: :class:`tabler.query.Condition` or callable.
+        :rtype: :class:`tabler.Table`.
+        """
+        rows = self._storage()
+        if isinstance(predicate, Condition):
+            matches = predicate.compile(self.header)
+            return self._view([row for row in rows if matches(row.row)])
+        return self._view([row for row in rows if predicate(row)])
+
+    def map(
+        self,
+        func: Callable[[TableRow], Sequence],
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        processes: bool = False,
+        header: Optional[Sequence[str]] = None,
+    ) -> "Table":
+        """Return a new Table with the result of **func** for each row.
+
+        **func** is called with each :class:`tabler.tablerow.TableRow` in a
+        pool of threads, or processes if **processes** is True, and returns
+        the cells of the new row. Rows of the new Table are in the same order
+        as the rows they were made from. See :mod:`tabler.parallel`.
+
+        :param func: Function called with a row to return a list of cells.
+            It must not change the rows passed to it, and must be picklable
+            if **processes** is True.
+        :type func: callable.
+        :param workers: Number of threads or processes. If None use the
+            number of CPUs. If 1 **func** is called in this thread.
+        :type workers: int or None.
+        :param chunksize: Number of rows sent to a worker at a time. If None
+            rows are split into four chunks for each worker.
+        :type chunksize: int or None.
+        :param bool processes: If True use processes rather than threads.
+        :param header: Header of the new Table. If None use this table's
+            header.
+        :type header: list(str) or None.
+        :rtype: :class:`tabler.Table`.
+        """
+        rows = map_rows(
+            func, self._storage(), self.header, workers, chunksize, processes
         )
+        table = self.__class__.__new__(self.__class__)
+        table.table_type = self.table_type
+        table._load(self.header if header is None else header, rows)
+        return table
 
     def sort(self, sort_key: str, asc: bool = True) -> None:
         """Sort table by column.
@@ -235,10 +879,10 @@ class Table:
         else:
             column = sort_key
         try:
-            self.rows.sort(key=lambda x: float(list(x)[column]), reverse=not asc)
+            self._own_rows().sort(key=lambda x: float(list(x)[column]), reverse=not asc)
         except ValueError:
             # https://github.com/python/mypy/issues/9656
-            self.rows.sort(key=lambda x: list(x)[column], reverse=not asc)  # type: ignore
+            self._own_rows().sort(key=lambda x: list(x)[column], reverse=not asc)  # type: ignore
 
     def sorted(self, sort_key: str, asc: bool = True) -> "Table":
         """Return a sorted duplicate of the Table.
@@ -255,20 +899,173 @@ class Table:
         temp_table.sort(sort_key, asc)
         return temp_table
 
+    def drop_duplicates(
+        self, subset: Optional[Sequence[Union[int, str]]] = None, keep: str = "first"
+    ) -> "Table":
+        """Return a new Table without duplicate rows.
+
+        Rows are compared by hashing their cells in a single pass, so the
+        table does not need to be sorted. The rows kept stay in their
+        original order. The new Table shares row data with this one, see
+        :func:`tabler.Table.__getitem__`.
+
+        :param subset: Column headers or indexes compared. If None all
+            columns are compared.
+        :type subset: list(str or int) or None.
+        :param str keep: "first" to keep the first of each duplicate row or
+            "last" to keep the last. Default "first".
+        :rtype: :class:`tabler.Table`.
+        :raises ValueError: If **keep** is not valid, **subset** is empty or
+            a column is not in the header.
+        """
+        if keep not in ("first", "last"):
+            raise ValueError('keep must be "first" or "last", not {!r}.'.format(keep))
+        if subset is None:
+            cells: Callable[[List[Any]], Hashable] = tuple
+        elif not subset:
+            raise ValueError("subset must contain at least one column.")
+        else:
+            cells = itemgetter(*[self._column_index(column) for column in subset])
+        rows = self._storage()
+        if keep == "first":
+            kept = list(unique(rows, key=lambda row: cells(row.row)))
+        else:
+            kept = list(unique(reversed(rows), key=lambda row: cells(row.row)))
+            kept.reverse()
+        return self._view(kept)
+
+    def distinct(self, column: Union[int, str]) -> List:
+        """Return the distinct values in a column in the order they appear.
+
+        :param column: Name or index of the column.
+        :type column: str or int.
+        :rtype: list
+        :raises ValueError: If the column is not in the header.
+        """
+        index = self._column_index(column)
+        return list(dict.fromkeys(row.row[index] for row in self._storage()))
+
+    def diff(
+        self,
+        other: "Table",
+        key: Union[int, str, Sequence[Union[int, str]]],
+        columns: Optional[Sequence[str]] = None,
+    ) -> Diff:
+        """Return the rows added, removed and changed in **other**.
+
+        Rows are matched by the values of their **key** columns. Each side is
+        read once and rows of this table are compared with rows of **other**
+        by fingerprint, see :mod:`tabler.diff`. Columns are matched by
+        header. Indexes in **key** are columns of this table.
+
+        :param other: Table compared with this one.
+        :type other: :class:`tabler.Table`
+        :param key: Header or index of the column which identifies rows, or
+            a list of them.
+        :type key: str, int or list(str or int).
+        :param columns: Headers of the columns to compare. If None all
+            columns in both tables, other than the key, are compared.
+        :type columns: list(str) or None.
+        :rtype: :class:`tabler.diff.Diff`
+        :raises ValueError: If a key is repeated in either table or a column
+            is not in both headers.
+        """
+        return diff_tables(self, other, key, columns)
+
     def split_by_row_count(self, row_count: int) -> List["Table"]:
         """Split table by row count.
 
         Create multiple :class:`tabler.Table` instances each with a subset of
-        this one's data.
+        this one's data. The new tables share row data with this one until
+        they are changed, so splitting does not copy any rows.
 
         :param int row_count: Number of rows in each Table.
         :rtype: list(:class:`tabler.Table`).
         """
-        split_tables = []
-        for i in range(0, len(self.rows), row_count):
-            new_table = Table(header=self.header, data=self.rows[i : i + row_count])
-            split_tables.append(new_table)
-        return split_tables
+        rows = self._storage()
+        return [
+            self._view(rows[i : i + row_count]) for i in range(0, len(rows), row_count)
+        ]
+
+    def to_arrow(self) -> Any:
+        """Return the table's data as a :class:`pyarrow.Table`.
+
+        Data is converted one column at a time. Columns containing values of
+        more than one type, other than None, are converted to strings.
+
+        :rtype: :class:`pyarrow.Table`
+        :raises ImportError: If pyarrow is not installed.
+        """
+        return to_arrow(self)
+
+    @classmethod
+    def from_arrow(cls, data: Any) -> "Table":
+        """Return a new Table containing the data in a :class:`pyarrow.Table`.
+
+        Each column is converted to Python values in a single call.
+
+        :param data: Arrow data to convert.
+        :type data: :class:`pyarrow.Table` or :class:`pyarrow.RecordBatch`
+        :rtype: :class:`tabler.Table`
+        :raises ImportError: If pyarrow is not installed.
+        """
+        require_pyarrow()
+        table = cls.__new__(cls)
+        table.table_type = None
+        table._load(data.schema.names, list(batch_rows(data)))
+        return table
+
+    @staticmethod
+    def _read_options(**options: Any) -> Dict[str, Any]:
+        """Return the options for opening a file which have been set."""
+        return {key: value for key, value in options.items() if value is not None}
+
+    def _spill_loader(
+        self, spill: Dict[str, Any]
+    ) -> Callable[[List[str], Iterator[List[Any]]], Sequence[TableRow]]:
+        """Return a function loading parsed rows into spilled storage."""
+
+        def load(header: List[str], rows: Iterator[List[Any]]) -> Sequence[TableRow]:
+            self._load(header, rows, owned=True, spill=spill)
+            return self.rows
+
+        return load
+
+    def _view(
+        self, rows: Iterable[TableRow], header: Optional[Tuple[str, ...]] = None
+    ) -> "Table":
+        """Return a Table sharing the cells of **rows** with this one.
+
+        This table's rows are left in place. See
+        :class:`tabler.tablerow.SharedRows`.
+
+        :param list rows: Rows taken from this table.
+        :param header: Header of the new Table, if it is not this table's
+            header. Each row must have a cell for each column.
+        :type header: tuple or None.
+        """
+        table = self.__class__.__new__(self.__class__)
+        table.table_type = self.table_type
+        if header is None:
+            table.row_length = self.row_length
+            table.header = self.header
+            table._headers = self._headers
+        else:
+            table.row_length = len(header)
+            table.header = header
+            table._headers = TableRow.index_header(header)
+        table.rows = SharedRows(rows, table.header, table._headers)
+        return table
+
+    def _storage(self) -> Sequence[TableRow]:
+        """Return this table's rows for reading without copying them."""
+        return self.rows
+
+    def _own_rows(self) -> Union[List[TableRow], SpilledRows]:
+        """Return this table's rows as a sequence that can be changed in place."""
+        if isinstance(self.rows, SharedRows):
+            self.rows = self.rows.materialise()
+        return self.rows  # type: ignore[return-value]
 
     def _prepare_header(self, header_row: Sequence[str]) -> Tuple[str, ...]:
         unlabled = 0
@@ -284,22 +1081,20 @@ class Table:
             header.append(self._EMPTY_HEADER.format(unlabled))
         return tuple(header)
 
-    def _prepare_data(
-        self, data: Sequence, empty_value: Optional[Any] = None
-    ) -> List[List[Any]]:
-        return [self._prepare_row(row, empty_value=empty_value) for row in data]
-
-    def _prepare_row(
-        self, row: Sequence, empty_value: Optional[Any] = None
-    ) -> List[Union[str, int, float, None]]:
-        if empty_value is None and self.table_type is not None:
-            empty_value = self.table_type.empty_value
-        prepared_row = []
-        for value in row:
-            if value is None or value == "":
-                prepared_row.append(empty_value)
-            else:
-                prepared_row.append(value)
-        while len(prepared_row) < self.row_length:
-            prepared_row.append(empty_value)
-        return prepared_row
+    def _empty_value(self) -> Any:
+        if self.table_type is not None:
+            return self.table_type.empty_value
+        return None
+
+
+def _unpickle(
+    cls: Type[Table],
+    table_type: Optional[BaseTableType],
+    header: Tuple[str, ...],
+    rows: List[Tuple[Any, ...]],
+) -> Table:
+    """Return a Table from the data returned by :func:`Table.__reduce__`."""
+    table = cls.__new__(cls)
+    table.table_type = table_type
+    table._load(header, [list(row) for row in rows], owned=True)
+    return table
@@ -1,27 +1,72 @@
-"""Provides the TableRow class.
+"""Provides the TableRow and SharedRows classes.
 
 TableRow provides methods for working with rows in :class:`tabler.Table`
-instances.
+instances. SharedRows provides copy-on-write access to rows shared between
+tables.
 """
 
-from typing import Any, Iterable, Iterator, List, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
 
 
 class TableRow:
-    """Provide methods for rows in :class:`tabler.Table` instances."""
+    """Provide methods for rows in :class:`tabler.Table` instances.
 
-    def __init__(self, row: List[List[Any]], header: Iterable[str]):
+    Rows use ``__slots__`` rather than an instance ``__dict__`` to reduce the
+    memory used by large tables.
+
+    Rows read from a :class:`tabler.spill.SpilledRows` page file hold the
+    page in **_page** and mark it dirty when they are changed, so that the
+    change is saved. Cells must only be changed through the row's methods.
+    """
+
+    __slots__ = ("row", "header", "headers", "_shared", "_page")
+
+    def __init__(
+        self,
+        row: List[Any],
+        header: Iterable[str],
+        headers: Optional[Dict[str, int]] = None,
+    ):
         """Instansiate :class:`TableRow`.
 
         :param list row: Data stored in this row.
         :param list header: Column headers from table.
+        :param dict headers: Mapping of column headers to column indexes. If
+            None it will be created from **header**. Rows belonging to the
+            same table can share a single mapping.
         """
         self.row = row
         self.header = tuple(header)
-        self.headers = {}
+        if headers is None:
+            headers = self.index_header(self.header)
+        self.headers = headers
+        self._shared = False
+        self._page: Any = None
+
+    @staticmethod
+    def index_header(header: Sequence[str]) -> Dict[str, int]:
+        """Return a mapping of column headers to column indexes.
+
+        Where a header appears more than once the first index is used.
 
-        for column in self.header:
-            self.headers[column] = self.header.index(column)
+        :param header: Column headers.
+        :rtype: dict
+        """
+        headers: Dict[str, int] = {}
+        for index, column in enumerate(header):
+            headers.setdefault(column, index)
+        return headers
 
     def __iter__(self) -> Iterator:
         for item in self.row:
@@ -36,6 +81,10 @@ class TableRow:
             raise ValueError(f"Index must be int or str, not {type(index)}.")
 
     def __setitem__(self, index: Union[str, int], item: Any) -> None:
+        if self._shared:
+            self._unshare()
+        if self._page is not None:
+            self._page.dirty = True
         if isinstance(index, int):
             self.row[index] = item
         elif isinstance(index, str):
@@ -56,14 +105,111 @@ class TableRow:
         :raises: ValueError: If column is not a valid column header.
         """
         column_index = self.header.index(column)
+        if self._shared:
+            self._unshare()
+        if self._page is not None:
+            self._page.dirty = True
         self.row.pop(column_index)
         header = list(self.header)
         header.pop(header.index(column))
         self.header = tuple(header)
+        self.headers = self.index_header(self.header)
 
     def copy(self) -> "TableRow":
         """Return duplicate tabler.tablerow.TableRow object.
 
+        The duplicate shares this row's data until either row is changed, at
+        which point the changed row takes its own copy of the data.
+
         :rtype: :class:`tabler.tablerow.TableRow`.
         """
-        return TableRow(self.row, self.header)
+        duplicate = TableRow(self.row, self.header, self.headers)
+        duplicate._shared = self._shared = True
+        return duplicate
+
+    def _restructure(
+        self, row: List[Any], header: Tuple[str, ...], headers: Dict[str, int]
+    ) -> None:
+        """Replace this row's data and header with new, unshared, values."""
+        self.row = row
+        self.header = header
+        self.headers = headers
+        self._shared = False
+        if self._page is not None:
+            self._page.dirty = True
+
+    def _unshare(self) -> None:
+        self.row = list(self.row)
+        self._shared = False
+
+
+class SharedRows(Sequence[TableRow]):
+    """Read only sequence of rows shared with another :class:`tabler.Table`.
+
+    Creating a :class:`SharedRows` does not copy any cells. The rows given
+    are marked as shared, so the table they belong to copies a row's cells
+    before changing them. Each row of this sequence is created the first
+    time it is accessed, as a copy-on-write :class:`TableRow` of the cells
+    the shared row had when this sequence was created. Changes made through
+    either table are not seen by the other.
+
+    :param list rows: The rows to be shared.
+    :param header: Header of the new rows. If None use the header of the
+        first row.
+    :type header: tuple or None.
+    :param headers: Mapping of column headers to indexes for the new rows.
+        If None it is created from **header**.
+    :type headers: dict or None.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[TableRow],
+        header: Optional[Tuple[str, ...]] = None,
+        headers: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """Construct :class:`tabler.tablerow.SharedRows`."""
+        cells = []
+        for row in rows:
+            row._shared = True
+            cells.append(row.row)
+            if header is None:
+                header = row.header
+        self._cells = cells
+        self._header: Tuple[str, ...] = () if header is None else tuple(header)
+        if headers is None:
+            headers = TableRow.index_header(self._header)
+        self._headers = headers
+        self._rows: List[Optional[TableRow]] = [None] * len(cells)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    @overload
+    def __getitem__(self, index: int) -> TableRow: ...  # noqa: E704
+
+    @overload
+    def __getitem__(self, index: slice) -> List[TableRow]: ...  # noqa: E704
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TableRow, List[TableRow]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._cells)))]
+        length = len(self._cells)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("Row index out of range.")
+        row = self._rows[index]
+        if row is None:
+            row = TableRow(self._cells[index], self._header, self._headers)
+            row._shared = True
+            self._rows[index] = row
+        return row
+
+    def __iter__(self) -> Iterator[TableRow]:
+        for index in range(len(self._cells)):
+            yield self[index]
+
+    def materialise(self) -> List[TableRow]:
+        """Return every row as a list owned by the caller."""
+        return [self[index] for index in range(len(self._cells))]
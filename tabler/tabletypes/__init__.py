@@ -15,6 +15,14 @@ common file types.
 - :class:`tabler.tabletypes.ODS`: Open and save Open Document
     Spreadsheed (.ods) files.
 - :class:`tabler.tabletypes.XLSX`: Open and save Microsoft Excel (.xlsx) files.
+- :class:`tabler.tabletypes.Snapshot`: Open and save binary columnar snapshot
+    (.tabler) files.
+- :class:`tabler.tabletypes.Parquet`: Open and save Apache Parquet (.parquet)
+    files. Requires pyarrow.
+- :class:`tabler.tabletypes.Arrow`: Open and save Apache Arrow IPC (.arrow)
+    files. Requires pyarrow.
+- :class:`tabler.tabletypes.SQLite`: Open and save tables in SQLite database
+    (.sqlite) files.
 
 Basic Usage::
 
@@ -44,10 +52,24 @@ Alternate Usage::
     table.save('path/to/save.csv', table_type=csv)
 """
 
+from .arrow import Arrow, Parquet
 from .basetabletype import BaseTableType
 from .csv import CSV, CSVURL
 from .html import HTML
 from .ods import ODS
+from .snapshot import Snapshot
+from .sqlite import SQLite
 from .xlsx import XLSX
 
-__all__ = ["BaseTableType", "CSV", "CSVURL", "ODS", "HTML", "XLSX"]
+__all__ = [
+    "Arrow",
+    "BaseTableType",
+    "CSV",
+    "CSVURL",
+    "ODS",
+    "HTML",
+    "Parquet",
+    "Snapshot",
+    "SQLite",
+    "XLSX",
+]
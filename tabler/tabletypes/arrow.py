@@ -0,0 +1,290 @@
+"""
+This module provides Table Types for Apache Parquet and Arrow files.
+
+Both require the optional pyarrow package, which can be installed with
+``pip install tabler[arrow]``.
+
+Data is converted between :class:`tabler.Table` and pyarrow one column at a
+time. Files are read in batches of rows, so only the batches needed are read
+and only the columns needed are decoded.
+"""
+
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .basetabletype import BaseTableType
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tabler.table import Table
+
+
+def require_pyarrow() -> None:
+    """Raise ImportError if pyarrow is not installed."""
+    if pyarrow is None:
+        raise ImportError(
+            "pyarrow is required for Parquet and Arrow files. "
+            "Install it with: pip install tabler[arrow]"
+        )
+
+
+def to_arrow(table: "Table") -> "pyarrow.Table":
+    """Return the data in a :class:`tabler.Table` as a :class:`pyarrow.Table`.
+
+    Columns containing values of more than one type, other than None, are
+    converted to strings.
+
+    :param table: Table to convert.
+    :type table: :class:`tabler.Table`
+    :raises ImportError: If pyarrow is not installed.
+    """
+    require_pyarrow()
+    arrays = []
+    for cells in BaseTableType._table_columns(table):
+        try:
+            arrays.append(pyarrow.array(cells))
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            arrays.append(
+                pyarrow.array([None if cell is None else str(cell) for cell in cells])
+            )
+    names = [str(name) for name in table.header]
+    return pyarrow.Table.from_arrays(arrays, names=names)
+
+
+def batch_rows(
+    data: Union["pyarrow.Table", "pyarrow.RecordBatch"],
+) -> Iterator[Sequence[Any]]:
+    """Return an iterator of the rows in a :class:`pyarrow.RecordBatch`.
+
+    Each column is converted to Python values in a single call.
+    """
+    columns = [column.to_pylist() for column in data.columns]
+    return zip(*columns)  # noqa: B905
+
+
+class Parquet(BaseTableType):
+    """Table Type for Apache Parquet (.parquet) files.
+
+    Requires pyarrow. Values are stored with their types, so they are read
+    back as they were written.
+
+    :param compression: Compression codec used when writing. Default
+        snappy. If None data is not compressed.
+    :type compression: str or None.
+    :param int batch_size: Number of rows read at a time. Default 65536.
+    :param row_group_size: Maximum number of rows in each row group written.
+        If None use the pyarrow default.
+    :type row_group_size: int or None.
+    :param str extension: Extension of file to save. Default .parquet.
+    :param verbose: If True print status messages. If None use
+        :class:`tabler.tabletype.BaseTableType`.verbose.
+    :type verbose: bool or None.
+    """
+
+    extensions: List[str] = [".parquet"]
+    empty_value: Any = None
+    null_values: Tuple[Any, ...] = (None,)
+
+    def __init__(
+        self,
+        compression: Optional[str] = "snappy",
+        batch_size: int = 65536,
+        row_group_size: Optional[int] = None,
+        extension: str = ".parquet",
+        verbose: Optional[bool] = None,
+    ):
+        """Consturct :class:`tabler.tabletypes.Parquet`.
+
+        :param compression: Compression codec used when writing. Default
+            snappy. If None data is not compressed.
+        :type compression: str or None.
+        :param int batch_size: Number of rows read at a time. Default 65536.
+        :param row_group_size: Maximum number of rows in each row group
+            written. If None use the pyarrow default.
+        :type row_group_size: int or None.
+        :param str extension: Extension of file to save. Default .parquet.
+        :param verbose: If True print status messages. If None use
+            :class:`tabler.tabletype.BaseTableType`.verbose.
+        :type verbose: bool or None.
+        """
+        self.compression = compression
+        self.batch_size = batch_size
+        self.row_group_size = row_group_size
+        super().__init__(extension, verbose=verbose)
+
+    def open_path(
+        self, path: Union[str, "Path"], **options: Any
+    ) -> Tuple[List[str], List[List[Any]]]:
+        """Return header and rows from file.
+
+        Only the columns needed by **options** are read.
+
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        :param options: Options passed to
+            :func:`tabler.tabletypes.BaseTableType.parse_row_data`.
+        """
+        indexes = self._columns_to_read(self.read_header(path), options)
+        return self.parse_row_data(self.read_rows(path, indexes), **options)
+
+    def read_header(self, path: Union[str, "Path"]) -> List[str]:
+        """Return the column names of a file.
+
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        """
+        require_pyarrow()
+        return list(pyarrow.parquet.read_schema(str(path)).names)
+
+    def read_rows(
+        self, path: Union[str, "Path"], columns: Optional[List[int]] = None
+    ) -> Iterator[Sequence[Any]]:
+        """Return an iterator of the rows in a file.
+
+        Rows are read one batch at a time.
+
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        :param columns: Indexes of the columns to read. If None read all
+            columns.
+        :type columns: list(int) or None.
+        """
+        require_pyarrow()
+        parquet_file = pyarrow.parquet.ParquetFile(str(path))
+        try:
+            names = parquet_file.schema_arrow.names
+            if columns is not None:
+                names = [names[i] for i in columns]
+            yield names
+            for batch in parquet_file.iter_batches(
+                batch_size=self.batch_size,
+                columns=names if columns is not None else None,
+            ):
+                yield from batch_rows(batch)
+        finally:
+            parquet_file.close()
+
+    def parse_row(self, row: Sequence[Any]) -> List[Any]:
+        """Return a row of values, which are stored already parsed."""
+        return list(row)
+
+    def write(self, table: "Table", path: Union[str, "Path"]) -> None:
+        """Save data from :class:`tabler.Table` to file.
+
+        :param table:"Table" to save.
+        :type table: :class:`tabler.Table`
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        """
+        pyarrow.parquet.write_table(
+            to_arrow(table),
+            str(path),
+            row_group_size=self.row_group_size,
+            compression=self.compression,
+        )
+        self.print_status("Written {} rows to file {}".format(len(table.rows), path))
+
+
+class Arrow(Parquet):
+    """Table Type for Apache Arrow IPC (.arrow) files.
+
+    Requires pyarrow. Files are memory mapped when they are read, so column
+    data is not copied before it is converted.
+
+    :param compression: Compression codec used when writing, lz4 or zstd.
+        If None data is not compressed.
+    :type compression: str or None.
+    :param int batch_size: Number of rows in each record batch written.
+        Default 65536.
+    :param str extension: Extension of file to save. Default .arrow.
+    :param verbose: If True print status messages. If None use
+        :class:`tabler.tabletype.BaseTableType`.verbose.
+    :type verbose: bool or None.
+    """
+
+    extensions: List[str] = [".arrow"]
+
+    def __init__(
+        self,
+        compression: Optional[str] = None,
+        batch_size: int = 65536,
+        extension: str = ".arrow",
+        verbose: Optional[bool] = None,
+    ):
+        """Consturct :class:`tabler.tabletypes.Arrow`.
+
+        :param compression: Compression codec used when writing, lz4 or zstd.
+            If None data is not compressed.
+        :type compression: str or None.
+        :param int batch_size: Number of rows in each record batch written.
+            Default 65536.
+        :param str extension: Extension of file to save. Default .arrow.
+        :param verbose: If True print status messages. If None use
+            :class:`tabler.tabletype.BaseTableType`.verbose.
+        :type verbose: bool or None.
+        """
+        super().__init__(
+            compression=compression,
+            batch_size=batch_size,
+            extension=extension,
+            verbose=verbose,
+        )
+
+    def read_header(self, path: Union[str, "Path"]) -> List[str]:
+        """Return the column names of a file.
+
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        """
+        require_pyarrow()
+        with pyarrow.memory_map(str(path)) as source:
+            return list(pyarrow.ipc.open_file(source).schema.names)
+
+    def read_rows(
+        self, path: Union[str, "Path"], columns: Optional[List[int]] = None
+    ) -> Iterator[Sequence[Any]]:
+        """Return an iterator of the rows in a file.
+
+        Rows are read one record batch at a time.
+
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        :param columns: Indexes of the columns to read. If None read all
+            columns.
+        :type columns: list(int) or None.
+        """
+        require_pyarrow()
+        with pyarrow.memory_map(str(path)) as source:
+            reader = pyarrow.ipc.open_file(source)
+            names = reader.schema.names
+            if columns is not None:
+                names = [names[i] for i in columns]
+            yield names
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                if columns is not None:
+                    batch = batch.select(columns)
+                yield from batch_rows(batch)
+
+    def write(self, table: "Table", path: Union[str, "Path"]) -> None:
+        """Save data from :class:`tabler.Table` to file.
+
+        :param table:"Table" to save.
+        :type table: :class:`tabler.Table`
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        """
+        data = to_arrow(table)
+        options = pyarrow.ipc.IpcWriteOptions(compression=self.compression)
+        with pyarrow.OSFile(str(path), "wb") as sink:
+            with pyarrow.ipc.new_file(sink, data.schema, options=options) as writer:
+                for batch in data.to_batches(max_chunksize=self.batch_size):
+                    writer.write_batch(batch)
+        self.print_status("Written {} rows to file {}".format(len(table.rows), path))
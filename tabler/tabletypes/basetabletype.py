@@ -5,14 +5,40 @@ This can be subclassed to provide Table Types for :class:`tabler.Table`.
 They provide methods for opening and saving tables in different formats.
 """
 
-from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Type, Union
+import os
+import random
+import sys
+from itertools import islice, zip_longest
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
-from tabler import exceptions
+from tabler import exceptions, instrument
+from tabler.compression import split_extension
+from tabler.progress import Tracker, track
+from tabler.sampling import bernoulli_sample, reservoir_sample
+from tabler.schema import lenient
 
 if TYPE_CHECKING:
     from pathlib import Path
 
     from tabler import Table
+    from tabler.progress import CancelToken, ProgressCallback
+    from tabler.query import Condition
+    from tabler.schema import Schema
 
 
 def all_subclasses(cls: Type) -> List[Type]:
@@ -26,6 +52,30 @@ def all_subclasses(cls: Type) -> List[Type]:
     ]
 
 
+def projection(
+    indexes: Sequence[Optional[int]], fill: Any = None
+) -> Callable[[Sequence[Any]], Sequence[Any]]:
+    """Return a function selecting the cells at **indexes** from a row.
+
+    Cells missing from short rows, and cells for indexes which are None, are
+    returned as **fill**.
+
+    :param indexes: Indexes of the cells to select, in order.
+    :type indexes: list(int or None)
+    :param fill: Value returned for missing cells. Default None.
+    """
+    present = [i for i in indexes if i is not None]
+    length = max(present, default=-1) + 1
+    getter = itemgetter(*present) if 1 < len(present) == len(indexes) else None
+
+    def project(row: Sequence[Any]) -> Sequence[Any]:
+        if len(row) < length or getter is None:
+            return [fill if i is None or i >= len(row) else row[i] for i in indexes]
+        return getter(row)  # type: ignore[no-any-return]
+
+    return project
+
+
 class BaseTableType:
     """Base class for Table Types.
 
@@ -33,7 +83,7 @@ class BaseTableType:
     data from files and write to files of different types.
 
     Subclasses should implement :func:`tabler.tabletypes.BaseTableType.write`
-    and / or :func:`tabler.tabletypes.BaseTableType.open` methods.
+    and / or :func:`tabler.tabletypes.BaseTableType.read_rows` methods.
 
     Subclasses can also implement an **extensions** property. This is a list
     of file extensions matching the Table Type. It will then be used
@@ -48,6 +98,12 @@ class BaseTableType:
     empty_value: Union[str, int, float, None] = None
     verbose: bool = True
     null_values: Tuple[Union[str, int, float, None], ...] = ("", None)
+    #: True if :func:`write` changes an existing file in a transaction
+    #: rather than replacing it.
+    updates_in_place: bool = False
+    #: True if :func:`write` compresses files with a compression extension,
+    #: such as ``table.csv.gz``. See :mod:`tabler.compression`.
+    compresses: bool = False
 
     def __init__(self, extension: str, verbose: Optional[bool] = None) -> None:
         """Construct :class:`tabler.tabletypes.BaseTableType`.
@@ -59,7 +115,28 @@ class BaseTableType:
         """
         self.extension = extension
         if verbose is not None:
-            verbose = self.verbose
+            self.verbose = verbose
+
+    def check_compression(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        """Raise ValueError if **path** is compressed and cannot be written.
+
+        :param path: Path to file to be written.
+        :type path: str, pathlib.Path or compatible.
+        :raises ValueError: If **path** has a compression extension and
+            **compresses** is False.
+        """
+        compression_extension = split_extension(path)[1]
+        if compression_extension and not self.compresses:
+            raise ValueError(
+                "{} cannot write compressed files, remove {} from the path.".format(
+                    type(self).__name__, compression_extension
+                )
+            )
+
+    def print_status(self, message: str) -> None:
+        """Print a status message to stderr if **verbose** is True."""
+        if self.verbose:
+            print(message, file=sys.stderr)
 
     @classmethod
     def get_by_extension(cls, extension: str) -> Any:
@@ -78,9 +155,28 @@ class BaseTableType:
                 return table_type()
         raise exceptions.ExtensionNotRecognised(extension)
 
-    def open_path(self, path: str) -> Tuple[List[str], List[List[Any]]]:
+    def open_path(
+        self, path: Union[str, "Path"], **options: Any
+    ) -> Tuple[List[str], List[List[Any]]]:
         """Return header and rows from file.
 
+        Rows are read with :func:`tabler.tabletypes.BaseTableType.read_rows`
+        and parsed with :func:`tabler.tabletypes.BaseTableType.parse_row_data`.
+
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        :param options: Options passed to
+            :func:`tabler.tabletypes.BaseTableType.parse_row_data`.
+        """
+        return self.parse_row_data(self.read_rows(path), **options)
+
+    def read_rows(self, path: Union[str, "Path"]) -> Iterator[Sequence[Any]]:
+        """Return an iterator of the unparsed rows in a file.
+
+        The first row returned is the header. Rows should be read as they are
+        iterated where possible, so that rows which are not needed are never
+        read.
+
         :param path: Path to file to be opened.
         :type path: str, pathlib.Path or compatible.
         """
@@ -96,16 +192,320 @@ class BaseTableType:
         """
         raise NotImplementedError
 
+    def write_rows(
+        self,
+        header: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        path: Union[str, "Path"],
+    ) -> int:
+        """Save a header and rows to file and return the number of rows.
+
+        Subclasses which can write rows as they are produced should override
+        this. By default the rows are collected into a :class:`tabler.Table`
+        which is saved with :func:`tabler.tabletypes.BaseTableType.write`.
+
+        :param header: Column headers.
+        :param rows: Rows to save.
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        :return: Number of rows written.
+        """
+        from tabler.table import Table
+
+        table = Table(header=header, data=list(rows))
+        self.write(table, path)
+        return len(table)
+
     def parse_row_data(
-        self, rows: List[List[Any]]
+        self,
+        rows: Iterable[Sequence[Any]],
+        where: Optional["Condition"] = None,
+        columns: Optional[Sequence[Union[int, str]]] = None,
+        nrows: Optional[int] = None,
+        skiprows: Optional[Union[int, Collection[int]]] = None,
+        sample: Optional[Union[int, float]] = None,
+        seed: Optional[int] = None,
+        schema: Optional["Schema"] = None,
+        intern: Union[bool, Sequence[Union[int, str]]] = False,
+        progress: Optional["ProgressCallback"] = None,
+        cancel: Optional["CancelToken"] = None,
+        consume: Optional[Callable[[List[str], Iterator[List[Any]]], Any]] = None,
     ) -> Tuple[List[str], List[List[Any]]]:
-        """Return header and rows."""
+        """Return header and rows.
+
+        Rows are read from **rows** only until enough have been found, so
+        iterators which read lazily can stop reading early.
+
+        :param rows: Unparsed rows. The first row is the header.
+        :param where: If not None only rows matching this condition will be
+            returned. Rows are tested before they are parsed.
+        :type where: :class:`tabler.query.Condition` or None.
+        :param columns: If not None only these columns will be returned, in
+            the order given. Other columns are discarded before they are
+            parsed.
+        :type columns: list(str or int) or None.
+        :param nrows: If not None no more than this number of rows will be
+            returned.
+        :type nrows: int or None.
+        :param skiprows: Number of rows to skip after the header, or the
+            (zero based) indexes of rows to skip, not counting the header.
+        :type skiprows: int, set(int) or None.
+        :param sample: If not None return a random sample of rows. A float
+            between 0 and 1 keeps each row with that probability. An int
+            returns that number of rows chosen at random, in their original
+            order.
+        :type sample: int, float or None.
+        :param seed: Seed for the random number generator used by **sample**.
+        :type seed: int or None.
+        :param schema: If not None cells are converted to the types it gives
+            as they are parsed. Errors are added to its **errors** list.
+            **where** is tested against converted values.
+        :type schema: :class:`tabler.Schema` or None.
+        :param intern: Columns in which equal strings are replaced with a
+            single shared string, or True for all columns.
+        :type intern: bool or list(str or int).
+        :param progress: If not None a function called with a
+            :class:`tabler.progress.Progress` as rows are read.
+        :type progress: callable or None.
+        :param cancel: If not None rows stop being read once this is
+            cancelled.
+        :type cancel: :class:`tabler.progress.CancelToken` or None.
+        :param consume: If not None a function called with the header and an
+            iterator of the parsed rows, which are read as it is iterated. Its
+            return value is returned in place of the list of rows.
+        :type consume: callable or None.
+        :raises ValueError: If a column name is not in the header.
+        :raises IndexError: If a column index is out of range.
+        :raises tabler.exceptions.Cancelled: If **cancel** is cancelled.
+        """
+        if progress is not None or cancel is not None:
+            tracker = Tracker("read", progress, cancel)
+            with tracker.tracking():
+                return self.parse_row_data(
+                    tracker.wrap(rows, skip=1),
+                    where=where,
+                    columns=columns,
+                    nrows=nrows,
+                    skiprows=skiprows,
+                    sample=sample,
+                    seed=seed,
+                    schema=schema,
+                    intern=intern,
+                    consume=consume,
+                )
+        measurement = instrument.current_reading()
+        if measurement is not None:
+            rows = measurement.timed(rows)
+        iterator: Iterator[Sequence[Any]] = iter(rows)
+        try:
+            try:
+                header = list(next(iterator))
+            except StopIteration:
+                raise ValueError("Input has no header or data.") from None
+            indexes = None
+            output_header = header
+            if columns is not None:
+                indexes = [self._column_index(header, column) for column in columns]
+                output_header = [header[i] for i in indexes]
+            converters = None
+            if schema is not None:
+                converters = schema.compile(output_header)
+            if skiprows is not None:
+                iterator = self._skip_rows(iterator, skiprows)
+            if where is not None:
+                matches = where.compile(
+                    header,
+                    self._where_converters(header, indexes, converters),
+                    self.empty_value,
+                )
+                iterator = (row for row in iterator if matches(row))
+            if sample is not None:
+                iterator = self._sample_rows(iterator, sample, seed)
+            if nrows is not None:
+                iterator = islice(iterator, nrows)
+            parse_row = self.parse_row
+            if indexes is not None:
+                project = projection(indexes)
+                iterator = (project(row) for row in iterator)
+            stages = []
+            if schema is not None:
+                stages.append(schema.row_converter(output_header))
+            if intern:
+                stages.append(self._row_interner(output_header, intern))
+            if consume is not None:
+                parsed = self._parse_rows(iterator, parse_row, stages)
+                return output_header, consume(output_header, parsed)
+            if len(stages) == 1:
+                convert = stages[0]
+                return output_header, [convert(parse_row(row)) for row in iterator]
+            if stages:
+                convert, intern_row = stages
+                return output_header, [
+                    intern_row(convert(parse_row(row))) for row in iterator
+                ]
+            return output_header, [parse_row(row) for row in iterator]
+        finally:
+            close = getattr(rows, "close", None)
+            if close is not None:
+                close()
+
+    @staticmethod
+    def _parse_rows(
+        rows: Iterator[Sequence[Any]],
+        parse_row: Callable[[Sequence[Any]], List[Any]],
+        stages: List[Callable[[List[Any]], List[Any]]],
+    ) -> Iterator[List[Any]]:
+        """Parse **rows** and pass them through each of **stages** one at a time."""
+        for row in rows:
+            values = parse_row(row)
+            for stage in stages:
+                values = stage(values)
+            yield values
+
+    def _where_converters(
+        self,
+        header: Sequence[str],
+        indexes: Optional[List[int]],
+        converters: Optional[List[Optional[Callable[[Any], Any]]]],
+    ) -> List[Callable[[Any], Any]]:
+        """Return functions applied to each cell of a file before **where**.
+
+        :param header: Column headers of the file.
+        :param indexes: Indexes of the columns loaded, or None for all.
+        :param converters: Schema converters of the columns loaded, or None.
+        """
+        where_converters: List[Callable[[Any], Any]] = [self.parse_value] * len(header)
+        for index, converter in enumerate(converters or []):
+            if converter is not None:
+                file_index = index if indexes is None else indexes[index]
+                where_converters[file_index] = lenient(converter, self.parse_value)
+        return where_converters
+
+    @classmethod
+    def _row_interner(
+        cls, header: Sequence[str], columns: Union[bool, Sequence[Union[int, str]]]
+    ) -> Callable[[List[Any]], List[Any]]:
+        """Return a function replacing equal strings in rows with one object.
+
+        Each column has its own pool of strings, which is discarded when the
+        function is.
+
+        :param header: Column headers of the rows.
+        :param columns: Columns to intern, or True for all columns.
+        """
+        if isinstance(columns, bool):
+            indexes: Sequence[int] = range(len(header))
+        else:
+            indexes = [cls._column_index(header, column) for column in columns]
+        pools: List[Tuple[int, Dict[str, str]]] = [(index, {}) for index in indexes]
+
+        def intern_row(row: List[Any]) -> List[Any]:
+            length = len(row)
+            for index, pool in pools:
+                if index < length:
+                    value = row[index]
+                    if type(value) is str:
+                        row[index] = pool.setdefault(value, value)
+            return row
+
+        return intern_row
+
+    @staticmethod
+    def row_limit(
+        nrows: Optional[int] = None,
+        skiprows: Optional[Union[int, Collection[int]]] = None,
+        where: Optional["Condition"] = None,
+        sample: Optional[Union[int, float]] = None,
+        **options: Any,
+    ) -> Optional[int]:
+        """Return the number of rows, including the header, needed from a file.
+
+        Takes the same options as
+        :func:`tabler.tabletypes.BaseTableType.parse_row_data`. Returns None
+        if every row may be needed.
+        """
+        if nrows is None or where is not None or sample is not None:
+            return None
+        if skiprows is None:
+            return nrows + 1
+        if isinstance(skiprows, int):
+            return nrows + skiprows + 1
+        index = kept = 0
+        while kept < nrows:
+            if index not in skiprows:
+                kept += 1
+            index += 1
+        return index + 1
+
+    @classmethod
+    def _columns_to_read(
+        cls, header: Sequence[str], options: Dict[str, Any]
+    ) -> List[int]:
+        """Return the indexes of the columns in a file needed by **options**.
+
+        For table types which can read columns separately. The columns needed
+        by the **columns** and **where** options are returned and **options**
+        is changed to select the columns from the rows read, so it can be
+        passed to :func:`tabler.tabletypes.BaseTableType.parse_row_data`.
+        """
+        indexes = list(range(len(header)))
+        columns = options.pop("columns", None)
+        if columns is None:
+            return indexes
+        selected = [cls._column_index(header, column) for column in columns]
+        where = options.get("where")
+        where_columns = where.columns if where is not None else []
+        if any(isinstance(column, int) for column in where_columns):
+            options["columns"] = selected
+            return indexes
+        indexes = list(selected)
+        for column in where_columns:
+            index = cls._column_index(header, column)
+            if index not in indexes:
+                indexes.append(index)
+        options["columns"] = list(range(len(selected)))
+        return indexes
+
+    @staticmethod
+    def _table_columns(table: "Table") -> List[Sequence[Any]]:
+        """Return the cells of each column of **table**."""
+        rows = [row.row for row in track(table.rows)]
+        width = len(table.header)
+        columns: List[Sequence[Any]] = list(islice(zip_longest(*rows), width))
+        columns.extend([(None,) * len(rows)] * (width - len(columns)))
+        return columns
+
+    @staticmethod
+    def _skip_rows(
+        rows: Iterator[Sequence[Any]], skiprows: Union[int, Collection[int]]
+    ) -> Iterator[Sequence[Any]]:
+        if isinstance(skiprows, int):
+            return islice(rows, skiprows, None)
+        skip = set(skiprows)
+        return (row for index, row in enumerate(rows) if index not in skip)
+
+    @staticmethod
+    def _sample_rows(
+        rows: Iterator[Sequence[Any]], sample: Union[int, float], seed: Optional[int]
+    ) -> Iterator[Sequence[Any]]:
+        generator = random.Random(seed)
+        if isinstance(sample, float):
+            if not 0 <= sample <= 1:
+                raise ValueError("Sample fraction must be between 0 and 1.")
+            return bernoulli_sample(rows, sample, generator)
+        return iter(reservoir_sample(rows, sample, generator))
+
+    @staticmethod
+    def _column_index(header: Sequence[str], column: Union[int, str]) -> int:
+        """Return the index of a column from its name or index."""
+        if isinstance(column, int):
+            if not -len(header) <= column < len(header):
+                raise IndexError("Column index {} out of range.".format(column))
+            return column % len(header)
         try:
-            header = [_ for _ in rows[0]]
-            data = [self.parse_row(row) for row in rows[1:]]
-        except IndexError:
-            raise ValueError("Input has no header or data.") from None
-        return header, data
+            return list(header).index(column)
+        except ValueError:
+            raise ValueError("Column {!r} not in header.".format(column)) from None
 
     def parse_value(self, value: Any) -> Any:
         """Return None if the value is empty, otherwise return str(value)."""
@@ -114,7 +514,7 @@ class BaseTableType:
         else:
             return value
 
-    def parse_row(self, row: List[Any]) -> List[Any]:
+    def parse_row(self, row: Sequence[Any]) -> List[Any]:
         """Return a row of parsed values."""
         return [self.parse_value(value) for value in row]
 
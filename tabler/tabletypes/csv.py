@@ -1,11 +1,29 @@
 """This module provides Table Types for .csv files."""
 
+import codecs
 import csv
-import sys
-from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Union
+import functools
+import os
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 import requests
 
+from tabler import progress
+from tabler.compression import open_file
+
 from .basetabletype import BaseTableType
 
 if TYPE_CHECKING:
@@ -13,12 +31,118 @@ if TYPE_CHECKING:
 
     from tabler.table import Table
 
+AUTO = "auto"
+SNIFF_SIZE = 64 * 1024
+SNIFF_ROWS = 50
+DELIMITERS = ",;\t|"
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+class CSVFormat(NamedTuple):
+    """The format of a .csv file found by :func:`sniff_csv`."""
+
+    encoding: str
+    dialect: Type[csv.Dialect]
+    header: bool
+
+
+def sniff_csv(path: Union[str, "Path"], encoding: Optional[str] = None) -> CSVFormat:
+    """Return the format of a .csv file, found from the start of the file.
+
+    Only the first 64KB of the file are read. The encoding is found from a
+    byte order mark if there is one, otherwise utf-8 is used if the start of
+    the file is valid utf-8 and latin-1 if not. The delimiter and quoting are
+    found from the first 50 lines with :class:`csv.Sniffer`. The first row is
+    taken to be a header unless it has numbers in columns which contain only
+    numbers.
+
+    Results are cached until the file is changed.
+
+    :param path: Path to file.
+    :type path: str, pathlib.Path or compatible.
+    :param encoding: Encoding of file. If None it will be detected.
+    :type encoding: str or None.
+    """
+    stat = os.stat(str(path))
+    return _sniff_csv(str(path), stat.st_mtime_ns, stat.st_size, encoding)
+
+
+@functools.lru_cache(maxsize=128)
+def _sniff_csv(path: str, mtime: int, size: int, encoding: Optional[str]) -> CSVFormat:
+    with open_file(path, "rb") as f:
+        sample = f.read(SNIFF_SIZE)
+        complete = len(sample) < SNIFF_SIZE or not f.read(1)
+    if encoding is None:
+        encoding = _detect_encoding(sample)
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    text = decoder.decode(sample, final=complete)
+    if not complete:
+        text = text[: max(text.rfind("\n"), 0)]
+    lines = text.splitlines()[:SNIFF_ROWS]
+    try:
+        dialect = csv.Sniffer().sniff("\n".join(lines), delimiters=DELIMITERS)
+    except csv.Error:
+        dialect = csv.excel
+    rows = list(csv.reader(lines, dialect))
+    return CSVFormat(encoding, dialect, _has_header(rows))
+
+
+def _detect_encoding(sample: bytes) -> str:
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8"
+
+
+def _has_header(rows: List[List[str]]) -> bool:
+    if len(rows) < 2:
+        return True
+    for index, cell in enumerate(rows[0]):
+        if not _is_number(cell):
+            continue
+        values = [row[index] for row in rows[1:] if index < len(row) and row[index]]
+        if values and all(_is_number(value) for value in values):
+            return False
+    return True
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
 
 class CSV(BaseTableType):
     """Table Type for comma separated value (.csv) files.
 
-    :param str encoding: Encoding of file. Default: utf8.
-    :param str delimiter: Delimiter used by file. Default , (Comma).
+    Files compressed with gzip, bzip2, xz or Zstandard, such as .csv.gz
+    files, are decompressed as they are read and compressed as they are
+    written. See :mod:`tabler.compression`.
+
+    If **encoding**, **delimiter** or **header** is ``'auto'`` it is found
+    from the start of the file with :func:`tabler.tabletypes.csv.sniff_csv`
+    when the file is read. A detected delimiter also sets the quoting used.
+    Files are written with utf-8 and commas in place of ``'auto'``.
+
+    :param str encoding: Encoding of file or 'auto'. Default: utf8.
+    :param str delimiter: Delimiter used by file or 'auto'. Default ,
+        (Comma).
+    :param header: True if the first row of the file is a header, False if
+        not, or 'auto'. Files without a header get empty column headers.
+        Default True.
+    :type header: bool or str.
     :param str extension: Extension of file to save. Default .csv.
     :param verbose: If True print status messages. If None use
         :class:`tabler.tabletype.BaseTableType`.verbose.
@@ -27,6 +151,7 @@ class CSV(BaseTableType):
 
     extensions = [".csv", ".txt"]
     empty_value = ""
+    compresses = True
 
     def __init__(
         self,
@@ -34,29 +159,69 @@ class CSV(BaseTableType):
         delimiter: str = ",",
         extension: str = ".csv",
         verbose: Optional[bool] = None,
+        header: Union[bool, str] = True,
     ):
         """Consturct :class:`tabler.tabletypes.CSV`.
 
-        :param str encoding: Encoding of file. Default: utf8.
-        :param str delimiter: Delimiter used by file. Default , (Comma).
+        :param str encoding: Encoding of file or 'auto'. Default: utf8.
+        :param str delimiter: Delimiter used by file or 'auto'. Default ,
+            (Comma).
         :param str extension: Extension of file to save. Default .csv.
         :param verbose: If True print status messages. If None use
             :class:`tabler.tabletype.BaseTableType`.verbose.
         :type verbose: bool or None.
+        :param header: True if the first row of the file is a header, False
+            if not, or 'auto'. Default True.
+        :type header: bool or str.
         """
         self.encoding = encoding
         self.delimiter = delimiter
+        self.header = header
         super().__init__(extension, verbose=verbose)
 
-    def open_path(self, path: str) -> Tuple[List[str], List[List[Any]]]:
-        """Return header and rows from file.
+    def read_rows(self, path: Union[str, "Path"]) -> Iterator[List[str]]:
+        """Return an iterator of the unparsed rows in a file.
+
+        If the file has no header an empty header row is returned first.
+
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        """
+        encoding, reader_options, header = self.file_format(path)
+        with open_file(path, "r", encoding=encoding) as f:
+            tracker = progress.current()
+            if tracker is not None:
+                tracker.follow(f)
+            rows = csv.reader(f, **reader_options)
+            if not header:
+                first = next(rows, None)
+                if first is None:
+                    return
+                yield [""] * len(first)
+                yield first
+            yield from rows
+
+    def file_format(self, path: Union[str, "Path"]) -> Tuple[str, Dict[str, Any], bool]:
+        """Return the encoding, :func:`csv.reader` options and header of a file.
+
+        Settings which are ``'auto'`` are found with
+        :func:`tabler.tabletypes.csv.sniff_csv`.
 
         :param path: Path to file to be opened.
         :type path: str, pathlib.Path or compatible.
         """
-        with open(str(path), "r", encoding=self.encoding) as f:
-            data = list(csv.reader(f, delimiter=self.delimiter))
-        return self.parse_row_data(data)
+        encoding, header = self.encoding, self.header
+        reader_options: Dict[str, Any] = {"delimiter": self.delimiter}
+        if AUTO not in (encoding, self.delimiter, header):
+            return encoding, reader_options, bool(header)
+        detected = sniff_csv(path, None if encoding == AUTO else encoding)
+        if encoding == AUTO:
+            encoding = detected.encoding
+        if self.delimiter == AUTO:
+            reader_options = {"dialect": detected.dialect}
+        if header == AUTO:
+            header = detected.header
+        return encoding, reader_options, bool(header)
 
     def write(self, table: "Table", path: Union[str, "Path"]) -> None:
         """Save data from :class:`tabler.Table` to file.
@@ -66,15 +231,34 @@ class CSV(BaseTableType):
         :param path: Path to file to be opened.
         :type path: str, pathlib.Path or compatible.
         """
-        with open(str(path), "w", newline="", encoding=self.encoding) as f:
-            writer = csv.writer(f, delimiter=self.delimiter)
-            if table.header:
-                writer.writerow(table.header)
-            for row in table:
+        self.write_rows(table.header, (row.row for row in table.rows), path)
+
+    def write_rows(
+        self,
+        header: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        path: Union[str, "Path"],
+    ) -> int:
+        """Save a header and rows to file as they are produced.
+
+        :param header: Column headers.
+        :param rows: Rows to save.
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        :return: Number of rows written.
+        """
+        encoding = "utf-8" if self.encoding == AUTO else self.encoding
+        delimiter = "," if self.delimiter == AUTO else self.delimiter
+        count = 0
+        with open_file(path, "w", newline="", encoding=encoding) as f:
+            writer = csv.writer(f, delimiter=delimiter)
+            if header and self.header:
+                writer.writerow(header)
+            for row in progress.track(rows):
                 writer.writerow(list(row))
-        print(
-            "Written {} rows to file {}".format(len(table.rows), path), file=sys.stderr
-        )
+                count += 1
+        self.print_status("Written {} rows to file {}".format(count, path))
+        return count
 
     def parse_value(self, value: Any) -> Any:
         """Return None if the value is empty, otherwise return str(value)."""
@@ -83,19 +267,19 @@ class CSV(BaseTableType):
 
 
 class CSVURL(CSV):
-    """Table type for opening .csv files over HTTP."""
+    """Table type for opening .csv files over HTTP.
+
+    Settings cannot be ``'auto'`` as the file is not sniffed.
+    """
 
-    def open_path(self, path: str) -> Tuple[List[str], List[List[Any]]]:
-        """Return header and rows from file.
+    def read_rows(self, path: Union[str, "Path"]) -> Iterator[List[str]]:
+        """Return an iterator of the unparsed rows in a file.
 
         :param str path: URL of file to be opened.
         """
-        request = requests.get(path)
-        text = []
-        for line in request.iter_lines():
-            text.append(line.decode(self.encoding))
-        data = list(csv.reader(text))
-        return self.parse_row_data(data)
+        request = requests.get(str(path))
+        lines = (line.decode(self.encoding) for line in request.iter_lines())
+        yield from csv.reader(lines)
 
     def write(self, table: "Table", path: Union[str, "Path"]) -> None:
         """Save data from :class:`tabler.Table` to file.
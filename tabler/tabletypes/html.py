@@ -1,7 +1,6 @@
 """This module a Table Type for writing tables as HTML."""
 
-import sys
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 from tabler.tohtml import ToHTML
 
@@ -33,7 +32,7 @@ class HTML(BaseTableType):
         use_header: bool = True,
         encoding: str = "utf8",
         extension: str = ".html",
-        verbose: bool = True,
+        verbose: Optional[bool] = None,
     ):
         """Consturct :class:`tabler.tabletypes.HTML`.
 
@@ -61,6 +60,4 @@ class HTML(BaseTableType):
         html_file = open(str(path), "w", encoding=self.encoding)
         html_file.write(html)
         html_file.close()
-        print(
-            "Written {} rows to file {}".format(len(table.rows), path), file=sys.stderr
-        )
+        self.print_status("Written {} rows to file {}".format(len(table.rows), path))
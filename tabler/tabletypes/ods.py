@@ -1,10 +1,11 @@
 """This module provides a Table Type for Open Document Format (.ods) files."""
 
-import sys
-from typing import TYPE_CHECKING, Any, List, Tuple, Union
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Tuple, Union
 
 import pyexcel_ods3  # type: ignore
 
+from tabler import progress
+
 from .basetabletype import BaseTableType
 
 if TYPE_CHECKING:
@@ -25,7 +26,9 @@ class ODS(BaseTableType):
     extensions: List[str] = [".ods"]
     empty_value: Any = ""
 
-    def __init__(self, sheet: int = 0, extension: str = ".ods", verbose: bool = True):
+    def __init__(
+        self, sheet: int = 0, extension: str = ".ods", verbose: Optional[bool] = None
+    ):
         """Consturct :class:`tabler.tabletypes.ODS`.
 
         :param str extension: Extension of file to save. Default .ods.
@@ -36,15 +39,34 @@ class ODS(BaseTableType):
         self.sheet = sheet
         super().__init__(extension, verbose=verbose)
 
-    def open_path(self, path: Union[str, "Path"]) -> Tuple[List[str], List[List[Any]]]:
+    def open_path(
+        self, path: Union[str, "Path"], **options: Any
+    ) -> Tuple[List[str], List[List[Any]]]:
         """Return header and rows from file.
 
+        Only the rows needed by **options** are converted from the file.
+
         :param path: Path to file to be opened.
         :type path: str, pathlib.Path or compatible.
+        :param options: Options passed to
+            :func:`tabler.tabletypes.BaseTableType.parse_row_data`.
         """
-        data = pyexcel_ods3.get_data(str(path))
-        sheet = data[list(data.keys())[self.sheet]]
-        return self.parse_row_data(sheet)
+        rows = self.read_rows(path, row_limit=self.row_limit(**options))
+        return self.parse_row_data(rows, **options)
+
+    def read_rows(
+        self, path: Union[str, "Path"], row_limit: Optional[int] = None
+    ) -> Iterator[List[Any]]:
+        """Return an iterator of the unparsed rows in a file.
+
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        :param row_limit: If not None, the maximum number of rows to read.
+        :type row_limit: int or None.
+        """
+        keywords = {} if row_limit is None else {"row_limit": row_limit}
+        data = pyexcel_ods3.get_data(str(path), **keywords)
+        yield from data[list(data.keys())[self.sheet]]
 
     def write(self, table: "Table", path: Union[str, "Path"]) -> None:
         """Save data from :class:`tabler.Table` to file.
@@ -54,9 +76,9 @@ class ODS(BaseTableType):
         :param path: Path to file to be opened.
         :type path: str, pathlib.Path or compatible.
         """
-        rows = self.prepare_rows(list(table.header), [list(_) for _ in table.rows])
+        rows = self.prepare_rows(
+            list(table.header), [list(_) for _ in progress.track(table.rows)]
+        )
         sheets = {"Sheet {}".format(self.sheet): rows}
         pyexcel_ods3.save_data(str(path), sheets)
-        print(
-            "Written {} rows to file {}".format(len(table.rows), path), file=sys.stderr
-        )
+        self.print_status("Written {} rows to file {}".format(len(table.rows), path))
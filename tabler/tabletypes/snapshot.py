@@ -0,0 +1,358 @@
+"""
+This module provides a Table Type for binary columnar snapshot files.
+
+Snapshots store the header, the type of each column and the data of each
+column in separate blocks, so they can be written and read much faster than
+text formats. They are intended for passing tables between stages of a
+pipeline rather than for long term storage.
+
+File layout (all integers little endian)::
+
+    magic         8 bytes   b"TABLERSN"
+    version       uint16
+    row count     uint64
+    column count  uint32
+    directory     one entry per column:
+                      name length  uint32
+                      name         utf-8
+                      kind         1 byte (see below)
+                      flags        1 byte (1 = compressed, 2 = has nulls)
+                      nulls offset, nulls length, data offset, data length
+                                   uint64 each
+    blocks        null masks and column data, each starting on an 8 byte
+                  boundary.
+
+Column kinds:
+
+- ``n``: Every cell is None. There is no data block.
+- ``i``: 64 bit signed integers.
+- ``f``: 64 bit floats.
+- ``b``: Booleans, one byte each.
+- ``s``: Strings, utf-8 encoded and separated by null characters.
+- ``j``: Any other values, as a JSON list. Values which JSON cannot represent
+  are stored as strings.
+
+The null mask is one byte per row, 1 where the cell is None. It is omitted if
+the column has no None values. Compressed blocks use zlib.
+"""
+
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from tabler.compression import compression_of, open_file
+
+from .basetabletype import BaseTableType
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tabler.table import Table
+
+MAGIC = b"TABLERSN"
+VERSION = 1
+HEADER = struct.Struct("<8sHQI")
+ENTRY = struct.Struct("<ccQQQQ")
+NAME_LENGTH = struct.Struct("<I")
+COMPRESSED = 1
+HAS_NULLS = 2
+INT64_RANGE = (-(2**63), 2**63 - 1)
+ARRAY_TYPES = {"i": "q", "f": "d", "b": "B"}
+
+
+def column_kind(cells: Sequence[Any]) -> str:
+    """Return the kind of column needed to store **cells**."""
+    kinds = set(map(type, cells))
+    kinds.discard(type(None))
+    if not kinds:
+        return "n"
+    if kinds == {str}:
+        if any("\x00" in cell for cell in cells if cell is not None):
+            return "j"
+        return "s"
+    if kinds == {int}:
+        values = cells
+        if None in cells:
+            values = [cell for cell in cells if cell is not None]
+        if INT64_RANGE[0] <= min(values) and max(values) <= INT64_RANGE[1]:
+            return "i"
+        return "j"
+    if kinds == {float}:
+        return "f"
+    if kinds == {bool}:
+        return "b"
+    return "j"
+
+
+class SnapshotReader:
+    """Decode columns from a snapshot held in a buffer.
+
+    Columns are decoded only when they are requested.
+
+    :param buffer: Snapshot data, for example a :class:`mmap.mmap`.
+    :type buffer: bytes, mmap.mmap or other buffer.
+    :raises ValueError: If **buffer** does not contain a snapshot.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        """Construct :class:`tabler.tabletypes.snapshot.SnapshotReader`."""
+        self.buffer = memoryview(buffer)
+        try:
+            self._read_directory()
+        except Exception:
+            self.buffer.release()
+            raise
+
+    def _read_directory(self) -> None:
+        if len(self.buffer) < HEADER.size:
+            raise ValueError("Input is not a snapshot.")
+        magic, version, self.row_count, column_count = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError("Input is not a snapshot.")
+        if version != VERSION:
+            raise ValueError("Snapshot version {} not supported.".format(version))
+        self.header: List[str] = []
+        self.entries: List[Tuple[str, int, int, int, int, int]] = []
+        position = HEADER.size
+        for _ in range(column_count):
+            (length,) = NAME_LENGTH.unpack_from(self.buffer, position)
+            position += NAME_LENGTH.size
+            name = bytes(self.buffer[position : position + length]).decode("utf-8")
+            position += length
+            kind, flags, *blocks = ENTRY.unpack_from(self.buffer, position)
+            position += ENTRY.size
+            self.header.append(name)
+            self.entries.append((kind.decode("ascii"), flags[0], *blocks))
+
+    def release(self) -> None:
+        """Release the buffer."""
+        self.buffer.release()
+
+    def column(self, index: int, start: int = 0, stop: Optional[int] = None) -> List:
+        """Return the cells of a column.
+
+        :param int index: Index of the column.
+        :param int start: Index of the first row to return.
+        :param stop: Index after the last row to return. If None return all
+            remaining rows.
+        :type stop: int or None.
+        """
+        kind, flags, nulls_offset, nulls_length, offset, length = self.entries[index]
+        stop = self.row_count if stop is None else min(stop, self.row_count)
+        count = max(stop - start, 0)
+        if kind == "n":
+            return [None] * count
+        data = self._block(offset, length, flags)
+        if kind == "s":
+            cells: List[Any] = (
+                str(data, "utf-8").split("\x00")[start:stop] if self.row_count else []
+            )
+        elif kind == "j":
+            cells = json.loads(str(data, "utf-8"))[start:stop]
+        else:
+            values = array(ARRAY_TYPES[kind])
+            size = values.itemsize
+            values.frombytes(data[start * size : (start + count) * size])
+            if sys.byteorder == "big":
+                values.byteswap()
+            cells = values.tolist()
+            if kind == "b":
+                cells = [bool(cell) for cell in cells]
+        if flags & HAS_NULLS:
+            nulls = self._block(nulls_offset, nulls_length, flags)[start:stop]
+            for row, null in enumerate(nulls):
+                if null:
+                    cells[row] = None
+        return cells
+
+    def _block(self, offset: int, length: int, flags: int) -> Union[bytes, memoryview]:
+        block = self.buffer[offset : offset + length]
+        if flags & COMPRESSED:
+            return zlib.decompress(block)
+        return block
+
+
+class Snapshot(BaseTableType):
+    """Table Type for binary columnar snapshot (.tabler) files.
+
+    Values are stored with their types, so integers, floats, booleans, None
+    and strings are read back as they were written. Other values are written
+    as strings.
+
+    :param bool compress: If True compress column data with zlib.
+    :param str extension: Extension of file to save. Default .tabler.
+    :param verbose: If True print status messages. If None use
+        :class:`tabler.tabletype.BaseTableType`.verbose.
+    :type verbose: bool or None.
+    """
+
+    extensions: List[str] = [".tabler"]
+    empty_value: Any = None
+    null_values: Tuple[Any, ...] = (None,)
+    compresses = True
+
+    def __init__(
+        self,
+        compress: bool = False,
+        extension: str = ".tabler",
+        verbose: Optional[bool] = None,
+    ):
+        """Consturct :class:`tabler.tabletypes.Snapshot`.
+
+        :param bool compress: If True compress column data with zlib.
+        :param str extension: Extension of file to save. Default .tabler.
+        :param verbose: If True print status messages. If None use
+            :class:`tabler.tabletype.BaseTableType`.verbose.
+        :type verbose: bool or None.
+        """
+        self.compress = compress
+        super().__init__(extension, verbose=verbose)
+
+    def open_path(
+        self, path: Union[str, "Path"], **options: Any
+    ) -> Tuple[List[str], List[List[Any]]]:
+        """Return header and rows from file.
+
+        Only the columns and rows needed by **options** are decoded. Files
+        compressed with gzip, bzip2, xz or Zstandard are decompressed into
+        memory, other files are memory mapped.
+
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        :param options: Options passed to
+            :func:`tabler.tabletypes.BaseTableType.parse_row_data`.
+        """
+        if compression_of(path) is not None:
+            with open_file(path, "rb") as f:
+                reader = SnapshotReader(f.read())
+            try:
+                return self.read_snapshot(reader, **options)
+            finally:
+                reader.release()
+        with open(str(path), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                reader = SnapshotReader(buffer)
+                try:
+                    return self.read_snapshot(reader, **options)
+                finally:
+                    reader.release()
+
+    def read_snapshot(
+        self, reader: SnapshotReader, **options: Any
+    ) -> Tuple[List[str], List[List[Any]]]:
+        """Return header and rows from a :class:`SnapshotReader`.
+
+        :param reader: Snapshot to read.
+        :type reader: :class:`tabler.tabletypes.snapshot.SnapshotReader`
+        :param options: Options passed to
+            :func:`tabler.tabletypes.BaseTableType.parse_row_data`.
+        """
+        header = reader.header
+        indexes = self._columns_to_read(header, options)
+        start, stop = 0, None
+        skiprows = options.get("skiprows")
+        if options.get("where") is None and options.get("sample") is None:
+            if skiprows is None or isinstance(skiprows, int):
+                start = options.pop("skiprows", None) or 0
+                nrows = options.pop("nrows", None)
+                stop = None if nrows is None else start + nrows
+        data = [reader.column(index, start, stop) for index in indexes]
+        return self.parse_row_data(
+            _chain_header([header[i] for i in indexes], zip(*data)),  # noqa: B905
+            **options,
+        )
+
+    def parse_row(self, row: Sequence[Any]) -> List[Any]:
+        """Return a row of values, which are stored already parsed."""
+        return list(row)
+
+    def write(self, table: "Table", path: Union[str, "Path"]) -> None:
+        """Save data from :class:`tabler.Table` to file.
+
+        :param table:"Table" to save.
+        :type table: :class:`tabler.Table`
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        """
+        with open_file(path, "wb") as f:
+            for block in self.encode(table):
+                f.write(block)
+        self.print_status("Written {} rows to file {}".format(len(table.rows), path))
+
+    def encode(self, table: "Table") -> List[bytes]:
+        """Return the blocks of a snapshot of **table**.
+
+        Joining the blocks gives the complete snapshot.
+
+        :param table: Table to encode.
+        :type table: :class:`tabler.Table`
+        """
+        columns = self._table_columns(table)
+        width = len(columns)
+        row_count = len(table.rows)
+        blocks: List[bytes] = []
+        entries = []
+        names = [str(name).encode("utf-8") for name in table.header]
+        position = HEADER.size + sum(
+            NAME_LENGTH.size + len(name) + ENTRY.size for name in names
+        )
+        for cells in columns:
+            kind = column_kind(cells)
+            nulls, data = self._encode_column(kind, cells)
+            flags = (COMPRESSED if self.compress else 0) | (HAS_NULLS if nulls else 0)
+            locations = []
+            for block in (nulls, data):
+                if block and self.compress:
+                    block = zlib.compress(block)
+                padding = -position % 8
+                if padding:
+                    blocks.append(b"\x00" * padding)
+                    position += padding
+                locations.extend([position, len(block)])
+                blocks.append(block)
+                position += len(block)
+            entries.append((kind.encode("ascii"), bytes([flags]), *locations))
+        directory = [HEADER.pack(MAGIC, VERSION, row_count, width)]
+        for name, entry in zip(names, entries):  # noqa: B905
+            directory.append(NAME_LENGTH.pack(len(name)) + name + ENTRY.pack(*entry))
+        return directory + blocks
+
+    @staticmethod
+    def _encode_column(kind: str, cells: Sequence[Any]) -> Tuple[bytes, bytes]:
+        """Return the null mask and data blocks for a column."""
+        if kind == "n":
+            return b"", b""
+        if kind == "j":
+            return b"", json.dumps(cells, default=str).encode("utf-8")
+        nulls = b""
+        if None in cells:
+            nulls = bytes(cell is None for cell in cells)
+            if kind != "s":
+                cells = [0 if cell is None else cell for cell in cells]
+        if kind == "s":
+            text = "\x00".join("" if cell is None else cell for cell in cells)
+            return nulls, text.encode("utf-8")
+        values = array(ARRAY_TYPES[kind], cells)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return nulls, values.tobytes()
+
+
+def _chain_header(
+    header: List[str], rows: Iterator[Sequence[Any]]
+) -> Iterator[Sequence[Any]]:
+    yield header
+    yield from rows
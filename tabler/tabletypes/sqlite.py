@@ -0,0 +1,410 @@
+"""
+This module provides a Table Type for SQLite database files.
+
+Tables are written to a table in the database with a single ``executemany``
+call inside one transaction. Rows are read from a table, or from any
+``SELECT`` query, a batch at a time with ``fetchmany``.
+
+Options given to :class:`tabler.Table` are run by SQLite where possible:
+
+- **columns** select only the columns needed.
+- **where** conditions are turned into a ``WHERE`` clause, so SQLite can use
+  indexes to find matching rows. Rows returned are still tested with the
+  condition, as text cells are compared with numbers differently by SQLite.
+  Conditions which cannot be turned into SQL, such as those using ``~`` or
+  comparing with empty values, are only tested as rows are read, as are all
+  conditions when a **schema** is given.
+- **nrows** and **skiprows** become ``LIMIT`` and ``OFFSET`` when there is
+  no **where** condition or **sample**.
+
+Rows can be sorted by SQLite with **order_by**.
+
+    Basic Usage::
+
+        >>> from tabler import SQLite, Table, where
+        >>> table = Table('stock.csv')
+        >>> table.write('stock.sqlite', SQLite(table='stock'))
+        >>> in_stock = Table(
+        ...     'stock.sqlite',
+        ...     SQLite(table='stock', order_by=['Price']),
+        ...     where=where('Qty', '>', 0),
+        ... )
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from urllib.request import pathname2url
+
+from tabler import progress
+from tabler.query import And, Condition, Or, Where
+
+from .basetabletype import BaseTableType
+
+if TYPE_CHECKING:
+    from tabler.table import Table
+
+IF_EXISTS = ("replace", "append", "fail")
+
+#: Types stored by SQLite without conversion. Other values are stored as text.
+NATIVE_TYPES = (int, float, str, bytes, type(None))
+
+SQL = Tuple[str, List[Any]]
+
+
+def quote(name: str) -> str:
+    """Return **name** quoted for use as an SQL identifier."""
+    return '"{}"'.format(str(name).replace('"', '""'))
+
+
+def condition_sql(condition: Condition, header: Sequence[str]) -> Optional[SQL]:
+    """Return an SQL expression selecting the rows which may match **condition**.
+
+    The expression matches every row matching **condition**, and may match
+    other rows. Returns None if **condition** cannot be expressed in SQL.
+
+    :param condition: Condition to convert.
+    :type condition: :class:`tabler.query.Condition`
+    :param header: Column headers of the rows selected.
+    :return: SQL expression and its parameters, or None.
+    """
+    if isinstance(condition, Or):
+        parts = [condition_sql(_, header) for _ in condition.conditions]
+        if not parts or any(part is None for part in parts):
+            return None
+        return _join(" OR ", parts)  # type: ignore[arg-type]
+    if isinstance(condition, And):
+        found = [condition_sql(_, header) for _ in condition.conditions]
+        known = [part for part in found if part is not None]
+        return _join(" AND ", known) if known else None
+    if isinstance(condition, Where):
+        return _where_sql(condition, header)
+    return None
+
+
+def _join(operator: str, parts: List[SQL]) -> SQL:
+    sql = operator.join("({})".format(part[0]) for part in parts)
+    return sql, [value for part in parts for value in part[1]]
+
+
+def _where_sql(condition: Where, header: Sequence[str]) -> Optional[SQL]:
+    try:
+        column = quote(header[condition.column_index(header)])
+    except (IndexError, ValueError):
+        return None
+    operator, value = condition.operator, condition.value
+    if operator in ("in", "not in"):
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            return None
+        values = list(value)
+        if not all(_comparable(_) for _ in values):
+            return None
+        placeholders = ", ".join("?" * len(values))
+        if operator == "in":
+            return "{} IN ({})".format(column, placeholders), values
+        sql = "{0} IS NULL OR {0} NOT IN ({1})".format(column, placeholders)
+        return sql, values
+    if not _comparable(value):
+        return None
+    if operator == "!=":
+        return "{} IS NOT ?".format(column), [value]
+    operator = "=" if operator == "==" else operator
+    if isinstance(value, (int, float)):
+        sql = "{0} {1} ? OR typeof({0}) = 'text'".format(column, operator)
+        return sql, [value]
+    return "{} {} ?".format(column, operator), [value]
+
+
+def _comparable(value: Any) -> bool:
+    """Return True if SQLite compares **value** as tabler conditions do."""
+    return type(value) in (int, float, str) and value != ""
+
+
+class SQLite(BaseTableType):
+    """Table Type for SQLite database (.sqlite) files.
+
+    Values are stored with their types, so integers, floats, strings and
+    bytes are read back as they were written. Other values are stored as
+    text.
+
+    :param str table: Name of the table in the database to read or write.
+        Default data.
+    :param query: A ``SELECT`` query giving the rows to read, in place of
+        **table**. Cannot be used to write.
+    :type query: str or None.
+    :param parameters: Values of the ``?`` parameters in **query**.
+    :type parameters: list or None.
+    :param order_by: Names or indexes of columns by which SQLite sorts rows
+        as they are read.
+    :type order_by: list(str or int) or None.
+    :param bool asc: If True rows are sorted in ascending order, otherwise
+        descending. Default True.
+    :param int batch_size: Number of rows fetched at a time. Default 10000.
+    :param str if_exists: What to do when writing to a table which exists:
+        'replace' it, 'append' rows to it, or 'fail'. Default replace.
+    :param str extension: Extension of file to save. Default .sqlite.
+    :param verbose: If True print status messages. If None use
+        :class:`tabler.tabletype.BaseTableType`.verbose.
+    :type verbose: bool or None.
+    :raises ValueError: If **if_exists** is not valid.
+    """
+
+    extensions: List[str] = [".sqlite", ".sqlite3", ".db"]
+    updates_in_place = True
+    empty_value: Any = None
+
+    def __init__(
+        self,
+        table: str = "data",
+        query: Optional[str] = None,
+        parameters: Optional[Sequence[Any]] = None,
+        order_by: Optional[Sequence[Union[int, str]]] = None,
+        asc: bool = True,
+        batch_size: int = 10000,
+        if_exists: str = "replace",
+        extension: str = ".sqlite",
+        verbose: Optional[bool] = None,
+    ):
+        """Consturct :class:`tabler.tabletypes.SQLite`.
+
+        :param str table: Name of the table in the database to read or write.
+            Default data.
+        :param query: A ``SELECT`` query giving the rows to read, in place of
+            **table**. Cannot be used to write.
+        :type query: str or None.
+        :param parameters: Values of the ``?`` parameters in **query**.
+        :type parameters: list or None.
+        :param order_by: Names or indexes of columns by which SQLite sorts
+            rows as they are read.
+        :type order_by: list(str or int) or None.
+        :param bool asc: If True rows are sorted in ascending order,
+            otherwise descending. Default True.
+        :param int batch_size: Number of rows fetched at a time. Default
+            10000.
+        :param str if_exists: What to do when writing to a table which
+            exists: 'replace' it, 'append' rows to it, or 'fail'. Default
+            replace.
+        :param str extension: Extension of file to save. Default .sqlite.
+        :param verbose: If True print status messages. If None use
+            :class:`tabler.tabletype.BaseTableType`.verbose.
+        :type verbose: bool or None.
+        :raises ValueError: If **if_exists** is not valid.
+        """
+        if if_exists not in IF_EXISTS:
+            raise ValueError(
+                "if_exists must be one of {}, not {!r}.".format(
+                    ", ".join(IF_EXISTS), if_exists
+                )
+            )
+        self.table = table
+        self.query = query
+        self.parameters = parameters
+        self.order_by = order_by
+        self.asc = asc
+        self.batch_size = batch_size
+        self.if_exists = if_exists
+        super().__init__(extension, verbose=verbose)
+
+    def connect(self, path: Union[str, Path], read_only: bool = False) -> Any:
+        """Return a :class:`sqlite3.Connection` to a database file.
+
+        :param path: Path to the database.
+        :type path: str, pathlib.Path or compatible.
+        :param bool read_only: If True open the database read only. The file
+            must exist.
+        """
+        if read_only:
+            url = pathname2url(os.path.abspath(str(path)))
+            return sqlite3.connect("file:{}?mode=ro".format(url), uri=True)
+        return sqlite3.connect(str(path))
+
+    def open_path(
+        self, path: Union[str, Path], **options: Any
+    ) -> Tuple[List[str], List[List[Any]]]:
+        """Return header and rows from file.
+
+        Options which SQLite can apply are added to the query, see
+        :mod:`tabler.tabletypes.sqlite`.
+
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        :param options: Options passed to
+            :func:`tabler.tabletypes.BaseTableType.parse_row_data`.
+        """
+        sql, parameters = self.select(self.read_header(path), options)
+        return self.parse_row_data(self.read_rows(path, sql, parameters), **options)
+
+    def read_header(self, path: Union[str, Path]) -> List[str]:
+        """Return the column names of the table or query.
+
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        """
+        connection = self.connect(path, read_only=True)
+        try:
+            cursor = connection.execute(
+                "SELECT * FROM {} LIMIT 0".format(self.source()), self._parameters()
+            )
+            return [column[0] for column in cursor.description]
+        finally:
+            connection.close()
+
+    def read_rows(
+        self,
+        path: Union[str, Path],
+        sql: Optional[str] = None,
+        parameters: Sequence[Any] = (),
+    ) -> Iterator[Sequence[Any]]:
+        """Return an iterator of the rows of a query.
+
+        Rows are fetched **batch_size** at a time.
+
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        :param sql: Query to run. If None all rows of the table or query are
+            read.
+        :type sql: str or None.
+        :param parameters: Values of the parameters in **sql**.
+        """
+        if sql is None:
+            sql, parameters = (
+                "SELECT * FROM {}".format(self.source()),
+                self._parameters(),
+            )
+        connection = self.connect(path, read_only=True)
+        try:
+            cursor = connection.execute(sql, parameters)
+            yield [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            connection.close()
+
+    def select(self, header: List[str], options: Dict[str, Any]) -> SQL:
+        """Return a query for the rows needed by **options** and its parameters.
+
+        **options** is changed so that options applied by the query are not
+        applied again by
+        :func:`tabler.tabletypes.BaseTableType.parse_row_data`.
+
+        :param header: Column names of the table or query.
+        :param options: Options passed to
+            :func:`tabler.tabletypes.BaseTableType.parse_row_data`.
+        """
+        parameters = self._parameters()
+        where = options.get("where")
+        if options.get("schema") is not None:
+            where = None
+        indexes = self._columns_to_read(header, options)
+        columns = ", ".join(quote(header[i]) for i in indexes)
+        sql = "SELECT {} FROM {}".format(columns, self.source())
+        condition = None if where is None else condition_sql(where, header)
+        if condition is not None:
+            sql += " WHERE {}".format(condition[0])
+            parameters += condition[1]
+        if self.order_by:
+            direction = "" if self.asc else " DESC"
+            sql += " ORDER BY {}".format(
+                ", ".join(
+                    quote(header[self._column_index(header, column)]) + direction
+                    for column in self.order_by
+                )
+            )
+        skiprows = options.get("skiprows")
+        if options.get("where") is None and options.get("sample") is None:
+            if skiprows is None or isinstance(skiprows, int):
+                offset = options.pop("skiprows", None) or 0
+                nrows = options.pop("nrows", None)
+                if nrows is not None or offset:
+                    limit = -1 if nrows is None else nrows
+                    sql += " LIMIT {} OFFSET {}".format(int(limit), int(offset))
+        return sql, parameters
+
+    def source(self) -> str:
+        """Return the SQL for the table or query rows are read from."""
+        if self.query is not None:
+            return "({})".format(self.query)
+        return quote(self.table)
+
+    def write(self, table: "Table", path: Union[str, Path]) -> None:
+        """Save data from :class:`tabler.Table` to file.
+
+        :param table:"Table" to save.
+        :type table: :class:`tabler.Table`
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        """
+        self.write_rows(table.header, (row.row for row in table.rows), path)
+
+    def write_rows(
+        self,
+        header: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        path: Union[str, Path],
+    ) -> int:
+        """Save a header and rows to the table in a single transaction.
+
+        :param header: Column headers.
+        :param rows: Rows to save.
+        :param path: Path to file to be opened.
+        :type path: str, pathlib.Path or compatible.
+        :return: Number of rows written.
+        :raises sqlite3.OperationalError: If the table exists and
+            **if_exists** is 'fail'.
+        """
+        table = quote(self.table)
+        columns = ", ".join(quote(name) for name in header)
+        insert = "INSERT INTO {} VALUES ({})".format(
+            table, ", ".join("?" * len(header))
+        )
+        width = len(header)
+        connection = self.connect(path)
+        try:
+            with connection:
+                connection.execute("BEGIN")
+                if self.if_exists == "replace":
+                    connection.execute("DROP TABLE IF EXISTS {}".format(table))
+                exists = "IF NOT EXISTS " if self.if_exists == "append" else ""
+                connection.execute(
+                    "CREATE TABLE {}{} ({})".format(exists, table, columns)
+                )
+                cursor = connection.executemany(
+                    insert, (self.prepare(row, width) for row in progress.track(rows))
+                )
+                count: int = max(cursor.rowcount, 0)
+        finally:
+            connection.close()
+        self.print_status("Written {} rows to file {}".format(count, path))
+        return count
+
+    def prepare(self, row: Sequence[Any], width: int) -> List[Any]:
+        """Return the values of **row** to store, padded to **width**."""
+        values = [
+            (
+                None
+                if value in self.null_values
+                else value if isinstance(value, NATIVE_TYPES) else str(value)
+            )
+            for value in row
+        ]
+        if len(values) < width:
+            values.extend([None] * (width - len(values)))
+        return values
+
+    def _parameters(self) -> List[Any]:
+        return list(self.parameters or [])
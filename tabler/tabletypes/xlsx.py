@@ -1,10 +1,11 @@
 """This module provides a Table Type for Microsft Excel (.xlsx) files."""
 
-import sys
-from typing import TYPE_CHECKING, Any, List, Tuple, Union
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Tuple, Union
 
 from openpyxl import Workbook, load_workbook
 
+from tabler import progress
+
 from .basetabletype import BaseTableType
 
 if TYPE_CHECKING:
@@ -25,7 +26,7 @@ class XLSX(BaseTableType):
     extensions: List[str] = [".xlsx"]
     empty_value: Any = None
 
-    def __init__(self, extension: str = ".xlsx", verbose: bool = True):
+    def __init__(self, extension: str = ".xlsx", verbose: Optional[bool] = None):
         """Consturct :class:`tabler.tabletypes.XLSX`.
 
         :param str extension: Extension of file to save. Default .xlsx.
@@ -35,17 +36,17 @@ class XLSX(BaseTableType):
         """
         super().__init__(extension, verbose=verbose)
 
-    def open_path(self, path: Union[str, "Path"]) -> Tuple[List[str], List[List[Any]]]:
-        """Return header and rows from file.
+    def read_rows(self, path: Union[str, "Path"]) -> Iterator[Tuple[Any, ...]]:
+        """Return an iterator of the unparsed rows in a file.
 
         :param path: Path to file to be opened.
         :type path: str, pathlib.Path or compatible.
         """
         workbook = load_workbook(filename=str(path), read_only=True)
-        worksheet = workbook.active
-        data = [[cell.value for cell in row] for row in worksheet]
-        workbook.close()
-        return self.parse_row_data(data)
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
 
     def write(self, table: "Table", path: Union[str, "Path"]) -> None:
         """Save data from :class:`tabler.Table` to file.
@@ -58,9 +59,7 @@ class XLSX(BaseTableType):
         workbook = Workbook()
         worksheet = workbook.active
         worksheet.append(table.header)
-        for row in table:
+        for row in progress.track(table):
             worksheet.append(list(row))
         workbook.save(str(path))
-        print(
-            "Written {} rows to file {}".format(len(table.rows), path), file=sys.stderr
-        )
+        self.print_status("Written {} rows to file {}".format(len(table.rows), path))
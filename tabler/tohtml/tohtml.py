@@ -5,6 +5,8 @@ from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from jinja2 import Template
 
+from tabler import progress
+
 if TYPE_CHECKING:
     from tabler.table import Table
 
@@ -34,7 +36,7 @@ class ToHTML:
         return {
             "use_header": use_header,
             "header": table.header,
-            "data": [list(row) for row in table],
+            "data": [list(row) for row in progress.track(table)],
         }
 
     def get_template(self) -> Template:
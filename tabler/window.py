@@ -0,0 +1,307 @@
+"""
+Rolling and cumulative calculations over columns.
+
+This module provides the functions used by :func:`tabler.Table.rolling` and
+:func:`tabler.Table.cumulative`.
+
+    Basic Usage::
+
+        >>> from tabler import Table
+        >>> table = Table('sales.csv', schema={'Sales': float})
+        >>> table.add_column('Average', table.rolling('Sales', 30, 'mean'))
+        >>> table.add_column('Best', table.cumulative('Sales', 'max'))
+
+Each value is calculated from the previous one in a single pass, so the time
+taken does not depend on the size of the window. Sums and counts are updated
+as cells enter and leave the window, with compensated summation so that large
+floats leaving the window do not take the precision of the others with them.
+Minimums and maximums keep a queue of
+the cells which could still become the smallest or largest, which is never
+longer than the window and in which each cell is added and removed once.
+
+If numpy is installed, columns of ints and floats are calculated with
+vectorised numpy functions instead. Install it with
+``pip install tabler[numpy]``. Integers are only calculated with numpy if
+results are exact as 64 bit floats. Rolling windows are calculated by
+splitting the column into blocks the length of the window and accumulating
+each block forwards and backwards, so every window is the combination of the
+end of one block and the start of the next. This also takes time which does
+not depend on the size of the window, and sums only add cells within a
+window's two blocks.
+
+Empty cells, None or ``""``, are skipped and their result is None.
+"""
+
+from collections import deque
+from itertools import accumulate
+from operator import add
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+#: Aggregates available for rolling windows.
+ROLLING_AGGREGATES = ("sum", "mean", "min", "max", "count")
+
+#: Aggregates available for cumulative calculations, and the functions
+#: combining the result so far with the next cell.
+CUMULATIVE_AGGREGATES: Dict[str, Callable[[Any, Any], Any]] = {
+    "sum": add,
+    "min": min,
+    "max": max,
+}
+
+#: Integers with larger sums than this are not exact as 64 bit floats.
+EXACT_LIMIT = 2**53
+
+
+def rolling(
+    values: Sequence[Any],
+    window: int,
+    agg: str = "mean",
+    min_periods: Optional[int] = None,
+    vectorise: bool = True,
+) -> List[Any]:
+    """Return an aggregate of each cell and the cells before it.
+
+    See :func:`tabler.Table.rolling`.
+
+    :param bool vectorise: If False do not use numpy.
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1.")
+    if agg not in ROLLING_AGGREGATES:
+        raise ValueError(
+            "agg must be one of {}, not {!r}.".format(ROLLING_AGGREGATES, agg)
+        )
+    if min_periods is None:
+        min_periods = window
+    elif min_periods < 0:
+        raise ValueError("min_periods must not be negative.")
+    if vectorise:
+        array = _numeric_array(values, 1 if agg in ("min", "max") else window)
+        if array is not None:
+            return _vector_rolling(*array, window, agg, min_periods)
+    if agg in ("min", "max"):
+        return _rolling_extreme(values, window, agg == "max", min_periods)
+    return _rolling_total(values, window, agg, min_periods)
+
+
+def cumulative(
+    values: Sequence[Any], agg: str = "sum", vectorise: bool = True
+) -> List[Any]:
+    """Return an aggregate of each cell and every cell before it.
+
+    See :func:`tabler.Table.cumulative`.
+
+    :param bool vectorise: If False do not use numpy.
+    """
+    if agg not in CUMULATIVE_AGGREGATES:
+        raise ValueError(
+            "agg must be one of {}, not {!r}.".format(tuple(CUMULATIVE_AGGREGATES), agg)
+        )
+    if vectorise:
+        array = _numeric_array(values, len(values) if agg == "sum" else 1)
+        if array is not None:
+            return _vector_cumulative(*array, agg)
+    func = CUMULATIVE_AGGREGATES[agg]
+    if None not in values and "" not in values:
+        return list(accumulate(values, func))
+    results: List[Any] = []
+    current: Any = None
+    for value in values:
+        if value is None or value == "":
+            results.append(None)
+            continue
+        current = value if current is None else func(current, value)
+        results.append(current)
+    return results
+
+
+def _rolling_total(
+    values: Sequence[Any], window: int, agg: str, min_periods: int
+) -> List[Any]:
+    """Return rolling sums, means or counts, updating a running total.
+
+    The total uses Neumaier's compensated summation, so that the rounding
+    error of adding and removing a large float is carried in **compensation**
+    rather than lost from the cells which remain.
+    """
+    results: List[Any] = []
+    append = results.append
+    total: Any = 0
+    compensation: Any = 0
+    count = 0
+    for index, value in enumerate(values):
+        if value is not None and value != "":
+            new_total = total + value
+            if abs(total) >= abs(value):
+                compensation += (total - new_total) + value
+            else:
+                compensation += (value - new_total) + total
+            total = new_total
+            count += 1
+        if index >= window:
+            old = values[index - window]
+            if old is not None and old != "":
+                count -= 1
+                if not count:
+                    total = compensation = 0
+                else:
+                    new_total = total - old
+                    if abs(total) >= abs(old):
+                        compensation += (total - new_total) - old
+                    else:
+                        compensation += total - (old + new_total)
+                    total = new_total
+        if count < min_periods:
+            append(None)
+        elif agg == "count":
+            append(count)
+        elif agg == "sum":
+            append(total + compensation)
+        else:
+            append((total + compensation) / count if count else None)
+    return results
+
+
+def _rolling_extreme(
+    values: Sequence[Any], window: int, maximum: bool, min_periods: int
+) -> List[Any]:
+    """Return rolling minimums or maximums using a monotonic queue.
+
+    The queue holds the index and value of cells in the window which are
+    smaller (or larger) than every cell after them, so its first value is the
+    result for the window.
+    """
+    results: List[Any] = []
+    append = results.append
+    queue: Deque[Tuple[int, Any]] = deque()
+    count = 0
+    for index, value in enumerate(values):
+        if value is not None and value != "":
+            if maximum:
+                while queue and queue[-1][1] <= value:
+                    queue.pop()
+            else:
+                while queue and queue[-1][1] >= value:
+                    queue.pop()
+            queue.append((index, value))
+            count += 1
+        if index >= window:
+            old = values[index - window]
+            if old is not None and old != "":
+                count -= 1
+            if queue and queue[0][0] <= index - window:
+                queue.popleft()
+        append(queue[0][1] if queue and count >= min_periods else None)
+    return results
+
+
+def _numeric_array(values: Sequence[Any], terms: int) -> Optional[Tuple[Any, bool]]:
+    """Return **values** as a numpy array of floats, with NaN for empty cells.
+
+    Also return True if the values are integers. Return None if numpy is not
+    installed, a value is not an int or float or sums of **terms** integers
+    may not be exact.
+    """
+    if numpy is None or not values:
+        return None
+    kinds = set(map(type, values))
+    if not kinds & {int, float} or kinds - {int, float, str, type(None)}:
+        return None
+    empty = 0
+    if str in kinds or type(None) in kinds:
+        empty = values.count(None) + values.count("")
+        values = [
+            numpy.nan if value is None or value == "" else value for value in values
+        ]
+        if str in set(map(type, values)):
+            return None
+    array = numpy.array(values, dtype=float)
+    nan = numpy.isnan(array)
+    if int(nan.sum()) != empty:
+        # NaN values are not empty cells.
+        return None
+    integers = float not in kinds
+    if integers and numpy.nanmax(numpy.abs(array)) * terms >= EXACT_LIMIT:
+        return None
+    return array, integers
+
+
+def _vector_rolling(
+    array: Any, integers: bool, window: int, agg: str, min_periods: int
+) -> List[Any]:
+    # Windows longer than the column give the same results as the column.
+    window = min(window, len(array))
+    present = ~numpy.isnan(array)
+    if present.all():
+        counts = numpy.minimum(numpy.arange(1, len(array) + 1), window)
+    else:
+        totals = numpy.cumsum(present)
+        counts = totals.copy()
+        counts[window:] -= totals[:-window]
+    if agg == "count":
+        result = counts
+    else:
+        function = {"min": numpy.fmin, "max": numpy.fmax}.get(agg, numpy.add)
+        fill = {"min": numpy.inf, "max": -numpy.inf}.get(agg, 0.0)
+        cells = numpy.where(present, array, fill)
+        result = _window_reduce(cells, window, function, fill)
+        if agg == "mean":
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                result = result / counts
+    keep = counts >= min_periods
+    if agg != "count" and agg != "sum":
+        keep &= counts > 0
+    return _to_list(result, keep, integers and agg != "mean")
+
+
+def _window_reduce(cells: Any, window: int, function: Any, fill: float) -> Any:
+    """Return **function** reduced over each window of **cells**.
+
+    The cells, after **window** - 1 cells of **fill**, are split into blocks
+    of **window** cells which are accumulated forwards and backwards. The
+    window starting at each cell is the backward total from that cell to
+    the end of its block combined with the forward total of the next block
+    up to the window's last cell.
+    """
+    length = len(cells)
+    padded = numpy.full(-(-(length + window - 1) // window) * window, fill)
+    padded[window - 1 : window - 1 + length] = cells
+    blocks = padded.reshape(-1, window)
+    forward = function.accumulate(blocks, axis=1).ravel()
+    backward = function.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    head = backward[:length]
+    tail = forward[window - 1 : window - 1 + length]
+    if function is numpy.add:
+        # Windows starting at a block are all in the backward total.
+        tail = numpy.where(numpy.arange(length) % window == 0, 0.0, tail)
+    return function(head, tail)
+
+
+def _vector_cumulative(array: Any, integers: bool, agg: str) -> List[Any]:
+    if agg == "sum":
+        result = numpy.nancumsum(array)
+    elif agg == "min":
+        result = numpy.fmin.accumulate(array)
+    else:
+        result = numpy.fmax.accumulate(array)
+    return _to_list(result, ~numpy.isnan(array), integers)
+
+
+def _to_list(result: Any, keep: Any, integers: bool) -> List[Any]:
+    """Return **result** as a list, with None where **keep** is False."""
+    if integers:
+        result = numpy.where(keep, result, 0).astype(numpy.int64)
+    start = int(keep.argmax()) if keep.any() else len(keep)
+    if keep[start:].all():
+        # Only rows before the first full window have no result.
+        values: List[Any] = result[start:].tolist()
+        return [None] * start + values
+    cells = result.astype(object)
+    cells[~keep] = None
+    values = cells.tolist()
+    return values
@@ -0,0 +1,71 @@
+"""Tests for tabler.compression module."""
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from tabler.compression import compression_of, open_file, split_extension
+
+
+class TestSplitExtension:
+    @pytest.mark.parametrize(
+        "path,expected",
+        [
+            ("table.csv", (".csv", "")),
+            ("table.csv.gz", (".csv", ".gz")),
+            ("table.CSV.BZ2", (".CSV", ".BZ2")),
+            ("table.tabler.zst", (".tabler", ".zst")),
+            ("table.gz", ("", ".gz")),
+            (Path("dir.d/table.csv.xz"), (".csv", ".xz")),
+        ],
+    )
+    def test_split_extension(self, path, expected):
+        assert split_extension(path) == expected
+
+
+class TestCompressionOf:
+    def test_from_extension(self, tmpdir):
+        assert compression_of(Path(str(tmpdir)) / "table.csv.bz2") == "bz2"
+
+    def test_uncompressed(self, tmpdir):
+        path = Path(str(tmpdir)) / "table.csv"
+        path.write_text("A,B\n")
+        assert compression_of(path) is None
+
+    def test_from_magic_number(self, tmpdir):
+        path = Path(str(tmpdir)) / "table.csv"
+        path.write_bytes(gzip.compress(b"A,B\n"))
+        assert compression_of(path) == "gzip"
+
+    def test_magic_number_not_checked_for_writing(self, tmpdir):
+        path = Path(str(tmpdir)) / "table.csv"
+        path.write_bytes(gzip.compress(b"A,B\n"))
+        assert compression_of(path, "w") is None
+
+    def test_missing_file(self, tmpdir):
+        assert compression_of(Path(str(tmpdir)) / "missing.csv") is None
+
+
+class TestOpenFile:
+    @pytest.mark.parametrize("extension", [".gz", ".bz2", ".xz"])
+    def test_text_round_trip(self, tmpdir, extension):
+        path = Path(str(tmpdir)) / "table.csv{}".format(extension)
+        with open_file(path, "w", encoding="utf-8") as f:
+            f.write("A,B\né,2\n")
+        assert path.read_bytes()[:2] != b"A,"
+        with open_file(path, "r", encoding="utf-8") as f:
+            assert f.read() == "A,B\né,2\n"
+
+    def test_binary_round_trip(self, tmpdir):
+        path = Path(str(tmpdir)) / "table.tabler.gz"
+        with open_file(path, "wb") as f:
+            f.write(b"\x00\x01")
+        with open_file(path, "rb") as f:
+            assert f.read() == b"\x00\x01"
+
+    def test_uncompressed(self, tmpdir):
+        path = Path(str(tmpdir)) / "table.csv"
+        with open_file(path, "w") as f:
+            f.write("A,B\n")
+        assert path.read_text() == "A,B\n"
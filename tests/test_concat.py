@@ -0,0 +1,64 @@
+"""Tests for tabler.concat module."""
+
+import pytest
+
+from tabler import CSV, Table, concat
+
+
+def rows(table):
+    return [list(row) for row in table]
+
+
+class TestConcat:
+    def test_same_header(self):
+        first = Table(header=["A", "B"], data=[[1, 2]])
+        second = Table(header=["A", "B"], data=[[3, 4], [5, 6]])
+        table = concat([first, second])
+        assert table.header == ("A", "B")
+        assert rows(table) == [[1, 2], [3, 4], [5, 6]]
+        assert table[2]["B"] == 6
+
+    def test_same_header_shares_rows(self):
+        first = Table(header=["A"], data=[[1]])
+        table = concat([first, first])
+        assert table._storage()[0].row is first._storage()[0].row
+
+    def test_changes_are_not_shared(self):
+        first = Table(header=["A"], data=[[1]])
+        table = concat([first])
+        table[0]["A"] = 2
+        first[0]["A"] = 3
+        assert rows(table) == [[2]]
+        assert rows(first) == [[3]]
+
+    def test_union(self):
+        first = Table(header=["A", "B"], data=[[1, 2]])
+        second = Table(header=["C", "A"], data=[[3, 4]])
+        table = concat([first, second])
+        assert table.header == ("A", "B", "C")
+        assert rows(table) == [[1, 2, None], [4, None, 3]]
+        assert table[1]["C"] == 3
+
+    def test_union_uses_empty_value_of_first_table(self):
+        first = Table(header=["A"], data=[["1"]], table_type=CSV())
+        second = Table(header=["B"], data=[["2"]])
+        assert rows(concat([first, second])) == [["1", ""], ["", "2"]]
+
+    def test_intersection(self):
+        first = Table(header=["A", "B", "C"], data=[[1, 2, 3]])
+        second = Table(header=["C", "A"], data=[[4, 5]])
+        table = concat([first, second], align="intersection")
+        assert table.header == ("A", "C")
+        assert rows(table) == [[1, 3], [5, 4]]
+
+    def test_accepts_iterator(self):
+        tables = (Table(header=["A"], data=[[i]]) for i in range(3))
+        assert rows(concat(tables)) == [[0], [1], [2]]
+
+    def test_invalid_alignment(self):
+        with pytest.raises(ValueError):
+            concat([Table(header=["A"], data=[])], align="outer")
+
+    def test_no_tables(self):
+        with pytest.raises(ValueError):
+            concat([])
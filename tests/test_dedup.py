@@ -0,0 +1,58 @@
+"""Tests for tabler.dedup module."""
+
+import pytest
+
+from tabler import CSV
+from tabler.dedup import BloomFilter, unique, unique_rows
+
+
+class TestBloomFilter:
+    def test_add(self):
+        bloom = BloomFilter(100)
+        assert bloom.add(("a", 1)) is False
+        assert bloom.add(("a", 1)) is True
+        assert ("a", 1) in bloom
+        assert ("b", 1) not in bloom
+
+    def test_error_rate(self):
+        bloom = BloomFilter(10000, error_rate=0.01)
+        for i in range(10000):
+            bloom.add(i)
+        assert all(i in bloom for i in range(10000))
+        false_positives = sum(i in bloom for i in range(10000, 20000))
+        assert false_positives < 300
+
+    @pytest.mark.parametrize("capacity,error_rate", [(0, 0.01), (10, 0), (10, 1)])
+    def test_invalid_arguments(self, capacity, error_rate):
+        with pytest.raises(ValueError):
+            BloomFilter(capacity, error_rate)
+
+
+class TestUnique:
+    def test_unique(self):
+        assert list(unique("abAcB", key=str.lower)) == ["a", "b", "c"]
+
+    def test_unique_with_capacity(self):
+        assert list(unique("abAcB", key=str.lower, capacity=10)) == ["a", "b", "c"]
+
+    def test_unique_rows(self):
+        rows = [["a", 1], ["b", 1], ["a", 1], ["a", 2]]
+        assert list(unique_rows(rows)) == [["a", 1], ["b", 1], ["a", 2]]
+
+    def test_unique_rows_columns(self):
+        rows = [["a", 1], ["b", 1], ["a", 2], ["c"]]
+        assert list(unique_rows(rows, columns=[1])) == [["a", 1], ["a", 2], ["c"]]
+
+    def test_unique_rows_is_lazy(self):
+        rows = iter([["a"], ["a"], ["b"]])
+        deduplicated = unique_rows(rows)
+        assert next(deduplicated) == ["a"]
+        assert next(rows) == ["a"]
+
+    def test_unique_rows_from_csv(self, tmpdir):
+        path = str(tmpdir.join("dedup.csv"))
+        with open(path, "w") as f:
+            f.write("A,B\nx,1\ny,2\nx,1\n")
+        rows = CSV().read_rows(path)
+        assert next(rows) == ["A", "B"]
+        assert list(unique_rows(rows, capacity=100)) == [["x", "1"], ["y", "2"]]
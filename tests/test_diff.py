@@ -0,0 +1,141 @@
+"""Tests for tabler.diff module."""
+
+import pytest
+
+from tabler import CSV, Snapshot, Table, external_sort
+from tabler.diff import ADDED, CHANGED, REMOVED, diff_sorted
+
+OLD = [["1", "Red", "5"], ["2", "Green", "3"], ["3", "Blue", "7"], ["4", "Pink", ""]]
+NEW = [["1", "Red", "5"], ["3", "Navy", "8"], ["4", "Pink", ""], ["5", "Grey", "1"]]
+
+
+def old_table():
+    return Table(header=["Id", "Name", "Qty"], data=OLD)
+
+
+def new_table():
+    return Table(header=["Qty", "Id", "Name"], data=[[r[2], r[0], r[1]] for r in NEW])
+
+
+def write_csv(tmpdir, name, header, rows):
+    path = str(tmpdir.join(name))
+    Table(header=header, data=rows).write(path, CSV(verbose=False))
+    return path
+
+
+class TestTableDiff:
+    def test_diff(self):
+        diff = old_table().diff(new_table(), key="Id")
+        assert [list(row) for row in diff.added] == [["1", "5", "Grey"]]
+        assert diff.added.header == ("Qty", "Id", "Name")
+        assert [list(row) for row in diff.removed] == [["2", "Green", "3"]]
+        assert len(diff.changed) == 1
+        change = diff.changed[0]
+        assert change.kind == CHANGED
+        assert change.key == ("3",)
+        assert change.old["Name"] == "Blue"
+        assert change.new["Name"] == "Navy"
+        assert change.columns == {"Name": ("Blue", "Navy"), "Qty": ("7", "8")}
+        assert diff.column_changes == {"Name": 1, "Qty": 1}
+        assert diff
+
+    def test_no_differences(self):
+        diff = old_table().diff(old_table(), key=["Id", "Name"])
+        assert not diff
+        assert diff.changed == []
+
+    def test_compared_columns(self):
+        diff = old_table().diff(new_table(), key=[0], columns=["Qty"])
+        assert [change.columns for change in diff.changed] == [{"Qty": ("7", "8")}]
+
+    def test_changes_with_equal_hashes(self):
+        old = Table(header=["Id", "A", "B"], data=[["1", -1, 0]])
+        new = Table(header=["Id", "A", "B"], data=[["1", -2, 2**61 - 1]])
+        assert hash((-1, 0)) == hash((-2, 2**61 - 1))
+        diff = old.diff(new, key="Id")
+        assert [change.columns for change in diff.changed] == [
+            {"A": (-1, -2), "B": (0, 2**61 - 1)}
+        ]
+
+    def test_results_do_not_change_tables(self):
+        old = old_table()
+        diff = old.diff(new_table(), key="Id")
+        diff.removed[0]["Name"] = "Changed"
+        assert old[1]["Name"] == "Green"
+
+    def test_changes_do_not_share_rows(self):
+        old, new = old_table(), new_table()
+        change = old.diff(new, key="Id").changed[0]
+        change.old["Name"] = "Changed"
+        change.new["Name"] = "Changed"
+        assert old[2]["Name"] == "Blue"
+        assert new[1]["Name"] == "Navy"
+        old[2]["Qty"] = "0"
+        assert change.old["Qty"] == "7"
+
+    def test_repeated_key(self):
+        repeated = Table(header=["Id", "Name"], data=[["1", "a"], ["1", "b"]])
+        with pytest.raises(ValueError):
+            repeated.diff(new_table(), key="Id")
+        with pytest.raises(ValueError):
+            old_table().diff(repeated, key="Id")
+
+    def test_missing_column(self):
+        with pytest.raises(ValueError):
+            old_table().diff(new_table(), key="Id", columns=["Price"])
+
+
+class TestDiffSorted:
+    def test_diff_sorted(self, tmpdir):
+        old = write_csv(tmpdir, "old.csv", ["Id", "Name", "Qty"], OLD)
+        new = write_csv(tmpdir, "new.csv", ["Id", "Name", "Qty"], NEW)
+        changes = list(diff_sorted(old, new, key="Id"))
+        assert [(change.kind, change.key) for change in changes] == [
+            (REMOVED, ("2",)),
+            (CHANGED, ("3",)),
+            (ADDED, ("5",)),
+        ]
+        assert changes[0].old == ["2", "Green", "3"]
+        assert changes[0].new is None
+        assert changes[1].columns == {"Name": ("Blue", "Navy"), "Qty": ("7", "8")}
+        assert changes[2].new == ["5", "Grey", "1"]
+
+    def test_diff_external_sorted_files(self, tmpdir):
+        rows = [[str(i), "x"] for i in range(20)]
+        old = write_csv(tmpdir, "old.csv", ["Id", "Name"], rows[::-1])
+        new = write_csv(tmpdir, "new.csv", ["Id", "Name"], rows[2:] + [["20", "y"]])
+        for path in (old, new):
+            external_sort(path, path + ".sorted.csv", "Id", schema={"Id": int})
+        changes = diff_sorted(
+            old + ".sorted.csv", new + ".sorted.csv", "Id", schema={"Id": int}
+        )
+        assert [(change.kind, change.key) for change in changes] == [
+            (REMOVED, (0,)),
+            (REMOVED, (1,)),
+            (ADDED, (20,)),
+        ]
+
+    def test_files_of_different_types(self, tmpdir):
+        old = write_csv(tmpdir, "old.csv", ["Id", "Name", "Qty"], OLD[:3])
+        new = str(tmpdir.join("new.tabler"))
+        table = Table(header=["Id", "Name", "Qty"], data=NEW[:2] + NEW[3:])
+        table.write(new, Snapshot(verbose=False))
+        changes = list(diff_sorted(old, new, key="Id", table_type=CSV(verbose=False)))
+        assert [(change.kind, change.key) for change in changes] == [
+            (REMOVED, ("2",)),
+            (CHANGED, ("3",)),
+            (ADDED, ("5",)),
+        ]
+
+    def test_unconverted_cells(self, tmpdir):
+        rows = [["1", "a"], ["2", "b"], ["x", "c"]]
+        old = write_csv(tmpdir, "old.csv", ["Id", "Name"], rows)
+        new = write_csv(tmpdir, "new.csv", ["Id", "Name"], rows[:1] + rows[2:])
+        changes = list(diff_sorted(old, new, key="Id", schema={"Id": int}))
+        assert [(change.kind, change.key) for change in changes] == [(REMOVED, (2,))]
+
+    def test_unsorted_file(self, tmpdir):
+        old = write_csv(tmpdir, "old.csv", ["Id"], [["2"], ["1"]])
+        new = write_csv(tmpdir, "new.csv", ["Id"], [["1"], ["2"]])
+        with pytest.raises(ValueError):
+            list(diff_sorted(old, new, key="Id"))
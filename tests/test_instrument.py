@@ -0,0 +1,81 @@
+"""Tests for tabler.instrument module."""
+
+import logging
+
+import pytest
+
+from tabler import CSV, Table, instrument
+
+
+@pytest.fixture
+def events():
+    received = []
+    with instrument.subscribed(received.append):
+        yield received
+
+
+def csv_file(tmpdir, rows=3):
+    path = str(tmpdir.join("events.csv"))
+    with open(path, "w") as f:
+        f.write("A,B\n")
+        for i in range(rows):
+            f.write("{},x\n".format(i))
+    return path
+
+
+class TestInstrument:
+    def test_no_events_without_handlers(self, tmpdir):
+        assert instrument.handlers == {}
+        assert instrument.current_reading() is None
+        Table(csv_file(tmpdir))
+
+    def test_open_events(self, tmpdir, events):
+        path = csv_file(tmpdir)
+        Table(path, nrows=2)
+        assert [event.phase for event in events] == ["open", "parse", "load"]
+        open_event, parse_event, load_event = events
+        assert open_event.table_type == "CSV"
+        assert open_event.path == path
+        assert open_event.rows == 2
+        assert open_event.bytes == 16
+        assert parse_event.rows == 2
+        assert load_event.rows == 2
+        assert all(event.elapsed >= 0 for event in events)
+        assert all(event.peak is None for event in events)
+        assert instrument.current_reading() is None
+
+    def test_write_event(self, tmpdir, events):
+        path = tmpdir.join("written.csv")
+        Table(header=["A"], data=[[1], [2]]).write(str(path), CSV(verbose=False))
+        (event,) = events
+        assert event.phase == "write"
+        assert event.rows == 2
+        assert event.bytes == path.size()
+
+    def test_trace_memory(self, tmpdir):
+        received = []
+        with instrument.subscribed(received.append, trace_memory=True):
+            Table(csv_file(tmpdir, rows=1000))
+        parse_event = received[1]
+        assert parse_event.phase == "parse"
+        assert parse_event.peak > 0
+        assert received[0].peak is None
+
+    def test_no_events_on_error(self, tmpdir, events):
+        with pytest.raises(ValueError):
+            Table(csv_file(tmpdir), columns=["C"])
+        assert events == []
+        assert instrument.current_reading() is None
+
+    def test_unsubscribe(self):
+        handler = instrument.subscribe(print)
+        assert instrument.handlers == {print: False}
+        instrument.unsubscribe(handler)
+        assert instrument.handlers == {}
+
+    def test_log(self, tmpdir, caplog):
+        with caplog.at_level(logging.INFO, logger="tabler"):
+            with instrument.subscribed(instrument.log):
+                Table(csv_file(tmpdir))
+        assert len(caplog.records) == 3
+        assert caplog.records[0].getMessage().startswith("open CSV ")
@@ -0,0 +1,97 @@
+"""Tests for tabler.parallel module."""
+
+import threading
+
+import pytest
+
+from tabler import CSV, Table
+from tabler.parallel import map_values
+
+
+def numbers(count=100):
+    return Table(
+        header=["Id", "Name"],
+        data=[[i, "n{}".format(i)] for i in range(count)],
+        table_type=CSV(),
+    )
+
+
+def double_id(row):
+    return [row["Id"] * 2, row["Name"].upper()]
+
+
+def square(value):
+    return value * value
+
+
+class TestMap:
+    @pytest.mark.parametrize("processes", [False, True])
+    def test_map(self, processes):
+        table = numbers()
+        mapped = table.map(double_id, workers=3, chunksize=7, processes=processes)
+        assert mapped.header == ("Id", "Name")
+        assert [list(row) for row in mapped] == [
+            [i * 2, "N{}".format(i)] for i in range(100)
+        ]
+        assert mapped.table_type is table.table_type
+        assert table[1]["Id"] == 1
+
+    def test_map_with_header(self):
+        mapped = numbers(3).map(lambda row: [row["Name"]], workers=1, header=["N"])
+        assert mapped.header == ("N",)
+        assert mapped.get_column("N") == ["n0", "n1", "n2"]
+
+    def test_map_empty_table(self):
+        mapped = Table(header=["A"], data=[]).map(double_id, processes=True)
+        assert len(mapped) == 0
+
+    def test_map_uses_threads(self):
+        names = set()
+
+        def thread_name(row):
+            names.add(threading.current_thread().name)
+            return list(row)
+
+        numbers().map(thread_name, workers=2, chunksize=10)
+        assert threading.current_thread().name not in names
+
+    def test_map_error(self):
+        with pytest.raises(KeyError):
+            numbers().map(lambda row: [row["Missing"]], workers=2)
+
+
+class TestApplyColumn:
+    @pytest.mark.parametrize("processes", [False, True])
+    def test_apply_column(self, processes):
+        table = numbers()
+        table.apply_column("Id", square, workers=2, processes=processes)
+        assert table.get_column("Id") == [i * i for i in range(100)]
+
+    def test_apply_column_to_new_column(self):
+        table = numbers(5)
+        table.apply_column(0, square, workers=2, chunksize=2, name="Square")
+        assert table.header == ("Id", "Name", "Square")
+        assert table.get_column("Square") == [0, 1, 4, 9, 16]
+        assert table.get_column("Id") == [0, 1, 2, 3, 4]
+
+    def test_apply_column_does_not_change_copies(self):
+        table = numbers(5)
+        copy = table.copy()
+        table.apply_column("Id", square, workers=1)
+        assert copy.get_column("Id") == [0, 1, 2, 3, 4]
+
+    def test_missing_column(self):
+        with pytest.raises(ValueError):
+            numbers().apply_column("Missing", square)
+
+
+class TestMapValues:
+    def test_order_is_kept(self):
+        assert map_values(square, range(50), workers=4, chunksize=3) == [
+            i * i for i in range(50)
+        ]
+
+    @pytest.mark.parametrize("options", [{"workers": 0}, {"chunksize": 0}])
+    def test_invalid_options(self, options):
+        with pytest.raises(ValueError):
+            map_values(square, [1, 2], **options)
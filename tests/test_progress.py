@@ -0,0 +1,134 @@
+"""Tests for tabler.progress module."""
+
+import pytest
+
+from tabler import CSV, XLSX, SQLite, Table, progress
+from tabler.exceptions import Cancelled
+from tabler.progress import CancelToken, Tracker
+
+
+@pytest.fixture(autouse=True)
+def no_interval(monkeypatch):
+    monkeypatch.setattr(progress, "INTERVAL", 0)
+
+
+def large_table(rows=2500):
+    return Table(header=["A", "B"], data=[[i, "x"] for i in range(rows)])
+
+
+class TestCancelToken:
+    def test_cancel(self):
+        token = CancelToken()
+        assert token.cancelled is False
+        token.raise_if_cancelled()
+        token.cancel()
+        assert token.cancelled is True
+        with pytest.raises(Cancelled):
+            token.raise_if_cancelled()
+
+
+class TestTracker:
+    def test_wrap_counts_in_chunks(self):
+        reports = []
+        tracker = Tracker("read", reports.append)
+        assert list(tracker.wrap(range(2500), skip=1)) == list(range(2500))
+        assert [report.rows for report in reports] == [0, 1000, 2000]
+        assert tracker.rows == 2499
+
+    def test_track_without_tracker(self):
+        items = [1, 2]
+        assert progress.track(items) is items
+        assert progress.current() is None
+
+    def test_track_in_tracking(self):
+        tracker = Tracker("write", total_rows=3)
+        with tracker.tracking():
+            assert progress.current() is tracker
+            assert list(progress.track("abc")) == ["a", "b", "c"]
+        assert tracker.rows == 3
+        assert progress.current() is None
+
+
+class TestProgress:
+    def test_read_progress(self, tmpdir):
+        path = str(tmpdir.join("progress.csv"))
+        large_table().write(path, CSV(verbose=False))
+        reports = []
+        table = Table(path, progress=reports.append)
+        assert len(table) == 2500
+        assert reports[-1].phase == "read"
+        assert reports[-1].rows == 2500
+        assert (
+            reports[-1].bytes
+            == reports[-1].total_bytes
+            == tmpdir.join("progress.csv").size()
+        )
+        assert [report.rows for report in reports[:-1]] == [0, 0, 1000, 2000]
+
+    def test_cancel_read(self, tmpdir):
+        path = str(tmpdir.join("progress.csv"))
+        large_table().write(path, CSV(verbose=False))
+        token = CancelToken()
+
+        def cancel_after_first_chunk(report):
+            if report.rows >= 1000:
+                token.cancel()
+
+        with pytest.raises(Cancelled):
+            Table(path, progress=cancel_after_first_chunk, cancel=token)
+        assert progress.current() is None
+
+    def test_write_progress(self, tmpdir):
+        reports = []
+        large_table().write(
+            str(tmpdir.join("progress.xlsx")), XLSX(verbose=False), reports.append
+        )
+        assert [report.rows for report in reports] == [0, 1000, 2000, 2500]
+        assert all(report.total_rows == 2500 for report in reports)
+
+    def test_cancel_write_removes_file(self, tmpdir):
+        token = CancelToken()
+        token.cancel()
+        path = tmpdir.join("progress.csv")
+        with pytest.raises(Cancelled):
+            large_table().write(str(path), CSV(verbose=False), cancel=token)
+        assert not path.exists()
+        assert tmpdir.listdir() == []
+
+    def test_cancel_write_keeps_existing_file(self, tmpdir):
+        path = str(tmpdir.join("progress.csv"))
+        Table(header=["A"], data=[["old"]]).write(path, CSV(verbose=False))
+        token = CancelToken()
+        with pytest.raises(Cancelled):
+            large_table().write(
+                path, CSV(verbose=False), lambda report: token.cancel(), token
+            )
+        assert [list(row) for row in Table(path)] == [["old"]]
+        assert len(tmpdir.listdir()) == 1
+
+    def test_cancel_sqlite_write_rolls_back(self, tmpdir):
+        path = str(tmpdir.join("progress.sqlite"))
+        Table(header=["A"], data=[["old"]]).write(path, SQLite(verbose=False))
+        Table(header=["B"], data=[["other"]]).write(
+            path, SQLite(table="other", verbose=False)
+        )
+        token = CancelToken()
+
+        def cancel_after_first_chunk(report):
+            if report.rows:
+                token.cancel()
+
+        with pytest.raises(Cancelled):
+            large_table().write(
+                path, SQLite(verbose=False), cancel_after_first_chunk, token
+            )
+        assert [list(row) for row in Table(path)] == [["old"]]
+        assert len(Table(path, SQLite(table="other"))) == 1
+
+    def test_cancel_sqlite_write_removes_new_file(self, tmpdir):
+        path = tmpdir.join("progress.sqlite")
+        token = CancelToken()
+        token.cancel()
+        with pytest.raises(Cancelled):
+            large_table().write(str(path), SQLite(verbose=False), cancel=token)
+        assert not path.exists()
@@ -0,0 +1,120 @@
+"""Tests for tabler.query module."""
+
+import pytest
+
+from tabler import Table, where
+from tabler.tablerow import TableRow
+
+HEADER = ("Name", "Qty", "Colour")
+
+
+def matches(condition, cells):
+    return condition.compile(HEADER)(cells)
+
+
+class TestWhere:
+    @pytest.mark.parametrize(
+        "operator,value,expected",
+        [
+            ("==", 5, True),
+            ("!=", 5, False),
+            ("<", 6, True),
+            ("<=", 5, True),
+            (">", 5, False),
+            (">=", 5, True),
+            ("in", (4, 5), True),
+            ("not in", (4, 5), False),
+        ],
+    )
+    def test_operators(self, operator, value, expected):
+        assert matches(where("Qty", operator, value), ["A", 5, "Red"]) is expected
+
+    def test_invalid_operator_raises(self):
+        with pytest.raises(ValueError):
+            where("Qty", "=>", 5)
+
+    def test_text_is_compared_as_number(self):
+        condition = where("Qty", ">", 10)
+        assert matches(condition, ["A", "15", "Red"]) is True
+        assert matches(condition, ["A", "9", "Red"]) is False
+
+    def test_uncomparable_cells_do_not_match(self):
+        condition = where("Qty", ">", 10)
+        assert matches(condition, ["A", "many", "Red"]) is False
+        assert matches(condition, ["A", None, "Red"]) is False
+
+    def test_uncomparable_cells_are_not_equal(self):
+        condition = where("Qty", "!=", 1)
+        for cell in ("", "many", None):
+            assert matches(condition, ["A", cell, "Red"]) is True
+            assert matches(condition, ["A", cell, "Red"]) is matches(
+                ~where("Qty", "==", 1), ["A", cell, "Red"]
+            )
+        assert matches(condition, ["A", "1", "Red"]) is False
+
+    def test_integer_text_is_compared_as_int(self):
+        value = 2**60 + 1
+        assert matches(where("Qty", "==", value), ["A", str(value), "Red"]) is True
+        assert matches(where("Qty", "==", value), ["A", str(2**60), "Red"]) is False
+        assert matches(where("Qty", ">", 2), ["A", "2.5", "Red"]) is True
+
+    def test_column_by_index(self):
+        assert matches(where(2, "==", "Red"), ["A", 5, "Red"]) is True
+
+    def test_missing_column_raises(self):
+        with pytest.raises(ValueError):
+            where("Size", "==", 1).compile(HEADER)
+
+    def test_short_rows_use_default(self):
+        predicate = where("Colour", "==", "").compile(HEADER, default="")
+        assert predicate(["A", 5]) is True
+
+    def test_converters(self):
+        predicate = where("Qty", "==", "5").compile(HEADER, [str, str, str])
+        assert predicate(["A", 5, "Red"]) is True
+
+    def test_and(self):
+        condition = where("Qty", ">", 1) & where("Colour", "==", "Red")
+        assert matches(condition, ["A", 5, "Red"]) is True
+        assert matches(condition, ["A", 5, "Blue"]) is False
+
+    def test_or(self):
+        condition = where("Qty", ">", 10) | where("Colour", "==", "Red")
+        assert matches(condition, ["A", 5, "Red"]) is True
+        assert matches(condition, ["A", 5, "Blue"]) is False
+
+    def test_not(self):
+        assert matches(~where("Colour", "==", "Red"), ["A", 5, "Red"]) is False
+
+    def test_columns(self):
+        condition = where("Qty", ">", 10) & ~where("Colour", "==", "Red")
+        assert condition.columns == ["Qty", "Colour"]
+
+    def test_call_with_table_row(self):
+        row = TableRow(["A", 5, "Red"], HEADER)
+        assert where("Qty", "==", 5)(row) is True
+
+    def test_repr(self):
+        condition = where("Qty", ">", 10) | ~where("Colour", "==", "Red")
+        assert (
+            repr(condition) == "(where('Qty', '>', 10) | ~where('Colour', '==', 'Red'))"
+        )
+
+
+class TestFilter:
+    def test_filter_with_condition(self):
+        table = Table(header=HEADER, data=[["A", 5, "Red"], ["B", 15, "Blue"]])
+        filtered = table.filter(where("Qty", ">", 10))
+        assert [list(row) for row in filtered] == [["B", 15, "Blue"]]
+        assert len(table) == 2
+
+    def test_filter_with_function(self):
+        table = Table(header=HEADER, data=[["A", 5, "Red"], ["B", 15, "Blue"]])
+        filtered = table.filter(lambda row: row["Colour"] == "Red")
+        assert [list(row) for row in filtered] == [["A", 5, "Red"]]
+
+    def test_changing_filtered_table_does_not_change_table(self):
+        table = Table(header=HEADER, data=[["A", 5, "Red"], ["B", 15, "Blue"]])
+        filtered = table.filter(where("Qty", ">", 10))
+        filtered[0]["Qty"] = 1
+        assert table[1]["Qty"] == 15
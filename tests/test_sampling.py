@@ -0,0 +1,45 @@
+"""Tests for tabler.sampling module."""
+
+import random
+
+from tabler.sampling import bernoulli_sample, reservoir_sample
+
+
+class TestReservoirSample:
+    def test_sample_size(self):
+        sample = reservoir_sample(range(1000), 10, random.Random(1))
+        assert len(sample) == 10
+        assert len(set(sample)) == 10
+
+    def test_sample_keeps_original_order(self):
+        sample = reservoir_sample(range(1000), 50, random.Random(2))
+        assert sample == sorted(sample)
+
+    def test_sample_larger_than_input(self):
+        assert reservoir_sample(range(5), 10) == [0, 1, 2, 3, 4]
+
+    def test_sample_of_zero(self):
+        assert reservoir_sample(range(5), 0) == []
+
+    def test_sample_is_repeatable_with_seed(self):
+        first = reservoir_sample(range(1000), 10, random.Random(3))
+        second = reservoir_sample(range(1000), 10, random.Random(3))
+        assert first == second
+
+    def test_sample_is_uniform(self):
+        generator = random.Random(4)
+        counts = [0] * 10
+        for _ in range(2000):
+            for item in reservoir_sample(range(10), 3, generator):
+                counts[item] += 1
+        assert all(500 < count < 700 for count in counts)
+
+
+class TestBernoulliSample:
+    def test_fraction(self):
+        sample = list(bernoulli_sample(range(10000), 0.1, random.Random(5)))
+        assert 800 < len(sample) < 1200
+        assert sample == sorted(sample)
+
+    def test_fraction_of_one_keeps_everything(self):
+        assert list(bernoulli_sample(range(10), 1.0)) == list(range(10))
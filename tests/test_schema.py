@@ -0,0 +1,111 @@
+"""Tests for tabler.schema module."""
+
+import datetime
+import decimal
+import pickle
+
+import pytest
+
+from tabler import Schema, Table
+from tabler.exceptions import ConversionError
+from tabler.schema import to_bool, to_date, to_datetime
+
+
+class TestConverters:
+    @pytest.mark.parametrize(
+        "value,expected",
+        [("true", True), (" No ", False), ("1", True), (0, False), (True, True)],
+    )
+    def test_to_bool(self, value, expected):
+        assert to_bool(value) is expected
+
+    def test_to_bool_invalid(self):
+        with pytest.raises(ValueError):
+            to_bool("maybe")
+
+    def test_to_date(self):
+        assert to_date("2024-02-29") == datetime.date(2024, 2, 29)
+        assert to_date(datetime.datetime(2024, 1, 2, 3)) == datetime.date(2024, 1, 2)
+
+    def test_to_datetime(self):
+        assert to_datetime("2024-01-02T03:04:05") == datetime.datetime(
+            2024, 1, 2, 3, 4, 5
+        )
+
+
+class TestSchema:
+    @pytest.mark.parametrize(
+        "column_type,value,expected",
+        [
+            (int, "5", 5),
+            ("int", "5", 5),
+            (float, "1.5", 1.5),
+            ("decimal", "1.10", decimal.Decimal("1.10")),
+            (decimal.Decimal, 1.1, decimal.Decimal("1.1")),
+            ("iso-date", "2024-01-02", datetime.date(2024, 1, 2)),
+            (datetime.date, "2024-01-02", datetime.date(2024, 1, 2)),
+            ("bool", "yes", True),
+            (str.upper, "a", "A"),
+        ],
+    )
+    def test_types(self, column_type, value, expected):
+        converters = Schema({"A": column_type}).compile(["A"])
+        assert converters[0](value) == expected
+
+    def test_unknown_type(self):
+        with pytest.raises(ValueError):
+            Schema({"A": "colour"})
+
+    def test_compile(self):
+        converters = Schema({"B": int, -1: float}).compile(["A", "B", "C"])
+        assert converters == [None, int, float]
+
+    def test_compile_missing_column(self):
+        with pytest.raises(ValueError):
+            Schema({"D": int}).compile(["A"])
+        with pytest.raises(IndexError):
+            Schema({1: int}).compile(["A"])
+
+    def test_row_converter_collects_errors(self):
+        schema = Schema({"A": int, "B": "iso-date"})
+        convert = schema.row_converter(["A", "B"])
+        rows = [convert(["1", "x"]), convert(["y", None]), convert([""])]
+        assert rows == [[1, "x"], ["y", None], [""]]
+        assert [(e.row, e.column, e.value) for e in schema.errors] == [
+            (0, "B", "x"),
+            (1, "A", "y"),
+        ]
+
+    def test_copy_has_own_errors(self):
+        schema = Schema({"A": int})
+        schema.row_converter(["A"])(["x"])
+        assert Schema(schema).errors == []
+        assert Schema(schema).types == {"A": int}
+
+    def test_conversion_error_can_be_pickled(self):
+        error = ConversionError(1, "A", "x", ValueError("bad"))
+        copy = pickle.loads(pickle.dumps(error))
+        assert (copy.row, copy.column, str(copy)) == (1, "A", str(error))
+
+
+class TestTableSchema:
+    def test_load_with_schema(self):
+        table = Table(
+            header=["Qty", "Date"],
+            data=[["1", "2024-01-02"], ["x", ""]],
+            schema={"Qty": int, "Date": "iso-date"},
+        )
+        assert list(table[0]) == [1, datetime.date(2024, 1, 2)]
+        assert list(table[1]) == ["x", None]
+        assert [(error.row, error.column) for error in table.errors] == [(1, "Qty")]
+
+    def test_table_without_schema_has_no_errors(self):
+        assert Table(header=["A"], data=[["1"]]).errors == ()
+
+    def test_open_with_schema(self, tmpdir):
+        path = str(tmpdir.join("schema.csv"))
+        Table(header=["Qty", "Price"], data=[["1", "1.5"], ["2", "x"]]).write(path)
+        table = Table(path, schema={"Qty": int, "Price": float})
+        assert [list(row) for row in table] == [[1, 1.5], [2, "x"]]
+        assert len(table.errors) == 1
+        assert table.errors[0].row == 1
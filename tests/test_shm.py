@@ -0,0 +1,81 @@
+"""Tests for tabler.shm module."""
+
+import pickle
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from tabler import SharedTable, Table, where
+
+HEADER = ["Id", "Name", "Price", "Stock"]
+DATA = [[1, "Red", 1.5, True], [2, "Green", None, False], [3, None, 0.25, None]]
+
+
+def shared_rows(shared):
+    return [list(row) for row in shared.load()]
+
+
+class TestSharedTable:
+    def test_create_and_load(self):
+        with SharedTable.create(Table(header=HEADER, data=DATA)) as shared:
+            assert len(shared) == 3
+            assert shared.header == tuple(HEADER)
+            table = shared.load()
+            assert table.header == tuple(HEADER)
+            assert [list(row) for row in table] == DATA
+            table[0]["Name"] = "Pink"
+            assert shared.load()[0]["Name"] == "Red"
+
+    def test_compressed(self):
+        with SharedTable.create(Table(header=HEADER, data=DATA), True) as shared:
+            assert shared_rows(shared) == DATA
+
+    def test_load_options(self):
+        with SharedTable.create(Table(header=HEADER, data=DATA)) as shared:
+            table = shared.load(columns=["Name", "Id"], skiprows=1, nrows=1)
+            assert [list(row) for row in table] == [["Green", 2]]
+            table = shared.load(where=where("Price", "<", 1))
+            assert [row["Id"] for row in table] == [3]
+
+    def test_attach_by_name(self):
+        with SharedTable.create(Table(header=HEADER, data=DATA)) as shared:
+            with SharedTable(shared.name) as attached:
+                assert not attached.owner
+                assert shared_rows(attached) == DATA
+            assert shared_rows(shared) == DATA
+
+    def test_pickle_sends_name(self):
+        with SharedTable.create(Table(header=HEADER, data=DATA)) as shared:
+            data = pickle.dumps(shared)
+            assert len(data) < 100
+            attached = pickle.loads(data)
+            assert attached.name == shared.name
+            attached.close()
+
+    def test_worker_processes(self):
+        table = Table(header=["A"], data=[[i] for i in range(1000)])
+        with SharedTable.create(table) as shared:
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                results = list(executor.map(shared_rows, [shared, shared]))
+        assert results == [[[i] for i in range(1000)]] * 2
+
+    def test_other_process_exiting_does_not_free_block(self):
+        script = "import sys; from tabler import SharedTable; SharedTable(sys.argv[1])"
+        root = str(Path(__file__).parent.parent)
+        with SharedTable.create(Table(header=HEADER, data=DATA)) as shared:
+            subprocess.run(
+                [sys.executable, "-c", script, shared.name], check=True, cwd=root
+            )
+            with SharedTable(shared.name) as attached:
+                assert shared_rows(attached) == DATA
+
+    def test_unlinked(self):
+        shared = SharedTable.create(Table(header=HEADER, data=DATA))
+        name = shared.name
+        shared.close()
+        shared.unlink()
+        with pytest.raises(FileNotFoundError):
+            SharedTable(name)
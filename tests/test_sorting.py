@@ -0,0 +1,107 @@
+"""Tests for tabler.sorting module."""
+
+import pytest
+
+from tabler import CSV, XLSX, Snapshot, Table, external_sort, sorting
+
+
+@pytest.fixture
+def small_runs(monkeypatch):
+    monkeypatch.setattr(sorting, "SAMPLE_SIZE", 10)
+    monkeypatch.setattr(sorting, "BATCH_SIZE", 3)
+
+
+def write_csv(tmpdir, rows):
+    path = str(tmpdir.join("unsorted.csv"))
+    Table(header=["Name", "Qty"], data=rows).write(path, CSV(verbose=False))
+    return path
+
+
+def unsorted_rows(count=100):
+    return [["Item {}".format(i), str((i * 37) % count)] for i in range(count)]
+
+
+class TestExternalSort:
+    def test_sort_in_memory(self, tmpdir):
+        src = write_csv(tmpdir, [["b", "2"], ["a", "10"], ["c", ""], ["d", "1"]])
+        dst = str(tmpdir.join("sorted.csv"))
+        assert external_sort(src, dst, key="Qty", schema={"Qty": int}) == 4
+        table = Table(dst)
+        assert table.header == ("Name", "Qty")
+        assert [row["Name"] for row in table] == ["d", "b", "a", "c"]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_sort_with_runs(self, tmpdir, small_runs, workers):
+        rows = unsorted_rows()
+        src = write_csv(tmpdir, rows)
+        dst = str(tmpdir.join("sorted.csv"))
+        count = external_sort(
+            src,
+            dst,
+            key=["Qty"],
+            schema={"Qty": int},
+            memory_limit=1000,
+            workers=workers,
+            dst_table_type=CSV(verbose=False),
+        )
+        assert count == 100
+        assert [int(row["Qty"]) for row in Table(dst)] == list(range(100))
+
+    def test_sort_is_stable_and_reversible(self, tmpdir, small_runs):
+        rows = [["Item {}".format(i), str(i % 3)] for i in range(30)]
+        src = write_csv(tmpdir, rows)
+        dst = str(tmpdir.join("sorted.csv"))
+        external_sort(src, dst, key=1, reverse=True, memory_limit=1000, workers=1)
+        expected = sorted(rows, key=lambda row: row[1], reverse=True)
+        assert [list(row) for row in Table(dst)] == expected
+
+    def test_sort_to_other_table_type(self, tmpdir):
+        src = write_csv(tmpdir, [["b", "2"], ["a", "1"]])
+        dst = str(tmpdir.join("sorted.tabler"))
+        external_sort(
+            src, dst, key=["Name", "Qty"], dst_table_type=Snapshot(verbose=False)
+        )
+        assert [list(row) for row in Table(dst)] == [["a", "1"], ["b", "2"]]
+
+    def test_sort_to_compressed_file(self, tmpdir):
+        src = write_csv(tmpdir, [["b", "2"], ["a", "1"]])
+        dst = str(tmpdir.join("sorted.csv.gz"))
+        external_sort(src, dst, key="Name", dst_table_type=CSV(verbose=False))
+        assert [list(row) for row in Table(dst)] == [["a", "1"], ["b", "2"]]
+
+    def test_compressed_file_not_supported(self, tmpdir):
+        src = write_csv(tmpdir, [["a", "1"]])
+        with pytest.raises(ValueError):
+            external_sort(
+                src,
+                str(tmpdir.join("sorted.xlsx.gz")),
+                key="Name",
+                dst_table_type=XLSX(),
+            )
+
+    def test_unconverted_cells(self, tmpdir):
+        src = write_csv(tmpdir, [["a", "10"], ["b", "N/A"], ["c", ""], ["d", "9"]])
+        dst = str(tmpdir.join("sorted.csv"))
+        external_sort(src, dst, key="Qty", schema={"Qty": int}, workers=1)
+        assert [row["Name"] for row in Table(dst)] == ["d", "a", "b", "c"]
+
+    def test_schema_not_picklable(self, tmpdir):
+        src = write_csv(tmpdir, [["a", "1"]])
+        with pytest.raises(ValueError, match="picklable"):
+            external_sort(
+                src,
+                str(tmpdir.join("sorted.csv")),
+                key="Qty",
+                schema={"Qty": lambda value: int(value)},
+                workers=2,
+            )
+        dst = str(tmpdir.join("sorted.csv"))
+        external_sort(
+            src, dst, key="Qty", schema={"Qty": lambda value: int(value)}, workers=1
+        )
+        assert [list(row) for row in Table(dst)] == [["a", "1"]]
+
+    def test_missing_key(self, tmpdir):
+        src = write_csv(tmpdir, [["a", "1"]])
+        with pytest.raises(ValueError):
+            external_sort(src, str(tmpdir.join("sorted.csv")), key="Price")
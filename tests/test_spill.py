@@ -0,0 +1,212 @@
+"""Tests for tabler.spill module."""
+
+import pytest
+
+from tabler import CSV, Table, progress, where
+from tabler.exceptions import Cancelled
+from tabler.progress import CancelToken
+from tabler.spill import SpilledRows
+from tabler.tablerow import TableRow
+
+HEADER = ("A", "B")
+HEADERS = TableRow.index_header(HEADER)
+
+
+def make_rows(count=25, **options):
+    options.setdefault("resident_rows", 6)
+    options.setdefault("page_size", 3)
+    rows = SpilledRows(HEADER, HEADERS, **options)
+    rows.extend(TableRow([i, str(i)], HEADER, HEADERS) for i in range(count))
+    return rows
+
+
+def values(rows):
+    return [row.row[0] for row in rows]
+
+
+def write_csv(tmpdir, count=100):
+    path = str(tmpdir.join("spill.csv"))
+    data = [[str(i), "x{}".format(i)] for i in range(count)]
+    Table(header=["A", "B"], data=data).write(path, CSV(verbose=False))
+    return path
+
+
+class TestSpilledRows:
+    def test_limits_resident_rows(self):
+        rows = make_rows()
+        assert len(rows) == 25
+        assert rows.resident <= 6
+        assert values(rows) == list(range(25))
+        assert rows.resident <= 6
+
+    def test_getitem(self):
+        rows = make_rows()
+        assert rows[0].row == [0, "0"]
+        assert rows[13]["B"] == "13"
+        assert rows[-1].row == [24, "24"]
+        assert values(rows[20:23]) == [20, 21, 22]
+        with pytest.raises(IndexError):
+            rows[25]
+
+    def test_changes_are_kept_when_spilled(self):
+        rows = make_rows()
+        rows[1]["B"] = "changed"
+        rows[2] = TableRow([-2, "new"], HEADER, HEADERS)
+        assert values(rows[20:]) == [20, 21, 22, 23, 24]
+        assert rows[1]["B"] == "changed"
+        assert rows[2].row == [-2, "new"]
+
+    def test_unchanged_pages_are_not_rewritten(self):
+        rows = make_rows()
+        list(rows)
+        size = rows._file.seek(0, 2)
+        list(rows)
+        assert rows._file.seek(0, 2) == size
+
+    def test_changes_to_shared_rows_are_kept(self):
+        rows = make_rows()
+        rows[1]["B"] = "x"
+        duplicate = rows[1].copy()
+        list(rows)
+        assert rows[1]["B"] == "x"
+        assert duplicate["B"] == "x"
+
+    def test_row_changes_mark_page_dirty(self):
+        rows = make_rows()
+        list(rows)
+        page = rows._pages[0]
+        row = rows[0]
+        assert row._page is page and not page.dirty
+        row["B"] = "x"
+        assert page.dirty
+        list(rows)
+        assert row._page is None
+        rows[1].remove_column("A")
+        list(rows)
+        assert rows[0]["B"] == "x"
+        assert rows[1].row == ["1"]
+
+    def test_clean_pages_are_not_pickled(self, monkeypatch):
+        rows = make_rows()
+        list(rows)
+        dumps = []
+        monkeypatch.setattr("tabler.spill.pickle.dumps", dumps.append)
+        list(rows)
+        assert dumps == []
+
+    def test_insert_and_delete(self):
+        rows = make_rows(10)
+        rows.insert(4, TableRow([-1, ""], HEADER, HEADERS))
+        del rows[0]
+        del rows[0:2]
+        assert values(rows) == [3, -1, 4, 5, 6, 7, 8, 9]
+        rows.insert(-1, TableRow([-2, ""], HEADER, HEADERS))
+        assert values(rows) == [3, -1, 4, 5, 6, 7, 8, -2, 9]
+
+    def test_insert_splits_large_pages(self):
+        rows = make_rows(3)
+        for i in range(10):
+            rows.insert(1, TableRow([-i, ""], HEADER, HEADERS))
+        assert len(rows) == 13
+        assert max(page.length for page in rows._pages) <= 6
+        assert values(rows) == [0] + [-i for i in reversed(range(10))] + [1, 2]
+
+    def test_sort(self):
+        rows = make_rows()
+        rows.sort(key=lambda row: row.row[0], reverse=True)
+        assert values(rows) == list(reversed(range(25)))
+
+    def test_resident_bytes(self):
+        rows = make_rows(100, resident_rows=None, resident_bytes=1)
+        assert len(rows._resident) == 1
+        assert values(rows) == list(range(100))
+
+    def test_restructured_rows(self):
+        rows = make_rows()
+        rows[0]._restructure([0], ("A",), {"A": 0})
+        list(rows)
+        assert rows[0].header == ("A",)
+        assert rows[0]["A"] == 0
+
+    @pytest.mark.parametrize(
+        "options", [{"resident_rows": None}, {"resident_rows": 0}, {"page_size": 0}]
+    )
+    def test_invalid_limits(self, options):
+        with pytest.raises(ValueError):
+            SpilledRows(HEADER, HEADERS, **options)
+
+
+class TestSpilledTable:
+    def test_load_file(self, tmpdir):
+        table = Table(write_csv(tmpdir), resident_rows=10)
+        assert isinstance(table.rows, SpilledRows)
+        assert table.rows.resident <= 10
+        assert len(table) == 100
+        assert table[57]["B"] == "x57"
+        assert [row["A"] for row in table] == [str(i) for i in range(100)]
+
+    def test_load_with_options(self, tmpdir):
+        table = Table(
+            write_csv(tmpdir),
+            resident_rows=10,
+            where=where("A", "in", ["5", "50", "99"]),
+            columns=["B"],
+            schema={"B": str},
+        )
+        assert table.header == ("B",)
+        assert [row.row for row in table] == [["x5"], ["x50"], ["x99"]]
+
+    def test_load_data(self):
+        table = Table(header=["A"], data=[[i] for i in range(50)], resident_bytes=1024)
+        assert isinstance(table.rows, SpilledRows)
+        assert table[49]["A"] == 49
+
+    def test_load_data_with_schema(self):
+        data = [[str(i), "x"] for i in range(50)]
+        table = Table(header=["A", "B"], data=data, schema={"A": int}, resident_rows=10)
+        assert [row["A"] for row in table] == list(range(50))
+        assert table.rows.resident <= 10
+
+    def test_append_and_write(self, tmpdir):
+        table = Table(write_csv(tmpdir), resident_rows=10)
+        table.append(["100", "x100"])
+        table.extend([["101", ""]])
+        table[3]["B"] = "changed"
+        path = str(tmpdir.join("written.csv"))
+        table.write(path, CSV(verbose=False))
+        written = Table(path)
+        assert len(written) == 102
+        assert written[3]["B"] == "changed"
+        assert written[101].row == ["101", ""]
+
+    def test_slice_does_not_change_table(self, tmpdir):
+        table = Table(write_csv(tmpdir), resident_rows=10)
+        view = table[40:45]
+        view[0]["B"] = "view"
+        table[40]["B"] = "table"
+        assert view[0]["B"] == "view"
+        assert table[40]["B"] == "table"
+        assert len(table) == 100
+
+    def test_column_changes(self, tmpdir):
+        table = Table(write_csv(tmpdir), resident_rows=10)
+        table.remove_column("A")
+        table.add_column("C", lambda row: row["B"] + "!")
+        assert table.header == ("B", "C")
+        assert table[0].row == ["x0", "x0!"]
+        assert table[99]["C"] == "x99!"
+
+    def test_long_rows(self, tmpdir):
+        path = str(tmpdir.join("long.csv"))
+        with open(path, "w") as f:
+            f.write("A\n1\n1,2\n")
+        assert Table(path).row_length == 2
+        with pytest.raises(ValueError):
+            Table(path, resident_rows=10)
+
+    def test_cancel(self, tmpdir, monkeypatch):
+        monkeypatch.setattr(progress, "CHUNK_SIZE", 10)
+        token = CancelToken()
+        token.cancel()
+        with pytest.raises(Cancelled):
+            Table(write_csv(tmpdir), resident_rows=10, cancel=token)
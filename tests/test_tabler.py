@@ -1,11 +1,14 @@
 """Tests for tabler.Table class."""
 
+import copy
+import gzip
+import pickle
 from pathlib import Path
 
 import pytest
 
-from tabler import CSV, Table
-from tabler.tablerow import TableRow
+from tabler import CSV, HTML, ODS, XLSX, Arrow, Parquet, Snapshot, SQLite, Table
+from tabler.tablerow import SharedRows, TableRow
 
 from .test_tools import TablerTestTools
 
@@ -19,6 +22,21 @@ class TestTable:
         with pytest.raises(TypeError):
             Table()
 
+    def test_load_pads_rows_and_normalises_empty_values(self):
+        table = Table(header=["A", "B", "C"], data=[["x", ""], [None, "y", "z"]])
+        assert list(table[0]) == ["x", None, None]
+        assert list(table[1]) == [None, "y", "z"]
+
+    def test_load_does_not_modify_input_data(self):
+        data = [["x", ""], ["y", "z", "w"]]
+        Table(header=["A", "B", "C"], data=data)
+        assert data == [["x", ""], ["y", "z", "w"]]
+
+    def test_rows_share_header_index(self):
+        table = TablerTestTools.basic_table()
+        assert table[0].headers is table[1].headers
+        assert table[0].headers == {"Col1": 0, "Col2": 1, "Col3": 2}
+
     def test_access_cell_by_header_column_index(self):
         table = TablerTestTools.basic_table()
         assert table[0][0] == "Red"
@@ -82,6 +100,71 @@ class TestTable:
         assert list(table.rows[0]) == ["Red", "Blue"]
         assert list(table.rows[1]) == ["Orange", "Magenta"]
 
+    def test_remove_column_by_index(self):
+        table = TablerTestTools.basic_table()
+        table.remove_column(1)
+        assert table.header == ("Col1", "Col3")
+        assert table[0]["Col3"] == "Blue"
+
+    def test_row_lookup_by_name_after_remove_column(self):
+        table = TablerTestTools.basic_table()
+        table.remove_column("Col1")
+        assert table[0]["Col3"] == "Blue"
+        assert table[1]["Col2"] == "Yellow"
+
+    def test_select_columns(self):
+        table = TablerTestTools.basic_table()
+        table.select(["Col3", 0])
+        assert table.header == ("Col3", "Col1")
+        assert [list(row) for row in table] == [["Blue", "Red"], ["Magenta", "Orange"]]
+        assert table[0]["Col1"] == "Red"
+
+    def test_select_single_column(self):
+        table = TablerTestTools.basic_table()
+        table.select(["Col2"])
+        assert table.header == ("Col2",)
+        assert table.get_column("Col2") == ["Green", "Yellow"]
+
+    def test_select_invalid_column_raises(self):
+        table = TablerTestTools.basic_table()
+        with pytest.raises(ValueError):
+            table.select(["Col4"])
+        with pytest.raises(IndexError):
+            table.select([3])
+
+    def test_drop_columns(self):
+        table = TablerTestTools.basic_table()
+        table.drop(["Col1", "Col3"])
+        assert table.header == ("Col2",)
+        assert [list(row) for row in table] == [["Green"], ["Yellow"]]
+
+    def test_add_column_with_values(self):
+        table = TablerTestTools.basic_table()
+        table.add_column("Col4", ["Pink", "Black"])
+        assert table.header == ("Col1", "Col2", "Col3", "Col4")
+        assert table[0]["Col4"] == "Pink"
+        assert table[1]["Col4"] == "Black"
+
+    def test_add_column_with_function(self):
+        table = TablerTestTools.basic_table()
+        table.add_column("Length", lambda row: len(row["Col1"]), index=0)
+        assert table.header == ("Length", "Col1", "Col2", "Col3")
+        assert list(table[0]) == [3, "Red", "Green", "Blue"]
+        assert table[1]["Col3"] == "Magenta"
+
+    def test_add_column_with_wrong_number_of_values_raises(self):
+        table = TablerTestTools.basic_table()
+        with pytest.raises(ValueError):
+            table.add_column("Col4", ["Pink"])
+
+    def test_column_changes_do_not_change_copy(self):
+        table = TablerTestTools.basic_table()
+        duplicate = table.copy()
+        duplicate.drop(["Col1"])
+        duplicate.add_column("Col4", ["Pink", "Black"])
+        assert table.header == TablerTestTools.TEST_HEADER
+        assert list(table[0]) == TablerTestTools.TEST_ROW_1
+
     def test_open_unknown_filetype_without_tabletype_raises(self, tmpdir):
         with pytest.raises(ValueError):
             Table("testfile.unk")
@@ -219,6 +302,180 @@ class TestTable:
         assert len(split_tables[3]) == 1
         assert tuple(split_tables[3][0]) == (18, 19, 20)
 
+    def test_dictionary_encode(self):
+        table = Table(header=["A"], data=[["x"], ["y"], ["x"], [None]])
+        codes, values = table.dictionary_encode("A")
+        assert codes.typecode == "B"
+        assert list(codes) == [0, 1, 0, 2]
+        assert values == ["x", "y", None]
+
+    def test_dictionary_encode_uses_larger_codes_when_needed(self):
+        table = Table(header=["A"], data=[[i] for i in range(300)])
+        codes, values = table.dictionary_encode(0)
+        assert codes.typecode == "H"
+        assert list(codes) == values == list(range(300))
+
+    def test_drop_duplicates(self):
+        table = Table(header=["A", "B"], data=[[1, 2], [1, 3], [1, 2], [2, 2]])
+        deduplicated = table.drop_duplicates()
+        assert [list(row) for row in deduplicated] == [[1, 2], [1, 3], [2, 2]]
+        assert deduplicated._storage()[0].row is table._storage()[0].row
+        assert len(table) == 4
+
+    def test_drop_duplicates_subset_keep_last(self):
+        table = Table(header=["A", "B"], data=[[1, 2], [2, 2], [1, 3], [1, 4]])
+        deduplicated = table.drop_duplicates(subset=["A"], keep="last")
+        assert [list(row) for row in deduplicated] == [[2, 2], [1, 4]]
+        deduplicated = table.drop_duplicates(subset=[1, "A"])
+        assert [list(row) for row in deduplicated] == [[1, 2], [2, 2], [1, 3], [1, 4]]
+
+    def test_drop_duplicates_invalid_keep(self):
+        table = Table(header=["A"], data=[[1]])
+        with pytest.raises(ValueError):
+            table.drop_duplicates(keep="middle")
+
+    def test_drop_duplicates_empty_subset(self):
+        table = Table(header=["A"], data=[[1]])
+        with pytest.raises(ValueError):
+            table.drop_duplicates(subset=[])
+
+    def test_distinct(self):
+        table = Table(header=["A", "B"], data=[["x", 1], ["y", 1], ["x", 2]])
+        assert table.distinct("A") == ["x", "y"]
+        assert table.distinct(1) == [1, 2]
+
+    def test_open_with_intern(self, tmpdir):
+        path = str(tmpdir.join("intern.csv"))
+        Table(header=["A", "B"], data=[["x", "1"], ["x", "2"]]).write(path)
+        table = Table(path, intern=["A"])
+        assert table[0]["A"] is table[1]["A"]
+
+    def test_write_keeps_compression_extension(self, tmpdir):
+        table = TablerTestTools.basic_table()
+        table.write(Path(str(tmpdir)) / "table.txt.gz", table_type=CSV())
+        path = Path(str(tmpdir)) / "table.csv.gz"
+        assert path.exists()
+        TablerTestTools.table_valid(Table(path))
+
+    @pytest.mark.parametrize("table_type", [CSV, Snapshot])
+    def test_write_compressed(self, tmpdir, table_type):
+        table = TablerTestTools.basic_table()
+        path = Path(str(tmpdir)) / "table{}.gz".format(table_type().extension)
+        table.write(path)
+        gzip.decompress(path.read_bytes())
+        TablerTestTools.table_valid(Table(path))
+
+    @pytest.mark.parametrize("table_type", [XLSX, ODS, HTML, SQLite, Parquet, Arrow])
+    def test_write_compressed_not_supported(self, tmpdir, table_type):
+        table = TablerTestTools.basic_table()
+        path = Path(str(tmpdir)) / "table{}.gz".format(table_type().extension)
+        with pytest.raises(ValueError):
+            table.write(path)
+        assert tmpdir.listdir() == []
+
+    def test_to_arrow(self):
+        pyarrow = pytest.importorskip("pyarrow")
+        table = Table(header=["A", "B"], data=[[1, "x"], [2, None], ["3", "y"]])
+        arrow_table = table.to_arrow()
+        assert isinstance(arrow_table, pyarrow.Table)
+        assert arrow_table.column_names == ["A", "B"]
+        assert arrow_table.column("A").to_pylist() == ["1", "2", "3"]
+        assert arrow_table.column("B").to_pylist() == ["x", None, "y"]
+
+    def test_from_arrow(self):
+        pyarrow = pytest.importorskip("pyarrow")
+        arrow_table = pyarrow.table({"A": [1, 2], "B": ["x", None]})
+        table = Table.from_arrow(arrow_table)
+        assert table.header == ("A", "B")
+        assert [list(row) for row in table] == [[1, "x"], [2, None]]
+        assert table[1]["A"] == 2
+
+    def test_from_arrow_empty_strings(self):
+        pyarrow = pytest.importorskip("pyarrow")
+        arrow_table = pyarrow.table({"A": ["x", ""], "B": [None, "y"]})
+        table = Table.from_arrow(arrow_table)
+        assert [list(row) for row in table] == [["x", None], [None, "y"]]
+
+    def test_from_arrow_record_batch(self):
+        pyarrow = pytest.importorskip("pyarrow")
+        batch = pyarrow.record_batch([pyarrow.array([1.5])], names=["A"])
+        assert [list(row) for row in Table.from_arrow(batch)] == [[1.5]]
+
+    def test_table_slice(self):
+        table = Table(header=["A"], data=[[1], [2], [3], [4]])
+        view = table[1:3]
+        assert isinstance(view, Table)
+        assert view.header == ("A",)
+        assert [list(row) for row in view] == [[2], [3]]
+        assert list(view[-1]) == [3]
+
+    def test_table_slice_shares_rows(self):
+        table = Table(header=["A"], data=[[1], [2], [3]])
+        view = table[:2]
+        assert view[0].row is table[0].row
+        assert type(table.rows) is list
+
+    def test_changing_table_slice_does_not_change_parent(self):
+        table = Table(header=["A", "B"], data=[[1, 2], [3, 4]])
+        view = table[:]
+        view[0]["A"] = 10
+        view.append([5, 6])
+        view.remove_column("B")
+        assert view[0]["A"] == 10
+        assert [list(row) for row in table] == [[1, 2], [3, 4]]
+        assert table.header == ("A", "B")
+
+    def test_changing_parent_does_not_change_accessed_slice_rows(self):
+        table = Table(header=["A"], data=[[1], [2]])
+        view = table[:]
+        view_row = view[0]
+        table[0]["A"] = 10
+        assert view_row["A"] == 1
+        assert view[0]["A"] == 1
+
+    def test_split_by_row_count_does_not_copy_rows(self):
+        table = Table(header=["A"], data=[[i] for i in range(6)])
+        split_tables = table.split_by_row_count(4)
+        assert split_tables[1][0].row is table[4].row
+        split_tables[1][0]["A"] = "changed"
+        assert table[4]["A"] == 4
+
+    def test_changing_parent_rows_after_copy(self):
+        table = Table(header=["A"], data=[[1], [2]])
+        row = table[0]
+        copy = table.copy()
+        view = table[:1]
+        row["A"] = 10
+        table.rows.append(TableRow([3], table.header, table._headers))
+        table[1]["A"] = 20
+        assert [list(row) for row in table] == [[10], [20], [3]]
+        assert [list(row) for row in copy] == [[1], [2]]
+        assert [list(row) for row in view] == [[1]]
+
+    def test_table_copy_is_independent(self):
+        t1 = TablerTestTools.basic_table()
+        t2 = t1.copy()
+        t2[0]["Col1"] = "Pink"
+        assert t1[0]["Col1"] == "Red"
+        t1[1]["Col1"] = "Black"
+        assert t2[1]["Col1"] == "Orange"
+
+    def test_table_row_copy_shares_data_until_changed(self):
+        row = TableRow(["a", "b"], ["A", "B"])
+        duplicate = row.copy()
+        assert duplicate.row is row.row
+        duplicate["A"] = "c"
+        assert list(row) == ["a", "b"]
+        assert list(duplicate) == ["c", "b"]
+
+    def test_shared_rows_index_out_of_range(self):
+        table = TablerTestTools.basic_table()
+        rows = SharedRows(list(table.rows))
+        with pytest.raises(IndexError):
+            rows[2]
+        with pytest.raises(IndexError):
+            rows[-3]
+
     def test_table_append_method_with_iterable(self):
         table = TablerTestTools.basic_table()
         new_row = ("Pink", "Purple", "Brown")
@@ -232,6 +489,75 @@ class TestTable:
         table.append(new_row)
         assert tuple(table[2]) == data
 
+    def test_table_extend(self):
+        table = TablerTestTools.basic_table()
+        table.extend([("Pink", "", "Brown"), ["Grey"]])
+        assert len(table) == 4
+        assert list(table[2]) == ["Pink", None, "Brown"]
+        assert list(table[3]) == ["Grey", None, None]
+        assert table[3]["Col1"] == "Grey"
+
+    def test_table_extend_with_table(self):
+        table = TablerTestTools.basic_table()
+        other = TablerTestTools.basic_table()
+        table.extend(other)
+        table[2]["Col1"] = "Pink"
+        assert [row[0] for row in table] == ["Red", "Orange", "Pink", "Orange"]
+        assert other[0]["Col1"] == "Red"
+
+    def test_table_extend_with_long_row(self):
+        table = TablerTestTools.basic_table()
+        with pytest.raises(ValueError):
+            table.extend([["A", "B", "C"], ["A", "B", "C", "D"]])
+        assert len(table) == 2
+
+    def test_pickle_table(self):
+        table = Table(
+            header=["A", "B", "C"],
+            data=[["a", "1", 1.5], ["b", "n", Path("p")]],
+            table_type=CSV(),
+            schema={"B": int},
+        )
+        table[0]["B"] = "x"
+        loaded = pickle.loads(pickle.dumps(table))
+        assert loaded.header == table.header
+        assert [list(row) for row in loaded] == [["a", "x", 1.5], ["b", "n", Path("p")]]
+        assert loaded.table_type.delimiter == ","
+        assert len(loaded.errors) == 1
+        assert loaded.errors[0].value == "n"
+
+    def test_pickle_does_not_share_rows(self):
+        table = TablerTestTools.basic_table()
+        tables = pickle.loads(pickle.dumps([table, table.copy(), table[:1]]))
+        tables[0][0]["Col1"] = "Pink"
+        assert [t[0]["Col1"] for t in tables] == ["Pink", "Red", "Red"]
+
+    def test_pickle_spilled_table(self, tmpdir):
+        path = str(tmpdir.join("spill.csv"))
+        Table(header=["A"], data=[[str(i)] for i in range(50)]).write(
+            path, CSV(verbose=False)
+        )
+        loaded = pickle.loads(pickle.dumps(Table(path, resident_rows=10)))
+        assert [row["A"] for row in loaded] == [str(i) for i in range(50)]
+
+    def test_copy_module_copy(self):
+        table = Table(header=["A", "B"], data=[["a", "1"]], schema={"B": int})
+        table.append(["b", "x"])
+        duplicate = copy.copy(table)
+        assert duplicate.table_type is table.table_type
+        assert duplicate.errors == table.errors
+        assert duplicate[0].row is table[0].row
+        duplicate[0]["A"] = "z"
+        assert table[0]["A"] == "a"
+        table.append(["c", "2"])
+        assert len(duplicate) == 2
+
+    def test_copy_module_deepcopy(self):
+        table = Table(header=["A"], data=[[["x"]]])
+        duplicate = copy.deepcopy(table)
+        duplicate[0]["A"].append("y")
+        assert table[0]["A"] == ["x"]
+
     def test_table_row__str__method(self):
         table = TablerTestTools.basic_table()
         row = table.rows[0]
@@ -0,0 +1,60 @@
+"""Tests for tabler.tablerow.TableRow class."""
+
+import tracemalloc
+
+from tabler.tablerow import TableRow
+
+
+class DictTableRow:
+    """TableRow storage as it was before rows used __slots__."""
+
+    def __init__(self, row, header):
+        self.row = row
+        self.header = tuple(header)
+        self.headers = {}
+        for column in self.header:
+            self.headers[column] = self.header.index(column)
+
+
+def bytes_per_row(make_row, count=10000):
+    header = tuple("Column {}".format(i) for i in range(10))
+    data = [list(range(10)) for _ in range(count)]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    rows = [make_row(row, header) for row in data]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(rows) == count
+    return (after - before) / count
+
+
+class TestTableRow:
+    def test_table_row_has_no_instance_dict(self):
+        row = TableRow(["a"], ["A"])
+        assert not hasattr(row, "__dict__")
+
+    def test_get_and_set_items(self):
+        row = TableRow(["a", "b"], ["A", "B"])
+        assert row[0] == "a"
+        assert row["B"] == "b"
+        row["A"] = "c"
+        row[1] = "d"
+        assert list(row) == ["c", "d"]
+        assert len(row) == 2
+
+    def test_copy(self):
+        row = TableRow(["a", "b"], ["A", "B"])
+        duplicate = row.copy()
+        duplicate["A"] = "c"
+        assert list(duplicate) == ["c", "b"]
+        assert list(row) == ["a", "b"]
+
+    def test_index_header_uses_first_duplicate_column(self):
+        assert TableRow.index_header(["A", "B", "A"]) == {"A": 0, "B": 1}
+
+    def test_memory_per_row(self):
+        header = tuple("Column {}".format(i) for i in range(10))
+        headers = TableRow.index_header(header)
+        before = bytes_per_row(DictTableRow)
+        after = bytes_per_row(lambda row, header: TableRow(row, header, headers))
+        assert after < before / 2
@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import pytest
+
+from tabler import Arrow, Table, where
+
+from ...test_tools import TablerTestTools, TableTypeTestTools
+
+pyarrow = pytest.importorskip("pyarrow")
+
+
+class TestArrow:
+    BASIC_FILE_PATH = Path(__file__).parent / "testfile.arrow"
+    WITH_NULLS_PATH = Path(__file__).parent / "testfile_empties.arrow"
+    WITH_INCOMPLETE_ROW = Path(__file__).parent / "testfile_incomplete_rows.arrow"
+    WITH_LONG_ROW = Path(__file__).parent / "testfile_long_rows.arrow"
+    TEST_FORMATTING = Path(__file__).parent / "test_format.arrow"
+    expected_formatting = [0, 0, None, 893275023572039]
+
+    def test_open(self):
+        table = Table(self.BASIC_FILE_PATH, table_type=Arrow())
+        TablerTestTools.table_valid(table)
+
+    def test_open_file_without_table_type(self):
+        TablerTestTools.table_valid(Table(str(self.BASIC_FILE_PATH)))
+
+    def test_read_with_where(self):
+        TableTypeTestTools.read_with_where(Arrow(), self.BASIC_FILE_PATH)
+
+    def test_read_with_columns(self):
+        TableTypeTestTools.read_with_columns(Arrow(), self.BASIC_FILE_PATH)
+
+    def test_read_incomplete_rows_with_columns(self):
+        TableTypeTestTools.read_incomplete_rows_with_columns(
+            Arrow(), self.WITH_INCOMPLETE_ROW
+        )
+
+    def test_read_with_columns_and_where(self):
+        TableTypeTestTools.read_with_columns_and_where(Arrow(), self.BASIC_FILE_PATH)
+
+    def test_read_with_columns_and_where_by_index(self):
+        table = Table(
+            self.BASIC_FILE_PATH, columns=["Col2"], where=where(0, "==", "Orange")
+        )
+        assert [list(row) for row in table] == [["Yellow"]]
+
+    def test_read_with_nrows(self):
+        TableTypeTestTools.read_with_nrows(Arrow(), self.BASIC_FILE_PATH)
+
+    def test_read_with_skiprows(self):
+        TableTypeTestTools.read_with_skiprows(Arrow(), self.BASIC_FILE_PATH)
+
+    def test_read_with_sample(self):
+        TableTypeTestTools.read_with_sample(Arrow(), self.BASIC_FILE_PATH)
+
+    def test_write(self, tmpdir):
+        TableTypeTestTools.write_with_table_type(Arrow(), tmpdir)
+
+    def test_read_null_values(self):
+        TableTypeTestTools.read_null_values_with_tabletype(
+            Arrow(), self.WITH_NULLS_PATH
+        )
+
+    def test_formatting(self):
+        TableTypeTestTools.format_with_table_type(
+            Arrow(), self.TEST_FORMATTING, self.expected_formatting
+        )
+
+    def test_write_null_values(self, tmpdir):
+        TableTypeTestTools.write_null_values_with_table_type(Arrow(), tmpdir)
+
+    def test_read_incomplete_rows(self):
+        TableTypeTestTools.read_incomplete_rows_with_table_type(
+            Arrow(), self.WITH_INCOMPLETE_ROW
+        )
+
+    def test_write_incomplete_rows(self, tmpdir):
+        TableTypeTestTools.write_incomplete_rows_with_table_type(Arrow(), tmpdir)
+
+    def test_read_long_rows(self):
+        TableTypeTestTools.read_long_rows_with_table_type(Arrow(), self.WITH_LONG_ROW)
+
+    def test_write_long_rows(self, tmpdir):
+        TableTypeTestTools.write_long_rows_with_table_type(Arrow(), tmpdir)
+
+    def test_types_are_preserved(self, tmpdir):
+        data = [
+            [1, "a", 1.5, True, None, "x"],
+            [-2, "", None, False, None, 3],
+            [None, "é", 2.0, None, None, None],
+        ]
+        table = Table(header=list("ABCDEF"), data=data, table_type=Arrow())
+        path = Path(str(tmpdir)) / "types.arrow"
+        table.write(path)
+        assert [list(row) for row in Table(path)] == [
+            [1, "a", 1.5, True, None, "x"],
+            [-2, None, None, False, None, "3"],
+            [None, "é", 2.0, None, None, None],
+        ]
+
+    def test_write_compressed(self, tmpdir):
+        TableTypeTestTools.write_with_table_type(Arrow(compression="zstd"), tmpdir)
+
+    def test_read_in_batches(self, tmpdir):
+        table = Table(header=["A"], data=[[i] for i in range(10)])
+        path = Path(str(tmpdir)) / "batches.arrow"
+        table.write(path, table_type=Arrow(batch_size=3))
+        loaded = Table(path, skiprows=2, nrows=5)
+        assert [row[0] for row in loaded] == [2, 3, 4, 5, 6]
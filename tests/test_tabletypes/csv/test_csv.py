@@ -1,9 +1,11 @@
+import os
 from pathlib import Path
 
 import pytest
 import requests_mock
 
 from tabler import CSV, CSVURL, Table
+from tabler.tabletypes.csv import sniff_csv
 
 from ...test_tools import TablerTestTools, TableTypeTestTools
 
@@ -20,9 +22,43 @@ class TestCSV:
         table = Table(self.BASIC_FILE_PATH, table_type=CSV())
         TablerTestTools.table_valid(table)
 
+    def test_read_with_where(self):
+        TableTypeTestTools.read_with_where(CSV(), self.BASIC_FILE_PATH)
+
+    def test_read_with_columns(self):
+        TableTypeTestTools.read_with_columns(CSV(), self.BASIC_FILE_PATH)
+
+    def test_read_incomplete_rows_with_columns(self):
+        TableTypeTestTools.read_incomplete_rows_with_columns(
+            CSV(), self.WITH_INCOMPLETE_ROW
+        )
+
+    def test_read_with_columns_and_where(self):
+        TableTypeTestTools.read_with_columns_and_where(CSV(), self.BASIC_FILE_PATH)
+
+    def test_read_with_nrows(self):
+        TableTypeTestTools.read_with_nrows(CSV(), self.BASIC_FILE_PATH)
+
+    def test_read_with_skiprows(self):
+        TableTypeTestTools.read_with_skiprows(CSV(), self.BASIC_FILE_PATH)
+
+    def test_read_with_sample(self):
+        TableTypeTestTools.read_with_sample(CSV(), self.BASIC_FILE_PATH)
+
     def test_write(self, tmpdir):
         TableTypeTestTools.write_with_table_type(CSV(), tmpdir)
 
+    def test_open_compressed_file(self):
+        TablerTestTools.table_valid(Table(Path(__file__).parent / "testfile.csv.gz"))
+
+    @pytest.mark.parametrize("compression", [".gz", ".bz2", ".xz"])
+    def test_write_compressed(self, tmpdir, compression):
+        TableTypeTestTools.write_compressed_with_table_type(CSV(), tmpdir, compression)
+
+    def test_write_zstandard_compressed(self, tmpdir):
+        pytest.importorskip("zstandard")
+        TableTypeTestTools.write_compressed_with_table_type(CSV(), tmpdir, ".zst")
+
     def test_read_null_values(self):
         TableTypeTestTools.read_null_values_with_tabletype(CSV(), self.WITH_NULLS_PATH)
 
@@ -92,6 +128,75 @@ class TestCSV:
         assert file_text == expected
 
 
+class TestSniffCSV:
+    AUTO = CSV(encoding="auto", delimiter="auto", header="auto")
+
+    def write(self, tmpdir, content, encoding="utf-8", name="sniff.csv"):
+        path = Path(str(tmpdir)) / name
+        path.write_bytes(content.encode(encoding))
+        return path
+
+    def test_open_tab_delimited_csv(self):
+        path = Path(__file__).parent / "testfile_tab.csv"
+        TablerTestTools.table_valid(Table(path, self.AUTO))
+
+    def test_open_compressed_file(self):
+        path = Path(__file__).parent / "testfile.csv.gz"
+        TablerTestTools.table_valid(Table(path, self.AUTO))
+
+    def test_detects_delimiter_and_quoting(self, tmpdir):
+        path = self.write(tmpdir, "A;B\n'x;y';1\n'z';2\n")
+        table = Table(path, self.AUTO)
+        assert table.header == ("A", "B")
+        assert [list(row) for row in table] == [["x;y", "1"], ["z", "2"]]
+
+    @pytest.mark.parametrize("encoding", ["utf-8-sig", "utf-16", "utf-32"])
+    def test_detects_encoding_from_bom(self, tmpdir, encoding):
+        path = self.write(tmpdir, "Näme,B\né,1\n", encoding)
+        assert sniff_csv(path).encoding == encoding
+        table = Table(path, self.AUTO)
+        assert table.header == ("Näme", "B")
+        assert list(table[0]) == ["é", "1"]
+
+    def test_detects_latin_1(self, tmpdir):
+        path = self.write(tmpdir, "A,B\né,1\n", "latin-1")
+        assert sniff_csv(path).encoding == "latin-1"
+        assert list(Table(path, self.AUTO)[0]) == ["é", "1"]
+
+    def test_detects_missing_header(self, tmpdir):
+        path = self.write(tmpdir, "1,x\n2,y\n3,z\n")
+        table = Table(path, self.AUTO)
+        assert table.header == ("Unlabeled Column 1", "Unlabeled Column 2")
+        assert [row[0] for row in table] == ["1", "2", "3"]
+
+    def test_detects_header(self, tmpdir):
+        path = self.write(tmpdir, "Qty,Name\n1,x\n2,y\n")
+        assert sniff_csv(path).header is True
+
+    def test_header_false(self, tmpdir):
+        path = self.write(tmpdir, "A,B\nC,D\n")
+        table = Table(path, CSV(header=False))
+        assert [list(row) for row in table] == [["A", "B"], ["C", "D"]]
+
+    def test_only_start_of_file_is_sniffed(self, tmpdir):
+        content = "A,B\n" + "x,1\n" * 20000 + "é,2\n"
+        path = self.write(tmpdir, content, "latin-1")
+        assert sniff_csv(path).encoding == "utf-8"
+
+    def test_result_is_cached_until_file_changes(self, tmpdir):
+        path = self.write(tmpdir, "A,B\n1,2\n")
+        first = sniff_csv(path)
+        assert sniff_csv(path) is first
+        self.write(tmpdir, "A;B;C\n1;2;3\n")
+        os.utime(path, ns=(0, 0))
+        assert sniff_csv(path).dialect.delimiter == ";"
+
+    def test_write(self, tmpdir):
+        path = Path(str(tmpdir)) / "auto.csv"
+        TablerTestTools.basic_table().write(path, table_type=self.AUTO)
+        assert path.read_text(encoding="utf-8").startswith("Col1,Col2,Col3\n")
+
+
 class TestCSVURL:
     tabletype = CSVURL()
 
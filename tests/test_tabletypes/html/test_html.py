@@ -3,11 +3,17 @@ from pathlib import Path
 import pytest
 
 from tabler import HTML, Table
+from tabler.tabletypes import BaseTableType
 
 from ...test_tools import TablerTestTools
 
 
 class TestHTML:
+    def test_default_verbose(self, monkeypatch):
+        monkeypatch.setattr(BaseTableType, "verbose", False)
+        assert HTML().verbose is False
+        assert HTML(verbose=True).verbose is True
+
     def test_open(self):
         with pytest.raises(NotImplementedError):
             Table("", table_type=HTML())
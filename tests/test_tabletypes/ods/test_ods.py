@@ -1,6 +1,7 @@
 from pathlib import Path
 
 from tabler import ODS, Table
+from tabler.tabletypes import BaseTableType
 
 from ...test_tools import TablerTestTools, TableTypeTestTools
 
@@ -15,10 +16,38 @@ class TestODS:
     TEST_FORMATTING = Path(__file__).parent / "test_format.ods"
     expected_formatting = [0, 0, "None", 893275023572039]
 
+    def test_default_verbose(self, monkeypatch):
+        monkeypatch.setattr(BaseTableType, "verbose", False)
+        assert ODS().verbose is False
+        assert ODS(verbose=True).verbose is True
+
     def test_open(self):
         table = Table(self.BASIC_FILE_PATH, table_type=ODS())
         TablerTestTools.table_valid(table)
 
+    def test_read_with_where(self):
+        TableTypeTestTools.read_with_where(ODS(), self.BASIC_FILE_PATH)
+
+    def test_read_with_columns(self):
+        TableTypeTestTools.read_with_columns(ODS(), self.BASIC_FILE_PATH)
+
+    def test_read_incomplete_rows_with_columns(self):
+        TableTypeTestTools.read_incomplete_rows_with_columns(
+            ODS(), self.WITH_INCOMPLETE_ROW
+        )
+
+    def test_read_with_columns_and_where(self):
+        TableTypeTestTools.read_with_columns_and_where(ODS(), self.BASIC_FILE_PATH)
+
+    def test_read_with_nrows(self):
+        TableTypeTestTools.read_with_nrows(ODS(), self.BASIC_FILE_PATH)
+
+    def test_read_with_skiprows(self):
+        TableTypeTestTools.read_with_skiprows(ODS(), self.BASIC_FILE_PATH)
+
+    def test_read_with_sample(self):
+        TableTypeTestTools.read_with_sample(ODS(), self.BASIC_FILE_PATH)
+
     def test_write(self, tmpdir):
         TableTypeTestTools.write_with_table_type(ODS(), tmpdir)
 
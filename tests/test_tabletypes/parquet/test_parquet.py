@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import pytest
+
+from tabler import Parquet, Table, where
+
+from ...test_tools import TablerTestTools, TableTypeTestTools
+
+pyarrow = pytest.importorskip("pyarrow")
+
+
+class TestParquet:
+    BASIC_FILE_PATH = Path(__file__).parent / "testfile.parquet"
+    WITH_NULLS_PATH = Path(__file__).parent / "testfile_empties.parquet"
+    WITH_INCOMPLETE_ROW = Path(__file__).parent / "testfile_incomplete_rows.parquet"
+    WITH_LONG_ROW = Path(__file__).parent / "testfile_long_rows.parquet"
+    TEST_FORMATTING = Path(__file__).parent / "test_format.parquet"
+    expected_formatting = [0, 0, None, 893275023572039]
+
+    def test_open(self):
+        table = Table(self.BASIC_FILE_PATH, table_type=Parquet())
+        TablerTestTools.table_valid(table)
+
+    def test_open_file_without_table_type(self):
+        TablerTestTools.table_valid(Table(str(self.BASIC_FILE_PATH)))
+
+    def test_read_with_where(self):
+        TableTypeTestTools.read_with_where(Parquet(), self.BASIC_FILE_PATH)
+
+    def test_read_with_columns(self):
+        TableTypeTestTools.read_with_columns(Parquet(), self.BASIC_FILE_PATH)
+
+    def test_read_incomplete_rows_with_columns(self):
+        TableTypeTestTools.read_incomplete_rows_with_columns(
+            Parquet(), self.WITH_INCOMPLETE_ROW
+        )
+
+    def test_read_with_columns_and_where(self):
+        TableTypeTestTools.read_with_columns_and_where(Parquet(), self.BASIC_FILE_PATH)
+
+    def test_read_with_columns_and_where_by_index(self):
+        table = Table(
+            self.BASIC_FILE_PATH, columns=["Col2"], where=where(0, "==", "Orange")
+        )
+        assert [list(row) for row in table] == [["Yellow"]]
+
+    def test_read_with_nrows(self):
+        TableTypeTestTools.read_with_nrows(Parquet(), self.BASIC_FILE_PATH)
+
+    def test_read_with_skiprows(self):
+        TableTypeTestTools.read_with_skiprows(Parquet(), self.BASIC_FILE_PATH)
+
+    def test_read_with_sample(self):
+        TableTypeTestTools.read_with_sample(Parquet(), self.BASIC_FILE_PATH)
+
+    def test_write(self, tmpdir):
+        TableTypeTestTools.write_with_table_type(Parquet(), tmpdir)
+
+    def test_read_null_values(self):
+        TableTypeTestTools.read_null_values_with_tabletype(
+            Parquet(), self.WITH_NULLS_PATH
+        )
+
+    def test_formatting(self):
+        TableTypeTestTools.format_with_table_type(
+            Parquet(), self.TEST_FORMATTING, self.expected_formatting
+        )
+
+    def test_write_null_values(self, tmpdir):
+        TableTypeTestTools.write_null_values_with_table_type(Parquet(), tmpdir)
+
+    def test_read_incomplete_rows(self):
+        TableTypeTestTools.read_incomplete_rows_with_table_type(
+            Parquet(), self.WITH_INCOMPLETE_ROW
+        )
+
+    def test_write_incomplete_rows(self, tmpdir):
+        TableTypeTestTools.write_incomplete_rows_with_table_type(Parquet(), tmpdir)
+
+    def test_read_long_rows(self):
+        TableTypeTestTools.read_long_rows_with_table_type(Parquet(), self.WITH_LONG_ROW)
+
+    def test_write_long_rows(self, tmpdir):
+        TableTypeTestTools.write_long_rows_with_table_type(Parquet(), tmpdir)
+
+    def test_types_are_preserved(self, tmpdir):
+        data = [
+            [1, "a", 1.5, True, None, "x"],
+            [-2, "", None, False, None, 3],
+            [None, "é", 2.0, None, None, None],
+        ]
+        table = Table(header=list("ABCDEF"), data=data, table_type=Parquet())
+        path = Path(str(tmpdir)) / "types.parquet"
+        table.write(path)
+        assert [list(row) for row in Table(path)] == [
+            [1, "a", 1.5, True, None, "x"],
+            [-2, None, None, False, None, "3"],
+            [None, "é", 2.0, None, None, None],
+        ]
+
+    def test_read_in_batches(self, tmpdir):
+        table = Table(header=["A"], data=[[i] for i in range(10)])
+        path = Path(str(tmpdir)) / "batches.parquet"
+        table.write(path, table_type=Parquet(row_group_size=4))
+        loaded = Table(path, table_type=Parquet(batch_size=3), skiprows=2, nrows=5)
+        assert [row[0] for row in loaded] == [2, 3, 4, 5, 6]
@@ -0,0 +1,140 @@
+from pathlib import Path
+
+import pytest
+
+from tabler import Snapshot, Table, where
+from tabler.tabletypes.snapshot import SnapshotReader, column_kind
+
+from ...test_tools import TablerTestTools, TableTypeTestTools
+
+
+class TestSnapshot:
+    BASIC_FILE_PATH = Path(__file__).parent / "testfile.tabler"
+    WITH_NULLS_PATH = Path(__file__).parent / "testfile_empties.tabler"
+    WITH_INCOMPLETE_ROW = Path(__file__).parent / "testfile_incomplete_rows.tabler"
+    WITH_LONG_ROW = Path(__file__).parent / "testfile_long_rows.tabler"
+    TEST_FORMATTING = Path(__file__).parent / "test_format.tabler"
+    expected_formatting = [0, 0, None, 893275023572039]
+
+    def test_open(self):
+        table = Table(self.BASIC_FILE_PATH, table_type=Snapshot())
+        TablerTestTools.table_valid(table)
+
+    def test_open_file_without_table_type(self):
+        TablerTestTools.table_valid(Table(str(self.BASIC_FILE_PATH)))
+
+    def test_read_with_where(self):
+        TableTypeTestTools.read_with_where(Snapshot(), self.BASIC_FILE_PATH)
+
+    def test_read_with_columns(self):
+        TableTypeTestTools.read_with_columns(Snapshot(), self.BASIC_FILE_PATH)
+
+    def test_read_incomplete_rows_with_columns(self):
+        TableTypeTestTools.read_incomplete_rows_with_columns(
+            Snapshot(), self.WITH_INCOMPLETE_ROW
+        )
+
+    def test_read_with_columns_and_where(self):
+        TableTypeTestTools.read_with_columns_and_where(Snapshot(), self.BASIC_FILE_PATH)
+
+    def test_read_with_columns_and_where_by_index(self):
+        table = Table(
+            self.BASIC_FILE_PATH, columns=["Col2"], where=where(0, "==", "Orange")
+        )
+        assert [list(row) for row in table] == [["Yellow"]]
+
+    def test_read_with_nrows(self):
+        TableTypeTestTools.read_with_nrows(Snapshot(), self.BASIC_FILE_PATH)
+
+    def test_read_with_skiprows(self):
+        TableTypeTestTools.read_with_skiprows(Snapshot(), self.BASIC_FILE_PATH)
+
+    def test_read_with_sample(self):
+        TableTypeTestTools.read_with_sample(Snapshot(), self.BASIC_FILE_PATH)
+
+    def test_write(self, tmpdir):
+        TableTypeTestTools.write_with_table_type(Snapshot(), tmpdir)
+
+    def test_write_compressed_file(self, tmpdir):
+        TableTypeTestTools.write_compressed_with_table_type(Snapshot(), tmpdir, ".gz")
+
+    def test_write_compressed(self, tmpdir):
+        TableTypeTestTools.write_with_table_type(Snapshot(compress=True), tmpdir)
+
+    def test_read_null_values(self):
+        TableTypeTestTools.read_null_values_with_tabletype(
+            Snapshot(), self.WITH_NULLS_PATH
+        )
+
+    def test_formatting(self):
+        TableTypeTestTools.format_with_table_type(
+            Snapshot(), self.TEST_FORMATTING, self.expected_formatting
+        )
+
+    def test_write_null_values(self, tmpdir):
+        TableTypeTestTools.write_null_values_with_table_type(Snapshot(), tmpdir)
+
+    def test_read_incomplete_rows(self):
+        TableTypeTestTools.read_incomplete_rows_with_table_type(
+            Snapshot(), self.WITH_INCOMPLETE_ROW
+        )
+
+    def test_write_incomplete_rows(self, tmpdir):
+        TableTypeTestTools.write_incomplete_rows_with_table_type(Snapshot(), tmpdir)
+
+    def test_read_long_rows(self):
+        TableTypeTestTools.read_long_rows_with_table_type(
+            Snapshot(), self.WITH_LONG_ROW
+        )
+
+    def test_write_long_rows(self, tmpdir):
+        TableTypeTestTools.write_long_rows_with_table_type(Snapshot(), tmpdir)
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_types_are_preserved(self, tmpdir, compress):
+        data = [
+            [1, "a", 1.5, True, None, "x", 2**70],
+            [-2, "", None, False, None, 3, 1],
+            [None, "é", 2.0, None, None, None, None],
+        ]
+        table = Table(header=list("ABCDEFG"), data=data, table_type=Snapshot())
+        path = Path(str(tmpdir)) / "types.tabler"
+        table.write(path, table_type=Snapshot(compress=compress))
+        assert [list(row) for row in Table(path)] == [list(row) for row in table]
+
+    def test_write_empty_table(self, tmpdir):
+        path = Path(str(tmpdir)) / "empty.tabler"
+        Table(header=["A", "B"], data=[]).write(path)
+        table = Table(path)
+        assert table.header == ("A", "B")
+        assert len(table) == 0
+
+    def test_open_invalid_file_raises(self, tmpdir):
+        path = Path(str(tmpdir)) / "invalid.tabler"
+        path.write_bytes(b"not a snapshot file")
+        with pytest.raises(ValueError):
+            Table(path)
+
+    def test_reader_decodes_requested_rows(self):
+        data = b"".join(Snapshot().encode(TablerTestTools.basic_table()))
+        reader = SnapshotReader(data)
+        assert reader.header == ["Col1", "Col2", "Col3"]
+        assert reader.row_count == 2
+        assert reader.column(2) == ["Blue", "Magenta"]
+        assert reader.column(0, 1) == ["Orange"]
+
+    @pytest.mark.parametrize(
+        "cells,expected",
+        [
+            ([None, None], "n"),
+            (["a", None], "s"),
+            (["a\x00b"], "j"),
+            ([1, None], "i"),
+            ([2**64], "j"),
+            ([1.0], "f"),
+            ([True], "b"),
+            ([1, 1.0], "j"),
+        ],
+    )
+    def test_column_kind(self, cells, expected):
+        assert column_kind(cells) == expected
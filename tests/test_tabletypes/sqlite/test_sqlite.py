@@ -0,0 +1,220 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from tabler import SQLite, Table, where
+from tabler.tabletypes.sqlite import condition_sql
+
+from ...test_tools import TablerTestTools, TableTypeTestTools
+
+
+def numbers_path(tmpdir):
+    path = Path(str(tmpdir)) / "numbers.sqlite"
+    data = [[i, "Item {}".format(i), i % 3] for i in range(10)]
+    data.append(["7", "Text", None])
+    Table(header=["Id", "Name", "Group"], data=data).write(path, SQLite(verbose=False))
+    return path
+
+
+class TestSQLite:
+    BASIC_FILE_PATH = Path(__file__).parent / "testfile.sqlite"
+    WITH_NULLS_PATH = Path(__file__).parent / "testfile_empties.sqlite"
+    WITH_INCOMPLETE_ROW = Path(__file__).parent / "testfile_incomplete_rows.sqlite"
+    TEST_FORMATTING = Path(__file__).parent / "test_format.sqlite"
+    expected_formatting = [0, 0, None, 893275023572039]
+
+    def test_open(self):
+        table = Table(self.BASIC_FILE_PATH, table_type=SQLite())
+        TablerTestTools.table_valid(table)
+
+    def test_open_file_without_table_type(self):
+        TablerTestTools.table_valid(Table(str(self.BASIC_FILE_PATH)))
+
+    def test_read_with_where(self):
+        TableTypeTestTools.read_with_where(SQLite(), self.BASIC_FILE_PATH)
+
+    def test_read_with_columns(self):
+        TableTypeTestTools.read_with_columns(SQLite(), self.BASIC_FILE_PATH)
+
+    def test_read_incomplete_rows_with_columns(self):
+        TableTypeTestTools.read_incomplete_rows_with_columns(
+            SQLite(), self.WITH_INCOMPLETE_ROW
+        )
+
+    def test_read_with_columns_and_where(self):
+        TableTypeTestTools.read_with_columns_and_where(SQLite(), self.BASIC_FILE_PATH)
+
+    def test_read_with_nrows(self):
+        TableTypeTestTools.read_with_nrows(SQLite(), self.BASIC_FILE_PATH)
+
+    def test_read_with_skiprows(self):
+        TableTypeTestTools.read_with_skiprows(SQLite(), self.BASIC_FILE_PATH)
+
+    def test_read_with_sample(self):
+        TableTypeTestTools.read_with_sample(SQLite(), self.BASIC_FILE_PATH)
+
+    def test_write(self, tmpdir):
+        TableTypeTestTools.write_with_table_type(SQLite(), tmpdir)
+
+    def test_read_null_values(self):
+        TableTypeTestTools.read_null_values_with_tabletype(
+            SQLite(), self.WITH_NULLS_PATH
+        )
+
+    def test_formatting(self):
+        TableTypeTestTools.format_with_table_type(
+            SQLite(), self.TEST_FORMATTING, self.expected_formatting
+        )
+
+    def test_write_null_values(self, tmpdir):
+        TableTypeTestTools.write_null_values_with_table_type(SQLite(), tmpdir)
+
+    def test_read_incomplete_rows(self):
+        TableTypeTestTools.read_incomplete_rows_with_table_type(
+            SQLite(), self.WITH_INCOMPLETE_ROW
+        )
+
+    def test_write_incomplete_rows(self, tmpdir):
+        TableTypeTestTools.write_incomplete_rows_with_table_type(SQLite(), tmpdir)
+
+    def test_write_long_rows(self, tmpdir):
+        TableTypeTestTools.write_long_rows_with_table_type(SQLite(), tmpdir)
+
+    def test_types_are_preserved(self, tmpdir):
+        data = [[1, "a", 1.5, b"x", True], [None, "", None, None, 1.0]]
+        path = Path(str(tmpdir)) / "types.sqlite"
+        Table(header=list("ABCDE"), data=data).write(path, SQLite(verbose=False))
+        assert [list(row) for row in Table(path)] == [
+            [1, "a", 1.5, b"x", 1],
+            [None, None, None, None, 1.0],
+        ]
+
+    def test_other_types_are_stored_as_text(self, tmpdir):
+        path = Path(str(tmpdir)) / "text.sqlite"
+        table = Table(header=["A"], data=[[Path("a")]])
+        table.write(path, SQLite(verbose=False))
+        assert Table(path)[0]["A"] == "a"
+
+    def test_if_exists(self, tmpdir):
+        path = Path(str(tmpdir)) / "exists.sqlite"
+        table = TablerTestTools.basic_table()
+        table.write(path, SQLite(verbose=False))
+        table.write(path, SQLite(if_exists="append", verbose=False))
+        assert len(Table(path)) == 4
+        table.write(path, SQLite(verbose=False))
+        assert len(Table(path)) == 2
+        with pytest.raises(sqlite3.OperationalError):
+            table.write(path, SQLite(if_exists="fail", verbose=False))
+        with pytest.raises(ValueError):
+            SQLite(if_exists="ignore")
+
+    def test_write_in_one_transaction(self, tmpdir):
+        path = Path(str(tmpdir)) / "transaction.sqlite"
+        TablerTestTools.basic_table().write(path, SQLite(verbose=False))
+        rows = [["a", "b", "c"], ["a", "b", "c", "d"]]
+        with pytest.raises(sqlite3.ProgrammingError):
+            SQLite(verbose=False).write_rows(["A", "B", "C"], rows, path)
+        assert len(Table(path)) == 2
+
+    def test_write_rows(self, tmpdir):
+        path = Path(str(tmpdir)) / "rows.sqlite"
+        rows = ([i, str(i)] for i in range(5))
+        assert SQLite(table="t", verbose=False).write_rows(["A", "B"], rows, path) == 5
+        assert len(Table(path, SQLite(table="t"))) == 5
+
+    def test_read_in_batches(self, tmpdir):
+        table = Table(numbers_path(tmpdir), SQLite(batch_size=3))
+        assert [row["Id"] for row in table][:10] == list(range(10))
+
+    def test_read_query(self, tmpdir):
+        table_type = SQLite(
+            query='SELECT "Name", "Id" * 2 AS "Double" FROM data WHERE "Group" = ?',
+            parameters=[1],
+        )
+        table = Table(numbers_path(tmpdir), table_type, where=where("Double", ">", 5))
+        assert table.header == ("Name", "Double")
+        assert [list(row) for row in table] == [["Item 4", 8], ["Item 7", 14]]
+
+    def test_order_by(self, tmpdir):
+        table = Table(
+            numbers_path(tmpdir),
+            SQLite(order_by=["Group", "Id"], asc=False),
+            nrows=3,
+            columns=["Id"],
+        )
+        assert [row["Id"] for row in table] == [8, 5, 2]
+
+    def test_where_matches_text_numbers(self, tmpdir):
+        table = Table(numbers_path(tmpdir), where=where("Id", "<", 8))
+        assert [row["Id"] for row in table] == [0, 1, 2, 3, 4, 5, 6, 7, "7"]
+
+    def test_where_with_null_values(self, tmpdir):
+        path = numbers_path(tmpdir)
+        assert len(Table(path, where=where("Group", "==", None))) == 1
+        assert len(Table(path, where=where("Group", "!=", 0))) == 7
+        assert len(Table(path, where=where("Group", "not in", [0, 1]))) == 4
+        assert len(Table(path, where=~where("Group", "in", [0]))) == 7
+
+    def test_where_with_schema(self, tmpdir):
+        table = Table(
+            numbers_path(tmpdir), schema={"Id": str}, where=where("Id", "==", "7")
+        )
+        assert [row["Name"] for row in table] == ["Item 7", "Text"]
+
+    def test_select(self, tmpdir):
+        path = numbers_path(tmpdir)
+        table_type = SQLite()
+        options = {"where": where("Id", ">=", 5), "columns": ["Name"], "nrows": 2}
+        sql, parameters = table_type.select(table_type.read_header(path), options)
+        assert sql == (
+            'SELECT "Name", "Id" FROM "data" '
+            'WHERE "Id" >= ? OR typeof("Id") = \'text\''
+        )
+        assert parameters == [5]
+        assert options["nrows"] == 2
+        options = {"skiprows": 2, "nrows": 3}
+        sql, parameters = table_type.select(table_type.read_header(path), options)
+        assert sql.endswith("LIMIT 3 OFFSET 2")
+        assert options == {}
+
+    def test_missing_file(self, tmpdir):
+        with pytest.raises(sqlite3.OperationalError):
+            Table(Path(str(tmpdir)) / "missing.sqlite")
+        assert not (Path(str(tmpdir)) / "missing.sqlite").exists()
+
+
+class TestConditionSQL:
+    HEADER = ["A", "B"]
+
+    @pytest.mark.parametrize(
+        "condition,expected",
+        [
+            (where("A", "==", "x"), ('"A" = ?', ["x"])),
+            (where(1, "!=", 2), ('"B" IS NOT ?', [2])),
+            (where("A", "in", ("x", 1)), ('"A" IN (?, ?)', ["x", 1])),
+            (
+                where("A", "==", "x") & ~where("B", "==", 1),
+                ('("A" = ?)', ["x"]),
+            ),
+            (
+                where("A", "==", "x") | where("B", "<", "y"),
+                ('("A" = ?) OR ("B" < ?)', ["x", "y"]),
+            ),
+        ],
+    )
+    def test_condition_sql(self, condition, expected):
+        assert condition_sql(condition, self.HEADER) == expected
+
+    @pytest.mark.parametrize(
+        "condition",
+        [
+            where("A", "==", ""),
+            where("A", "in", "abc"),
+            where("A", "in", [None]),
+            where("C", "==", 1),
+            where("A", "==", 1) | ~where("B", "==", 1),
+        ],
+    )
+    def test_condition_not_converted(self, condition):
+        assert condition_sql(condition, self.HEADER) is None
@@ -1,6 +1,7 @@
 import pytest
 
-from tabler.tabletypes.basetabletype import BaseTableType
+from tabler import Schema, where
+from tabler.tabletypes.basetabletype import BaseTableType, projection
 
 from ..test_tools import TablerTestTools
 
@@ -13,6 +14,15 @@ class TestBaseTableType:
         prepared_row = table_type.prepare_row(row)
         assert list(prepared_row) == [1, 3, "A", None, 5, "C"]
 
+    def test_verbose(self, capsys):
+        assert BaseTableType(".csv").verbose is True
+        table_type = BaseTableType(".csv", verbose=False)
+        assert table_type.verbose is False
+        table_type.print_status("Message")
+        assert capsys.readouterr().err == ""
+        BaseTableType(".csv", verbose=True).print_status("Message")
+        assert capsys.readouterr().err == "Message\n"
+
     def test_open(self):
         table_type = BaseTableType(".csv")
         with pytest.raises(NotImplementedError):
@@ -22,3 +32,119 @@ class TestBaseTableType:
         table_type = BaseTableType(".csv")
         with pytest.raises(NotImplementedError):
             table_type.write(TablerTestTools.basic_table(), "path")
+
+    def test_parse_row_data_with_columns(self):
+        table_type = BaseTableType(".csv")
+        header, data = table_type.parse_row_data(
+            [["A", "B", "C"], [1, 2, 3], [4]], columns=["C", "A"]
+        )
+        assert header == ["C", "A"]
+        assert data == [[3, 1], [None, 4]]
+
+    def test_parse_row_data_with_missing_column(self):
+        table_type = BaseTableType(".csv")
+        with pytest.raises(ValueError):
+            table_type.parse_row_data([["A", "B"], [1, 2]], columns=["C"])
+        with pytest.raises(IndexError):
+            table_type.parse_row_data([["A", "B"], [1, 2]], columns=[2])
+
+    def test_parse_row_data_stops_reading_after_nrows(self):
+        def rows():
+            yield ["A"]
+            yield [1]
+            yield [2]
+            raise AssertionError("Read too many rows.")
+
+        table_type = BaseTableType(".csv")
+        assert table_type.parse_row_data(rows(), nrows=2) == (["A"], [[1], [2]])
+
+    def test_parse_row_data_with_schema(self):
+        schema = Schema({"B": int, 0: float})
+        header, data = BaseTableType(".csv").parse_row_data(
+            [["A", "B"], ["1.5", "2"], ["x", ""], ["3"]], schema=schema
+        )
+        assert data == [[1.5, 2], ["x", None], [3.0]]
+        assert [(error.row, error.column) for error in schema.errors] == [(1, "A")]
+
+    def test_parse_row_data_with_schema_columns_and_where(self):
+        header, data = BaseTableType(".csv").parse_row_data(
+            [["A", "B", "C"], ["a", "10", "x"], ["b", "9", "y"], ["c", "z", "w"]],
+            columns=["C", "B"],
+            where=where("B", ">=", 10),
+            schema=Schema({1: int}),
+        )
+        assert header == ["C", "B"]
+        assert data == [["x", 10]]
+
+    def test_parse_row_data_with_intern(self):
+        rows = [["A", "B"]] + [["".join(["x", "y"]), "".join(["x", "y"])] for _ in "ab"]
+        header, data = BaseTableType(".csv").parse_row_data(rows, intern=["B"])
+        assert data == [["xy", "xy"], ["xy", "xy"]]
+        assert data[0][1] is data[1][1]
+        assert data[0][0] is not data[1][0]
+
+    def test_parse_row_data_with_intern_all_columns_and_schema(self):
+        rows = [["A", "B"], ["1", "".join("xy")], ["2", "".join("xy")], ["3"]]
+        header, data = BaseTableType(".csv").parse_row_data(
+            rows, intern=True, schema=Schema({"A": int})
+        )
+        assert data == [[1, "xy"], [2, "xy"], [3]]
+        assert data[0][1] is data[1][1]
+
+    def test_parse_row_data_closes_rows(self):
+        closed = []
+
+        def rows():
+            try:
+                yield ["A"]
+                yield [1]
+                yield [2]
+            finally:
+                closed.append(True)
+
+        BaseTableType(".csv").parse_row_data(rows(), nrows=1)
+        assert closed == [True]
+
+    def test_parse_row_data_with_skiprows_indexes(self):
+        table_type = BaseTableType(".csv")
+        rows = [["A"], [0], [1], [2], [3]]
+        assert table_type.parse_row_data(rows, skiprows={0, 2}) == (["A"], [[1], [3]])
+
+    def test_parse_row_data_with_sample_fraction(self):
+        table_type = BaseTableType(".csv")
+        rows = [["A"]] + [[i] for i in range(1000)]
+        header, data = table_type.parse_row_data(rows, sample=0.1, seed=1)
+        assert 50 < len(data) < 150
+
+    def test_parse_row_data_with_invalid_sample_fraction(self):
+        table_type = BaseTableType(".csv")
+        with pytest.raises(ValueError):
+            table_type.parse_row_data([["A"], [1]], sample=1.5)
+
+    @pytest.mark.parametrize(
+        "options,expected",
+        [
+            ({}, None),
+            ({"nrows": 5}, 6),
+            ({"nrows": 5, "skiprows": 2}, 8),
+            ({"nrows": 2, "skiprows": {0, 2}}, 5),
+            ({"nrows": 5, "sample": 2}, None),
+            ({"nrows": 5, "where": object()}, None),
+        ],
+    )
+    def test_row_limit(self, options, expected):
+        assert BaseTableType.row_limit(**options) == expected
+
+
+class TestProjection:
+    def test_projection(self):
+        assert list(projection([2, 0])(["a", "b", "c"])) == ["c", "a"]
+        assert list(projection([1])(["a", "b"])) == ["b"]
+
+    def test_short_rows(self):
+        assert list(projection([0, 2])(["a"])) == ["a", None]
+
+    def test_fill(self):
+        project = projection([None, 1, 3], fill="")
+        assert list(project(["a", "b", "c", "d"])) == ["", "b", "d"]
+        assert list(project(["a", "b"])) == ["", "b", ""]
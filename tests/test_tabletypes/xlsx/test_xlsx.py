@@ -1,6 +1,7 @@
 from pathlib import Path
 
 from tabler import XLSX, Table
+from tabler.tabletypes import BaseTableType
 
 from ...test_tools import TablerTestTools, TableTypeTestTools
 
@@ -15,10 +16,38 @@ class TestXLSX:
     TEST_FORMATTING = Path(__file__).parent / "test_format.xlsx"
     expected_formatting = [0, 0, "None", 893275023572039]
 
+    def test_default_verbose(self, monkeypatch):
+        monkeypatch.setattr(BaseTableType, "verbose", False)
+        assert XLSX().verbose is False
+        assert XLSX(verbose=True).verbose is True
+
     def test_open(self):
         table = Table(self.BASIC_FILE_PATH, table_type=XLSX())
         TablerTestTools.table_valid(table)
 
+    def test_read_with_where(self):
+        TableTypeTestTools.read_with_where(XLSX(), self.BASIC_FILE_PATH)
+
+    def test_read_with_columns(self):
+        TableTypeTestTools.read_with_columns(XLSX(), self.BASIC_FILE_PATH)
+
+    def test_read_incomplete_rows_with_columns(self):
+        TableTypeTestTools.read_incomplete_rows_with_columns(
+            XLSX(), self.WITH_INCOMPLETE_ROW
+        )
+
+    def test_read_with_columns_and_where(self):
+        TableTypeTestTools.read_with_columns_and_where(XLSX(), self.BASIC_FILE_PATH)
+
+    def test_read_with_nrows(self):
+        TableTypeTestTools.read_with_nrows(XLSX(), self.BASIC_FILE_PATH)
+
+    def test_read_with_skiprows(self):
+        TableTypeTestTools.read_with_skiprows(XLSX(), self.BASIC_FILE_PATH)
+
+    def test_read_with_sample(self):
+        TableTypeTestTools.read_with_sample(XLSX(), self.BASIC_FILE_PATH)
+
     def test_write(self, tmpdir):
         TableTypeTestTools.write_with_table_type(XLSX(), tmpdir)
 
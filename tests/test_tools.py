@@ -1,6 +1,7 @@
 from pathlib import Path
 
-from tabler import Table
+from tabler import Table, where
+from tabler.compression import EXTENSIONS, compression_of
 
 
 class TablerTestTools:
@@ -46,6 +47,18 @@ class TableTypeTestTools:
         in_table = Table(filepath, table_type=table_type)
         assert [list(_) for _ in in_table] == [list(_) for _ in out_table]
 
+    @classmethod
+    def write_compressed_with_table_type(cls, table_type, tmpdir, compression):
+        out_table = TablerTestTools.basic_table()
+        filepath = Path(str(tmpdir)) / "testfile{}{}".format(
+            table_type.extension, compression
+        )
+        out_table.write(filepath, table_type=table_type)
+        assert filepath.exists()
+        assert compression_of(filepath) == EXTENSIONS[compression]
+        in_table = Table(filepath)
+        assert [list(_) for _ in in_table] == [list(_) for _ in out_table]
+
     @classmethod
     def read_null_values_with_tabletype(cls, table_type, path):
         table = Table(path, table_type=table_type)
@@ -96,3 +109,49 @@ class TableTypeTestTools:
         )
         path = Path(str(tmpdir.join("empty_test")))
         table.write(filepath=str(path), table_type=table_type)
+
+    @classmethod
+    def read_with_where(cls, table_type, path):
+        table = Table(path, table_type=table_type, where=where("Col1", "==", "Orange"))
+        assert table.header == TablerTestTools.TEST_HEADER
+        assert [list(row) for row in table] == [TablerTestTools.TEST_ROW_2]
+
+    @classmethod
+    def read_with_columns(cls, table_type, path):
+        table = Table(path, table_type=table_type, columns=["Col3", 0])
+        assert table.header == ("Col3", "Col1")
+        assert [list(row) for row in table] == [
+            ["Blue", "Red"],
+            ["Magenta", "Orange"],
+        ]
+
+    @classmethod
+    def read_incomplete_rows_with_columns(cls, table_type, path):
+        table = Table(path, table_type=table_type, columns=["Col3"])
+        assert list(table[0]) == [table_type.empty_value]
+
+    @classmethod
+    def read_with_columns_and_where(cls, table_type, path):
+        table = Table(
+            path,
+            table_type=table_type,
+            columns=["Col2"],
+            where=where("Col1", "==", "Orange"),
+        )
+        assert [list(row) for row in table] == [["Yellow"]]
+
+    @classmethod
+    def read_with_nrows(cls, table_type, path):
+        table = Table(path, table_type=table_type, nrows=1)
+        assert [list(row) for row in table] == [TablerTestTools.TEST_ROW_1]
+
+    @classmethod
+    def read_with_skiprows(cls, table_type, path):
+        table = Table(path, table_type=table_type, skiprows=1)
+        assert [list(row) for row in table] == [TablerTestTools.TEST_ROW_2]
+
+    @classmethod
+    def read_with_sample(cls, table_type, path):
+        table = Table(path, table_type=table_type, sample=1, seed=1)
+        assert len(table) == 1
+        assert list(table[0]) in TablerTestTools.TEST_DATA
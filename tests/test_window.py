@@ -0,0 +1,167 @@
+"""Tests for tabler.window module."""
+
+import random
+from decimal import Decimal
+
+import pytest
+
+from tabler import Table
+from tabler.window import cumulative, rolling
+
+AGGREGATES = {
+    "sum": sum,
+    "mean": lambda cells: sum(cells) / len(cells),
+    "min": min,
+    "max": max,
+    "count": len,
+}
+
+
+def expected_rolling(values, window, agg, min_periods):
+    results = []
+    for index in range(len(values)):
+        cells = values[max(0, index - window + 1) : index + 1]
+        cells = [cell for cell in cells if cell is not None]
+        if len(cells) < min_periods or (not cells and agg in ("mean", "min", "max")):
+            results.append(None)
+        else:
+            results.append(AGGREGATES[agg](cells))
+    return results
+
+
+def random_values(count=300, empty=0.1, seed=1):
+    generator = random.Random(seed)
+    return [
+        None if generator.random() < empty else generator.randint(-50, 50)
+        for _ in range(count)
+    ]
+
+
+def sales():
+    data = [[day, sales] for day, sales in enumerate([5, 3, None, 8, 1, 9])]
+    return Table(header=["Day", "Sales"], data=data)
+
+
+class TestRolling:
+    def test_rolling(self):
+        table = sales()
+        assert table.rolling("Sales", 3, "sum") == [None, None, None, None, None, 18]
+        assert table.rolling("Sales", 3, "max", min_periods=1) == [5, 5, 5, 8, 8, 9]
+        assert table.rolling(1, 2, "mean", min_periods=1) == [5, 4, 3, 8, 4.5, 5]
+        assert table.rolling("Sales", 3, "count", 0) == [1, 2, 2, 2, 2, 3]
+
+    @pytest.mark.parametrize("agg", list(AGGREGATES))
+    @pytest.mark.parametrize("window", [1, 4, 25, 299, 1000])
+    @pytest.mark.parametrize("vectorise", [False, True])
+    def test_matches_full_calculation(self, agg, window, vectorise):
+        values = random_values()
+        for min_periods in (0, 1, window):
+            assert rolling(
+                values, window, agg, min_periods, vectorise=vectorise
+            ) == pytest.approx(expected_rolling(values, window, agg, min_periods))
+
+    def test_other_types(self):
+        values = [Decimal("1.5"), Decimal("2"), None, Decimal("3")]
+        assert rolling(values, 2, "sum", 1) == [
+            Decimal("1.5"),
+            Decimal("3.5"),
+            Decimal("2"),
+            Decimal("3"),
+        ]
+        assert rolling(["b", "a", "", "c"], 2, "min", 1) == ["b", "a", "a", "c"]
+
+    @pytest.mark.parametrize("vectorise", [False, True])
+    def test_large_float_leaving_window(self, vectorise):
+        values = [1e20, 1.0, 1.0, 1.0]
+        assert rolling(values, 1, "sum", vectorise=vectorise) == values
+        assert rolling(values, 2, "mean", vectorise=vectorise) == [
+            None,
+            5e19,
+            1.0,
+            1.0,
+        ]
+
+    def test_mean_of_strings(self):
+        with pytest.raises(TypeError):
+            rolling(["1", "2"], 2, "mean")
+
+    @pytest.mark.parametrize(
+        "options",
+        [{"window": 0}, {"agg": "median"}, {"min_periods": -1}],
+    )
+    def test_invalid_options(self, options):
+        options = {"window": 2, **options}
+        with pytest.raises(ValueError):
+            sales().rolling("Sales", **options)
+
+
+class TestCumulative:
+    def test_cumulative(self):
+        table = sales()
+        assert table.cumulative("Sales") == [5, 8, None, 16, 17, 26]
+        assert table.cumulative("Sales", "min") == [5, 3, None, 3, 1, 1]
+        assert table.cumulative("Day", "max") == [0, 1, 2, 3, 4, 5]
+
+    @pytest.mark.parametrize("agg", ["sum", "min", "max"])
+    @pytest.mark.parametrize("vectorise", [False, True])
+    def test_matches_full_calculation(self, agg, vectorise):
+        values = random_values()
+        expected = [
+            (
+                None
+                if value is None
+                else AGGREGATES[agg](
+                    [cell for cell in values[: index + 1] if cell is not None]
+                )
+            )
+            for index, value in enumerate(values)
+        ]
+        assert cumulative(values, agg, vectorise) == expected
+
+    def test_invalid_agg(self):
+        with pytest.raises(ValueError):
+            sales().cumulative("Sales", "mean")
+
+    def test_missing_column(self):
+        with pytest.raises(ValueError):
+            sales().cumulative("Missing")
+
+
+class TestVectorised:
+    @pytest.fixture(autouse=True)
+    def numpy(self):
+        return pytest.importorskip("numpy")
+
+    def test_results_are_python_values(self):
+        results = rolling([1, 2, None, 4], 2, "sum", 1)
+        assert results == [1, 3, 2, 4]
+        assert all(type(value) is int for value in results)
+        results = cumulative([1.5, None, 2.0], "max")
+        assert results == [1.5, None, 2.0]
+        assert type(results[0]) is float
+
+    def test_floats(self):
+        values = [value / 7 if value is not None else None for value in random_values()]
+        for agg in AGGREGATES:
+            assert rolling(values, 10, agg, 3) == pytest.approx(
+                rolling(values, 10, agg, 3, vectorise=False)
+            )
+
+    @pytest.mark.parametrize("window", [2, 3, 7, 64, 65, 301])
+    def test_block_boundaries(self, window):
+        values = [
+            value * 1.5 if value is not None else None for value in random_values()
+        ]
+        for agg in AGGREGATES:
+            assert rolling(values, window, agg, 1) == pytest.approx(
+                rolling(values, window, agg, 1, vectorise=False)
+            )
+
+    def test_large_integers_are_exact(self):
+        values = [2**60, 1, -(2**60)]
+        assert rolling(values, 3, "sum", 1) == [2**60, 2**60 + 1, 1]
+        assert cumulative(values) == [2**60, 2**60 + 1, 1]
+
+    def test_nan_is_not_empty(self):
+        results = rolling([1.0, float("nan"), 2.0], 2, "count", 1)
+        assert results == [1, 2, 2]